@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from api.routes import setup_routes
 from api.middleware.exception_handler import setup_exception_handlers
+from api.dependencies import lifespan
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title="Workleap AI Assistant API",
         description="A FastAPI application for an AI assistant with function calling capabilities",
-        version="0.1.0"
+        version="0.1.0",
+        lifespan=lifespan
     )
     
     setup_exception_handlers(app)    
@@ -1,22 +1,41 @@
-from fastapi import APIRouter, Depends
+import json
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 from application.features.conversation.use_cases.create_conversation import CreateConversationUseCase
 from application.features.conversation.use_cases.get_conversation import GetConversationUseCase
 from application.features.conversation.use_cases.add_message import AddMessageUseCase
+from application.features.conversation.use_cases.add_messages_batch import AddMessagesBatchUseCase
+from application.features.conversation.use_cases.list_recent_conversations import ListRecentConversationsUseCase
+from application.features.conversation.use_cases.search_conversations import SearchConversationsUseCase
+from application.features.conversation.use_cases.list_messages import ListMessagesUseCase
 from application.features.conversation.dtos.conversation_dto import ConversationDTO
 from application.features.conversation.dtos.message_dto import MessageDTO
+from application.features.conversation.dtos.conversation_page_dto import ConversationPageDTO
+from application.features.conversation.dtos.message_batch_dto import MessageBatchDTO
 from api.dependencies import (
     get_create_conversation_use_case,
     get_get_conversation_use_case,
-    get_add_message_use_case
+    get_add_message_use_case,
+    get_add_messages_batch_use_case,
+    get_list_recent_conversations_use_case,
+    get_search_conversations_use_case,
+    get_list_messages_use_case
 )
+from api.responses import PydanticJSONResponse
+from application.exceptions import ApplicationException
 from api.models.requests import (
     CreateConversationRequest,
-    AddMessageRequest
+    AddMessageRequest,
+    AddMessagesBatchRequest
 )
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
+# Serializes the message lists of the hot endpoints without validating them again
+MESSAGE_LIST_ADAPTER = TypeAdapter(List[MessageDTO])
+
 
 @router.post("/", response_model=ConversationDTO, summary="Create a new conversation with the specified title and owner.")
 def create_conversation(
@@ -26,27 +45,96 @@ def create_conversation(
     return use_case.execute(request.title, request.owner_id)
 
 
-@router.get("/{conversation_id}", response_model=ConversationDTO, summary="Retrieve a specific conversation by its unique identifier.")
+@router.get("/", response_model=ConversationPageDTO, summary="List conversations by most recent activity, using cursor pagination.")
+def list_recent_conversations(
+    recent: int = Query(default=10, ge=1, le=100, description="The maximum number of conversations to return"),
+    cursor: Optional[str] = Query(default=None, description="The next_cursor of the previous page"),
+    use_case: ListRecentConversationsUseCase = Depends(get_list_recent_conversations_use_case)
+) -> ConversationPageDTO:
+    return use_case.execute(recent, cursor)
+
+
+@router.get("/search", response_model=ConversationPageDTO, summary="Search conversations by title, returning ranked results page by page.")
+def search_conversations(
+    q: str = Query(description="The words to search for in conversation titles"),
+    limit: int = Query(default=10, ge=1, le=100, description="The maximum number of conversations to return"),
+    cursor: Optional[str] = Query(default=None, description="The next_cursor of the previous page"),
+    use_case: SearchConversationsUseCase = Depends(get_search_conversations_use_case)
+) -> ConversationPageDTO:
+    return use_case.execute(q, limit, cursor)
+
+
+@router.post("/messages/batch", response_model=MessageBatchDTO, summary="Add many messages at once, possibly to several conversations.")
+async def add_messages_batch(
+    request: AddMessagesBatchRequest,
+    use_case: AddMessagesBatchUseCase = Depends(get_add_messages_batch_use_case)
+) -> MessageBatchDTO:
+    return await use_case.execute_async(request.messages, request.process)
+
+
+@router.get("/{conversation_id}", response_model=ConversationDTO, summary="Retrieve a specific conversation by its unique identifier, optionally with its latest messages.")
 def get_conversation(
     conversation_id: str,
+    messages: int = Query(default=0, ge=0, le=100, description="The number of latest messages to include"),
     use_case: GetConversationUseCase = Depends(get_get_conversation_use_case)
-) -> ConversationDTO:
-    return use_case.execute(conversation_id)
+) -> PydanticJSONResponse:
+    return PydanticJSONResponse(use_case.execute(conversation_id, messages))
 
 
-@router.get("/{conversation_id}/messages", response_model=List[MessageDTO], summary="Get all messages belonging to a specific conversation.")
+@router.get("/{conversation_id}/messages", response_model=List[MessageDTO], summary="Get the messages of a specific conversation, one window at a time.")
 def get_conversation_messages(
     conversation_id: str,
-    use_case: GetConversationUseCase = Depends(get_get_conversation_use_case)
-) -> List[MessageDTO]:
-    conversation = use_case.execute(conversation_id)
-    return conversation.messages
+    limit: int = Query(default=100, ge=1, le=1000, description="The maximum number of messages to return"),
+    before: Optional[str] = Query(default=None, description="Only return messages added before the message with this ID"),
+    after: Optional[str] = Query(default=None, description="Only return messages added after the message with this ID"),
+    newest_first: bool = Query(default=False, description="Return the latest messages first"),
+    use_case: ListMessagesUseCase = Depends(get_list_messages_use_case)
+) -> PydanticJSONResponse:
+    messages = use_case.execute(conversation_id, limit, before, after, newest_first)
+    return PydanticJSONResponse(messages, MESSAGE_LIST_ADAPTER)
 
 
 @router.post("/{conversation_id}/messages", response_model=List[MessageDTO], summary="Add a new message to an existing conversation.")
-def add_message(
+async def add_message(
+    conversation_id: str,
+    request: AddMessageRequest,
+    use_case: AddMessageUseCase = Depends(get_add_message_use_case)
+) -> PydanticJSONResponse:
+    messages = await use_case.execute_async(conversation_id, request.content, request.owner_id)
+    return PydanticJSONResponse(messages, MESSAGE_LIST_ADAPTER)
+
+
+@router.post("/{conversation_id}/messages/stream", summary="Add a new message to an existing conversation and stream the response as Server-Sent Events.")
+async def add_message_stream(
     conversation_id: str,
     request: AddMessageRequest,
     use_case: AddMessageUseCase = Depends(get_add_message_use_case)
-) -> List[MessageDTO]:
-    return use_case.execute(conversation_id, request.content, request.owner_id)
\ No newline at end of file
+) -> StreamingResponse:
+    events = await use_case.execute_stream(conversation_id, request.content, request.owner_id)
+    
+    return StreamingResponse(
+        _to_server_sent_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _to_server_sent_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """
+    Encode events as Server-Sent Events, using the event type as the event name.
+    
+    The response status is sent before the first event, so an exception
+    raised while streaming is reported as a final "error" event, with the
+    detail the exception handlers would have sent.
+    """
+    try:
+        async for event in events:
+            data = {
+                key: value.model_dump(mode="json") if isinstance(value, BaseModel) else value
+                for key, value in event.items()
+                if key != "type"
+            }
+            yield f"event: {event['type']}\ndata: {json.dumps(data, default=str)}\n\n"
+    except Exception as exc:
+        detail = exc.message if isinstance(exc, ApplicationException) else f"Internal server error: {str(exc)}"
+        yield f"event: error\ndata: {json.dumps({'detail': detail})}\n\n"
\ No newline at end of file
@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends
 from application.features.function.use_cases.list_functions import ListFunctionsUseCase
 from application.features.function.use_cases.call_function import CallFunctionUseCase
+from application.features.function.use_cases.call_functions_batch import CallFunctionsBatchUseCase
 from application.features.function.dtos.function_dto import FunctionDTO
 from application.features.function.dtos.function_call_dto import FunctionCallDTO
+from application.features.function.dtos.function_call_result_dto import FunctionCallResultDTO
 from api.dependencies import (
     get_list_functions_use_case,
-    get_call_function_use_case
+    get_call_function_use_case,
+    get_call_functions_batch_use_case
 )
 from api.models.requests import (
-    CallFunctionRequest
+    CallFunctionRequest,
+    CallFunctionsBatchRequest
 )
 from typing import List
 
@@ -27,7 +31,18 @@ async def call_function(
     request: CallFunctionRequest,
     use_case: CallFunctionUseCase = Depends(get_call_function_use_case)
 ) -> FunctionCallDTO:
-    return use_case.execute(
+    return await use_case.execute_async(
         function_name=request.name,
         arguments=request.arguments
+    )
+
+
+@router.post("/call/batch", response_model=List[FunctionCallResultDTO], summary="Execute many function calls concurrently and return their results in order.")
+async def call_functions_batch(
+    request: CallFunctionsBatchRequest,
+    use_case: CallFunctionsBatchUseCase = Depends(get_call_functions_batch_use_case)
+) -> List[FunctionCallResultDTO]:
+    return await use_case.execute_async(
+        calls=[(call.name, call.arguments) for call in request.calls],
+        max_concurrency=request.max_concurrency
     )
\ No newline at end of file
@@ -1,77 +1,212 @@
-from fastapi import Depends
+from typing import AsyncIterator
+from contextlib import asynccontextmanager
+import os
+from fastapi import Depends, FastAPI, Request
 
 from domain.entities.conversation import Conversation
 from domain.entities.message import Message
 from domain.entities.function import Function
 from domain.repositories.abstract_repository import AbstractRepository
+from domain.services.abstract_ai_service import AbstractAIService
 from domain.services.abstract_message_processor import AbstractMessageProcessor
 from domain.services.abstract_function_caller import AbstractFunctionCaller
 
+from infrastructure.database.in_memory_journal import InMemoryJournal
+from infrastructure.database.sqlite_database import SqliteDatabase
+from infrastructure.repositories.columnar_message_repository import ColumnarMessageRepository
 from infrastructure.repositories.in_memory_repository import InMemoryRepository
+from infrastructure.repositories.sqlite_repository import SqliteRepository
 from infrastructure.services.message_processor import MessageProcessor
+from infrastructure.services.caching_ai_service import CachingAIService
+from infrastructure.services.context_builder import ContextBuilder
 from infrastructure.services.function_caller import FunctionCaller
+from infrastructure.services.function_result_cache import FunctionResultCache
+from infrastructure.services.openai_service import OpenAIService
 
 from application.features.conversation.use_cases.create_conversation import CreateConversationUseCase
 from application.features.conversation.use_cases.get_conversation import GetConversationUseCase
 from application.features.conversation.use_cases.add_message import AddMessageUseCase
+from application.features.conversation.use_cases.add_messages_batch import AddMessagesBatchUseCase
+from application.features.conversation.use_cases.list_recent_conversations import ListRecentConversationsUseCase
+from application.features.conversation.use_cases.search_conversations import SearchConversationsUseCase
+from application.features.conversation.use_cases.list_messages import ListMessagesUseCase
 from application.features.function.use_cases.list_functions import ListFunctionsUseCase
 from application.features.function.use_cases.call_function import CallFunctionUseCase
+from application.features.function.use_cases.call_functions_batch import CallFunctionsBatchUseCase
+
+###################################################################################################
+# Application lifetime
+###################################################################################################
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Create the repositories and services shared by all requests when the
+    application starts, and release them when it stops.
+    
+    The AI service calls the OpenAI-compatible API at OPENAI_BASE_URL with
+    OPENAI_API_KEY when configured, and is mocked otherwise. Function calls
+    without a timeout of their own are limited to FUNCTION_TIMEOUT seconds,
+    and up to FUNCTION_CACHE_SIZE results of cacheable functions are reused.
+    At most FUNCTION_BATCH_CONCURRENCY calls of a batch run at once.
+    Responses to repeated messages are cached for AI_RESPONSE_CACHE_TTL
+    seconds when it is set, unless they are mocked. Responses are generated
+    from the latest turns of the conversation, within CONTEXT_MAX_TOKENS
+    tokens, and a summary of the older ones.
+    
+    Entities are stored in the SQLite database at SQLITE_PATH when it is
+    set, and in memory otherwise. In-memory entities are journaled to the
+    JOURNAL_DIR directory when it is set, and reloaded from it on startup.
+    Writes are fsynced in the background unless JOURNAL_SYNCHRONOUS_COMMIT is
+    set to true, so by default a crash may lose the last acknowledged writes.
+    With MESSAGE_STORE=columnar, in-memory messages are kept in a columnar
+    store instead, which is not journaled, so it cannot be combined with
+    JOURNAL_DIR.
+    
+    Raises:
+        ValueError: If the storage settings cannot be combined
+    """
+    if os.getenv("MESSAGE_STORE") == "columnar" and os.getenv("JOURNAL_DIR") and not os.getenv("SQLITE_PATH"):
+        # Restored conversations would count messages lost on restart
+        raise ValueError("MESSAGE_STORE=columnar cannot be combined with JOURNAL_DIR: the columnar store is not journaled")
+    
+    openai_service = OpenAIService(
+        api_key=os.getenv("OPENAI_API_KEY", "mock-api-key"),
+        base_url=os.getenv("OPENAI_BASE_URL")
+    )
+    ai_service: AbstractAIService = openai_service
+    if os.getenv("AI_RESPONSE_CACHE_TTL"):
+        ai_service = CachingAIService(
+            openai_service,
+            ttl=float(os.getenv("AI_RESPONSE_CACHE_TTL")),
+            # Mocked responses are picked at random, so only real responses are worth reusing
+            should_cache=None if openai_service.base_url is not None else lambda message_content: False
+        )
+    function_caller = FunctionCaller(
+        default_timeout=float(os.getenv("FUNCTION_TIMEOUT", "10")),
+        cache=FunctionResultCache(max_size=int(os.getenv("FUNCTION_CACHE_SIZE", "1024"))),
+        max_concurrency=int(os.getenv("FUNCTION_BATCH_CONCURRENCY", "32"))
+    )
+    
+    sqlite_database = SqliteDatabase(os.getenv("SQLITE_PATH")) if os.getenv("SQLITE_PATH") else None
+    journal = InMemoryJournal(
+        os.getenv("JOURNAL_DIR"),
+        synchronous_commit=os.getenv("JOURNAL_SYNCHRONOUS_COMMIT", "false").lower() in ("1", "true", "yes")
+    ) if os.getenv("JOURNAL_DIR") and sqlite_database is None else None
+    if journal is not None:
+        journal.open()
+    if sqlite_database is not None:
+        app.state.conversation_repository = SqliteRepository[Conversation]("conversations", sqlite_database)
+        app.state.message_repository = SqliteRepository[Message]("messages", sqlite_database)
+        app.state.function_repository = SqliteRepository[Function]("functions", sqlite_database)
+    else:
+        app.state.conversation_repository = InMemoryRepository[Conversation]("conversations")
+        if os.getenv("MESSAGE_STORE") == "columnar":
+            app.state.message_repository = ColumnarMessageRepository()
+        else:
+            app.state.message_repository = InMemoryRepository[Message]("messages")
+        app.state.function_repository = InMemoryRepository[Function]("functions")
+    app.state.ai_service = ai_service
+    app.state.function_caller = function_caller
+    app.state.message_processor = MessageProcessor(
+        function_caller,
+        ai_service,
+        ContextBuilder(app.state.message_repository, max_tokens=int(os.getenv("CONTEXT_MAX_TOKENS", "3000")))
+    )
+    
+    try:
+        yield
+    finally:
+        await openai_service.aclose()
+        if sqlite_database is not None:
+            sqlite_database.close()
+        if journal is not None:
+            journal.close()
 
 ###################################################################################################
 # Repository dependencies
 ###################################################################################################
 
-def get_conversation_repository() -> AbstractRepository[Conversation]:
-    return InMemoryRepository[Conversation]("conversations")
+async def get_conversation_repository(request: Request) -> AbstractRepository[Conversation]:
+    return request.app.state.conversation_repository
 
-def get_message_repository() -> AbstractRepository[Message]:
-    return InMemoryRepository[Message]("messages")
+async def get_message_repository(request: Request) -> AbstractRepository[Message]:
+    return request.app.state.message_repository
 
-def get_function_repository() -> AbstractRepository[Function]:
-    return InMemoryRepository[Function]("functions")
+async def get_function_repository(request: Request) -> AbstractRepository[Function]:
+    return request.app.state.function_repository
 
 ###################################################################################################
 # Service dependencies
 ###################################################################################################
 
-def get_function_caller() -> AbstractFunctionCaller:
-    return FunctionCaller()
+async def get_ai_service(request: Request) -> AbstractAIService:
+    return request.app.state.ai_service
 
-def get_message_processor(
-    function_caller: AbstractFunctionCaller = Depends(get_function_caller)
-) -> AbstractMessageProcessor:
-    return MessageProcessor(function_caller)
+async def get_function_caller(request: Request) -> AbstractFunctionCaller:
+    return request.app.state.function_caller
+
+async def get_message_processor(request: Request) -> AbstractMessageProcessor:
+    return request.app.state.message_processor
 
 ###################################################################################################
 # Conversation use case dependencies
 ###################################################################################################
 
-def get_create_conversation_use_case(
+async def get_create_conversation_use_case(
     repo: AbstractRepository[Conversation] = Depends(get_conversation_repository)
 ) -> CreateConversationUseCase:
     return CreateConversationUseCase(repo)
 
-def get_get_conversation_use_case(
+async def get_get_conversation_use_case(
     conversation_repo: AbstractRepository[Conversation] = Depends(get_conversation_repository),
     message_repo: AbstractRepository[Message] = Depends(get_message_repository)
 ) -> GetConversationUseCase:
     return GetConversationUseCase(conversation_repo, message_repo)
 
-def get_add_message_use_case(
+async def get_list_messages_use_case(
+    conversation_repo: AbstractRepository[Conversation] = Depends(get_conversation_repository),
+    message_repo: AbstractRepository[Message] = Depends(get_message_repository)
+) -> ListMessagesUseCase:
+    return ListMessagesUseCase(conversation_repo, message_repo)
+
+async def get_list_recent_conversations_use_case(
+    repo: AbstractRepository[Conversation] = Depends(get_conversation_repository)
+) -> ListRecentConversationsUseCase:
+    return ListRecentConversationsUseCase(repo)
+
+async def get_search_conversations_use_case(
+    repo: AbstractRepository[Conversation] = Depends(get_conversation_repository)
+) -> SearchConversationsUseCase:
+    return SearchConversationsUseCase(repo)
+
+async def get_add_message_use_case(
     conversation_repo: AbstractRepository[Conversation] = Depends(get_conversation_repository),
     message_repo: AbstractRepository[Message] = Depends(get_message_repository),
     message_processor: AbstractMessageProcessor = Depends(get_message_processor)
 ) -> AddMessageUseCase:
     return AddMessageUseCase(conversation_repo, message_repo, message_processor)
 
+async def get_add_messages_batch_use_case(
+    conversation_repo: AbstractRepository[Conversation] = Depends(get_conversation_repository),
+    message_repo: AbstractRepository[Message] = Depends(get_message_repository),
+    message_processor: AbstractMessageProcessor = Depends(get_message_processor)
+) -> AddMessagesBatchUseCase:
+    return AddMessagesBatchUseCase(conversation_repo, message_repo, message_processor)
+
 ###################################################################################################
 # Function use case dependencies
 ###################################################################################################
 
-def get_list_functions_use_case() -> ListFunctionsUseCase:
+async def get_list_functions_use_case() -> ListFunctionsUseCase:
     return ListFunctionsUseCase()
 
-def get_call_function_use_case(
+async def get_call_function_use_case(
     function_caller: AbstractFunctionCaller = Depends(get_function_caller)
 ) -> CallFunctionUseCase:
-    return CallFunctionUseCase(function_caller)
\ No newline at end of file
+    return CallFunctionUseCase(function_caller)
+
+async def get_call_functions_batch_use_case(
+    function_caller: AbstractFunctionCaller = Depends(get_function_caller)
+) -> CallFunctionsBatchUseCase:
+    return CallFunctionsBatchUseCase(function_caller)
\ No newline at end of file
@@ -1,5 +1,6 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
+from application.features.conversation.dtos import NewMessageDTO
 
 ###################################################################################################
 # Conversation Models
@@ -15,6 +16,11 @@ class AddMessageRequest(BaseModel):
     content: str = Field(description="The content of the message")
     owner_id: Optional[str] = Field(default=None, description="The ID of the owner (for private conversations)")
 
+class AddMessagesBatchRequest(BaseModel):
+    """Request model for adding many messages at once"""
+    messages: List[NewMessageDTO] = Field(max_length=10000, description="The messages to add, in order; they may belong to different conversations")
+    process: bool = Field(default=True, description="Whether to respond to user messages, at most 20 per batch; disable to import past conversations")
+
 ###################################################################################################
 # Function Models
 ####################################################################################################
@@ -22,4 +28,9 @@ class AddMessageRequest(BaseModel):
 class CallFunctionRequest(BaseModel):
     """Request model for calling a function"""
     name: str = Field(description="The name of the function to call")
-    arguments: Dict[str, Any] = Field(default={}, description="The arguments to pass to the function")
\ No newline at end of file
+    arguments: Dict[str, Any] = Field(default={}, description="The arguments to pass to the function")
+
+class CallFunctionsBatchRequest(BaseModel):
+    """Request model for calling many functions at once"""
+    calls: List[CallFunctionRequest] = Field(max_length=1000, description="The calls to make; results are returned in the same order")
+    max_concurrency: Optional[int] = Field(default=None, ge=1, description="The maximum number of calls running at once; capped at FUNCTION_BATCH_CONCURRENCY")
\ No newline at end of file
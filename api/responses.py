@@ -0,0 +1,48 @@
+from typing import Any, Mapping, Optional
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+"""
+Fast JSON responses for the hot endpoints.
+
+Returning DTOs from an endpoint makes FastAPI validate them again against
+the response model, convert them to plain Python objects and encode those
+with the json module. DTOs built from entities are already valid, so the
+hot endpoints return them in a PydanticJSONResponse instead, which encodes
+them in one pass with pydantic's compiled serializer. The response_model
+of the endpoints still documents the response.
+"""
+
+class PydanticJSONResponse(Response):
+    """
+    JSON response encoding DTOs without validating them again.
+    """
+    media_type = "application/json"
+    
+    def __init__(
+        self,
+        content: Any,
+        adapter: Optional[TypeAdapter] = None,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None
+    ):
+        """
+        Encode the content of the response.
+        
+        Args:
+            content: A DTO, or any value serializable by the adapter
+            adapter: The adapter serializing the content; required unless it is a DTO
+            status_code: The HTTP status code of the response
+            headers: Additional headers of the response
+        """
+        self.adapter = adapter
+        super().__init__(content, status_code=status_code, headers=headers)
+    
+    def render(self, content: Any) -> bytes:
+        if self.adapter is not None:
+            return self.adapter.dump_json(content)
+        
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        
+        raise TypeError(f"Cannot serialize {type(content).__name__} without an adapter")
\ No newline at end of file
@@ -1,2 +1,5 @@
 from application.features.conversation.dtos.conversation_dto import ConversationDTO
-from application.features.conversation.dtos.message_dto import MessageDTO
\ No newline at end of file
+from application.features.conversation.dtos.message_dto import MessageDTO
+from application.features.conversation.dtos.conversation_page_dto import ConversationPageDTO
+from application.features.conversation.dtos.new_message_dto import NewMessageDTO
+from application.features.conversation.dtos.message_batch_dto import MessageBatchDTO
\ No newline at end of file
@@ -8,8 +8,11 @@ class ConversationDTO(BaseModel):
     id: str
     title: str
     created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
     owner_id: str
     is_public: bool = False
+    message_count: int = 0
+    # Empty unless the latest messages were asked for
     messages: List[MessageDTO] = []
     
     @classmethod
@@ -21,8 +24,10 @@ class ConversationDTO(BaseModel):
             id=conversation.id,
             title=conversation.title,
             created_at=conversation.created_at if hasattr(conversation, "created_at") else datetime.now(),
+            updated_at=conversation.updated_at if hasattr(conversation, "updated_at") else datetime.now(),
             owner_id=conversation.owner_id,
-            is_public=is_public
+            is_public=is_public,
+            message_count=conversation.message_count
         )
     
     def to_entity(self):
@@ -40,4 +45,6 @@ class ConversationDTO(BaseModel):
                 owner_id=self.owner_id
             )
         
+        conversation.created_at = self.created_at
+        conversation.updated_at = self.updated_at
         return conversation
\ No newline at end of file
@@ -0,0 +1,7 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from application.features.conversation.dtos.conversation_dto import ConversationDTO
+
+class ConversationPageDTO(BaseModel):
+    items: List[ConversationDTO] = []
+    next_cursor: Optional[str] = None
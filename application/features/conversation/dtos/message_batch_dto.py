@@ -0,0 +1,7 @@
+from typing import List
+from pydantic import BaseModel
+from application.features.conversation.dtos.message_dto import MessageDTO
+
+class MessageBatchDTO(BaseModel):
+    added: int = 0
+    responses: List[MessageDTO] = []
\ No newline at end of file
@@ -12,6 +12,8 @@ class MessageDTO(BaseModel):
     @classmethod
     def from_entity(cls, message: Message):
         """Create from domain entity"""
+        # The validating constructor runs in compiled code and is faster than
+        # model_construct; see benchmarks/bench_serialization.py
         return cls(
             id=message.id,
             content=message.content,
@@ -0,0 +1,11 @@
+from typing import Literal, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+class NewMessageDTO(BaseModel):
+    conversation_id: str
+    content: str
+    owner_id: Optional[str] = None
+    sender: Literal["user", "assistant"] = "user"
+    # The time of the message when it is imported, now otherwise
+    created_at: Optional[datetime] = Field(default=None)
\ No newline at end of file
@@ -1,3 +1,7 @@
 from application.features.conversation.use_cases.create_conversation import CreateConversationUseCase
 from application.features.conversation.use_cases.get_conversation import GetConversationUseCase
-from application.features.conversation.use_cases.add_message import AddMessageUseCase
\ No newline at end of file
+from application.features.conversation.use_cases.add_message import AddMessageUseCase
+from application.features.conversation.use_cases.list_recent_conversations import ListRecentConversationsUseCase
+from application.features.conversation.use_cases.search_conversations import SearchConversationsUseCase
+from application.features.conversation.use_cases.list_messages import ListMessagesUseCase
+from application.features.conversation.use_cases.add_messages_batch import AddMessagesBatchUseCase
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 import uuid
 from domain.entities.conversation import Conversation
 from domain.entities.message import Message
@@ -5,11 +6,18 @@ from domain.repositories.abstract_repository import AbstractRepository
 from domain.services.abstract_message_processor import AbstractMessageProcessor
 from application.features.conversation.dtos import MessageDTO
 from application.exceptions import NotFoundException
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Set
+
+# Responses still being generated for streams whose client stopped listening;
+# the event loop only keeps weak references to tasks
+_streaming_tasks: Set[asyncio.Task] = set()
 
 class AddMessageUseCase:
     """
     Use case for adding a message to a conversation.
+    
+    The asynchronous variants run the repository calls in worker threads,
+    so that a repository doing I/O does not block the event loop.
     """
     def __init__(
         self,
@@ -27,6 +35,103 @@ class AddMessageUseCase:
         content: str,
         owner_id: str
     ) -> List[MessageDTO]:
+        message = self._add_user_message(conversation_id, content, owner_id)
+        messages = [MessageDTO.from_entity(message)]
+        
+        if message.sender == "user":
+            # Process the message and generate a response
+            response = self.message_processor.process(message)
+            if response:
+                self._add_response(response)
+                messages.append(MessageDTO.from_entity(response))
+        
+        return messages
+    
+    async def execute_async(
+        self,
+        conversation_id: str,
+        content: str,
+        owner_id: str
+    ) -> List[MessageDTO]:
+        """
+        Asynchronous variant of execute, awaiting the message processor
+        instead of blocking while the response is generated.
+        """
+        message = await asyncio.to_thread(self._add_user_message, conversation_id, content, owner_id)
+        messages = [MessageDTO.from_entity(message)]
+        
+        if message.sender == "user":
+            # Process the message and generate a response
+            response = await self.message_processor.process_async(message)
+            if response:
+                await asyncio.to_thread(self._add_response, response)
+                messages.append(MessageDTO.from_entity(response))
+        
+        return messages
+    
+    async def execute_stream(
+        self,
+        conversation_id: str,
+        content: str,
+        owner_id: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Add a message and stream the response as it is generated.
+        
+        The message is added before the stream is returned, so a missing
+        conversation is reported before streaming starts. The stream then
+        yields a "message" event with the user message, the processing events
+        of the message processor, a "message" event with the stored response,
+        and finally a "done" event. Messages are yielded as MessageDTOs.
+        
+        The response is generated by a task of its own, so it is still stored
+        when the client stops listening. An exception raised while the
+        response is generated is raised by the stream.
+        """
+        message = await asyncio.to_thread(self._add_user_message, conversation_id, content, owner_id)
+        
+        events: asyncio.Queue = asyncio.Queue()
+        if message.sender == "user":
+            task = asyncio.create_task(self._process_stream(message, events))
+            _streaming_tasks.add(task)
+            task.add_done_callback(_streaming_tasks.discard)
+        else:
+            events.put_nowait(None)
+        
+        return self._stream_response(message, events)
+    
+    async def _stream_response(self, message: Message, events: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+        yield {"type": "message", "message": MessageDTO.from_entity(message)}
+        
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            if isinstance(event, Exception):
+                raise event
+            yield event
+        
+        yield {"type": "done"}
+    
+    async def _process_stream(self, message: Message, events: asyncio.Queue) -> None:
+        # Puts the events of the stream, then None, or the exception that ended it
+        try:
+            async for event in self.message_processor.process_stream(message):
+                if event["type"] == "response":
+                    await asyncio.to_thread(self._add_response, event["message"])
+                    event = {"type": "message", "message": MessageDTO.from_entity(event["message"])}
+                events.put_nowait(event)
+        except Exception as exc:
+            events.put_nowait(exc)
+        else:
+            events.put_nowait(None)
+    
+    def _add_user_message(
+        self,
+        conversation_id: str,
+        content: str,
+        owner_id: str
+    ) -> Message:
         conversation = self.conversation_repository.find_by_id(conversation_id)
         if not conversation:
             raise NotFoundException(f"Conversation with ID {conversation_id} not found")
@@ -38,22 +143,16 @@ class AddMessageUseCase:
             sender="user",
             conversation_id=conversation_id
         )
+        # Rejected messages must not be stored
+        if not conversation.can_add_message(message):
+            raise PermissionError("Only the owner can add messages to this conversation")
         self.message_repository.save(message)
         
-        conversation.add_message(message)
-        self.conversation_repository.save(conversation)
-        
-        message_dto = MessageDTO.from_entity(message)
-        messages = [message_dto]
+        # Counted by the repository, so concurrent additions are not lost
+        self.conversation_repository.record_messages(conversation_id, 1, message.created_at)
         
-        if message.sender == "user":
-            # Process the message and generate a response
-            response = self.message_processor.process(message)
-            if response:
-                self.message_repository.save(response)
-                conversation.add_message(response)
-                self.conversation_repository.save(conversation)
-                response_dto = MessageDTO.from_entity(response)
-                messages.append(response_dto)
-        
-        return messages
\ No newline at end of file
+        return message
+    
+    def _add_response(self, response: Message) -> None:
+        self.message_repository.save(response)
+        self.conversation_repository.record_messages(response.conversation_id, 1, response.created_at)
\ No newline at end of file
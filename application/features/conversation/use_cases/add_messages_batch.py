@@ -0,0 +1,151 @@
+import asyncio
+import os
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from domain.repositories.abstract_repository import AbstractRepository
+from domain.services.abstract_message_processor import AbstractMessageProcessor
+from application.features.conversation.dtos import MessageBatchDTO, MessageDTO, NewMessageDTO
+from application.exceptions import NotFoundException, ValidationException
+from datetime import datetime
+from typing import Dict, List
+
+# Maximum number of user messages responded to in one batch; each response
+# is generated in turn before the batch is stored
+MAX_PROCESSED_MESSAGES = 20
+
+# RFC 4122 variant digit for each hex digit of random bits
+UUID_VARIANT_DIGITS = {digit: "89ab"[int(digit, 16) & 3] for digit in "0123456789abcdef"}
+
+def generate_message_ids(count: int) -> List[str]:
+    """
+    Generate message IDs like those of single messages, from one read of random bytes.
+    
+    Generating the random UUIDs one by one takes most of the time of a
+    large batch.
+    
+    Args:
+        count: The number of IDs to generate
+    
+    Returns:
+        The IDs, each made of a random version 4 UUID
+    """
+    bits = os.urandom(16 * count).hex()
+    return [
+        f"msg_{bits[i:i + 8]}-{bits[i + 8:i + 12]}-4{bits[i + 13:i + 16]}-"
+        f"{UUID_VARIANT_DIGITS[bits[i + 16]]}{bits[i + 17:i + 20]}-{bits[i + 20:i + 32]}"
+        for i in range(0, 32 * count, 32)
+    ]
+
+class AddMessagesBatchUseCase:
+    """
+    Use case for adding many messages at once, possibly to several conversations.
+    
+    Every message is checked before any is stored, so a batch is added
+    entirely or not at all. The messages are then stored with one write to
+    the message repository, and each conversation is saved once.
+    
+    User messages are processed like single messages unless processing is
+    skipped, as when past conversations are imported. Responses are stored
+    right after the message they answer. Since they are generated one after
+    the other, batches responded to are limited to MAX_PROCESSED_MESSAGES
+    user messages.
+    """
+    def __init__(
+        self,
+        conversation_repository: AbstractRepository[Conversation],
+        message_repository: AbstractRepository[Message],
+        message_processor: AbstractMessageProcessor
+    ):
+        self.conversation_repository = conversation_repository
+        self.message_repository = message_repository
+        self.message_processor = message_processor
+    
+    def execute(self, new_messages: List[NewMessageDTO], process: bool = True) -> MessageBatchDTO:
+        messages = self._create_messages(new_messages, process)
+        
+        stored = []
+        responses = []
+        for message in messages:
+            stored.append(message)
+            if process and message.sender == "user":
+                response = self.message_processor.process(message)
+                if response:
+                    stored.append(response)
+                    responses.append(response)
+        
+        self._store(stored)
+        return MessageBatchDTO(added=len(messages), responses=[MessageDTO.from_entity(msg) for msg in responses])
+    
+    async def execute_async(self, new_messages: List[NewMessageDTO], process: bool = True) -> MessageBatchDTO:
+        """
+        Asynchronous variant of execute, awaiting the message processor
+        instead of blocking while responses are generated. Repository calls
+        run in worker threads, so they do not block the event loop either.
+        """
+        messages = await asyncio.to_thread(self._create_messages, new_messages, process)
+        
+        stored = []
+        responses = []
+        for message in messages:
+            stored.append(message)
+            if process and message.sender == "user":
+                response = await self.message_processor.process_async(message)
+                if response:
+                    stored.append(response)
+                    responses.append(response)
+        
+        await asyncio.to_thread(self._store, stored)
+        return MessageBatchDTO(added=len(messages), responses=[MessageDTO.from_entity(msg) for msg in responses])
+    
+    def _create_messages(self, new_messages: List[NewMessageDTO], process: bool) -> List[Message]:
+        if process and sum(new_message.sender == "user" for new_message in new_messages) > MAX_PROCESSED_MESSAGES:
+            raise ValidationException(
+                f"At most {MAX_PROCESSED_MESSAGES} user messages can be responded to in one batch; "
+                "add larger batches without processing them"
+            )
+        
+        conversations: Dict[str, Conversation] = {}
+        messages = []
+        
+        for new_message, message_id in zip(new_messages, generate_message_ids(len(new_messages))):
+            conversation = conversations.get(new_message.conversation_id)
+            if conversation is None:
+                conversation = self.conversation_repository.find_by_id(new_message.conversation_id)
+                if not conversation:
+                    raise NotFoundException(f"Conversation with ID {new_message.conversation_id} not found")
+                conversations[new_message.conversation_id] = conversation
+            
+            message = Message(
+                id=message_id,
+                content=new_message.content,
+                owner_id=new_message.owner_id,
+                sender=new_message.sender,
+                conversation_id=new_message.conversation_id
+            )
+            if new_message.created_at is not None:
+                created_at = new_message.created_at
+                if created_at.tzinfo is not None:
+                    # Message times are naive local times
+                    created_at = created_at.astimezone().replace(tzinfo=None)
+                message.created_at = created_at
+            if not conversation.can_import_message(message):
+                raise PermissionError("Only the owner can add messages to this conversation")
+            messages.append(message)
+        
+        return messages
+    
+    def _store(self, messages: List[Message]) -> None:
+        self.message_repository.save_many(messages)
+        
+        counts: Dict[str, int] = {}
+        last_activity: Dict[str, datetime] = {}
+        for message in messages:
+            counts[message.conversation_id] = counts.get(message.conversation_id, 0) + 1
+            last_activity[message.conversation_id] = max(
+                last_activity.get(message.conversation_id, message.created_at),
+                message.created_at
+            )
+        
+        # Counted by the repository, so messages added concurrently are not lost
+        for conversation_id, count in counts.items():
+            self.conversation_repository.record_messages(conversation_id, count, last_activity[conversation_id])
\ No newline at end of file
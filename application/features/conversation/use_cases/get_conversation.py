@@ -2,11 +2,11 @@ from domain.entities.conversation import Conversation
 from domain.entities.message import Message
 from domain.repositories.abstract_repository import AbstractRepository
 from application.features.conversation.dtos import ConversationDTO, MessageDTO
-from application.exceptions import NotFoundException
+from application.exceptions import NotFoundException, ValidationException
 
 class GetConversationUseCase:
     """
-    Use case for retrieving a conversation with its messages.
+    Use case for retrieving a conversation, optionally with its latest messages.
     """
     def __init__(
         self,
@@ -16,17 +16,20 @@ class GetConversationUseCase:
         self.conversation_repository = conversation_repository
         self.message_repository = message_repository
     
-    def execute(self, conversation_id: str) -> ConversationDTO:
+    def execute(self, conversation_id: str, message_limit: int = 0) -> ConversationDTO:
+        if message_limit < 0:
+            raise ValidationException("Message limit must not be negative")
+        
         conversation = self.conversation_repository.find_by_id(conversation_id)
         
         if not conversation:
             raise NotFoundException(f"Conversation with ID {conversation_id} not found")
         
-        message_entities = self.message_repository.find_messages_by_conversation_id(conversation_id)
-        
         conversation_dto = ConversationDTO.from_entity(conversation)
-        message_dtos = [MessageDTO.from_entity(msg) for msg in message_entities]
         
-        conversation_dto.messages = message_dtos
+        if message_limit:
+            # The latest messages, in the order they were added
+            message_entities = self.message_repository.find_messages_page(conversation_id, message_limit, newest_first=True)
+            conversation_dto.messages = [MessageDTO.from_entity(msg) for msg in reversed(message_entities)]
         
         return conversation_dto
\ No newline at end of file
@@ -0,0 +1,50 @@
+from typing import List, Optional
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from domain.repositories.abstract_repository import AbstractRepository
+from application.features.conversation.dtos import MessageDTO
+from application.exceptions import NotFoundException, ValidationException
+
+class ListMessagesUseCase:
+    """
+    Use case for reading the messages of a conversation one window at a time.
+    
+    The window is selected by the message repository, so only the
+    requested messages are loaded and converted, however long the
+    conversation is.
+    """
+    def __init__(
+        self,
+        conversation_repository: AbstractRepository[Conversation],
+        message_repository: AbstractRepository[Message]
+    ):
+        self.conversation_repository = conversation_repository
+        self.message_repository = message_repository
+    
+    def execute(
+        self,
+        conversation_id: str,
+        limit: int = 100,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        newest_first: bool = False
+    ) -> List[MessageDTO]:
+        if limit < 1:
+            raise ValidationException("Limit must be a positive number")
+        
+        if not self.conversation_repository.find_by_id(conversation_id):
+            raise NotFoundException(f"Conversation with ID {conversation_id} not found")
+        
+        for cursor in [before, after]:
+            if cursor is not None:
+                message = self.message_repository.find_by_id(cursor)
+                if not message or message.conversation_id != conversation_id:
+                    raise ValidationException(f"Message with ID {cursor} is not in the conversation")
+        
+        messages = self.message_repository.find_messages_page(conversation_id, limit, before, after, newest_first)
+        if not messages and before is not None and after is not None:
+            # The window is empty both when the cursors are adjacent and when they are reversed
+            following = self.message_repository.find_messages_page(conversation_id, 1, after=after)
+            if not following or following[0].id != before:
+                raise ValidationException(f"Message {before} does not come after message {after}")
+        return [MessageDTO.from_entity(message) for message in messages]
\ No newline at end of file
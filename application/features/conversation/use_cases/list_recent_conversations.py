@@ -0,0 +1,50 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+from domain.entities.conversation import Conversation
+from domain.repositories.abstract_repository import AbstractRepository
+from application.features.conversation.dtos import ConversationDTO, ConversationPageDTO
+from application.exceptions import ValidationException
+
+class ListRecentConversationsUseCase:
+    """
+    Use case for listing conversations by most recent activity, one page at a time.
+    """
+    def __init__(self, repository: AbstractRepository[Conversation]):
+        self.repository = repository
+    
+    def execute(self, limit: int = 10, cursor: Optional[str] = None) -> ConversationPageDTO:
+        if limit < 1:
+            raise ValidationException("Limit must be a positive number")
+        
+        before = self._decode_cursor(cursor) if cursor else None
+        
+        # Fetch one extra conversation to know whether there is a next page
+        conversations = self.repository.find_recent_conversations(limit + 1, before)
+        has_more = len(conversations) > limit
+        conversations = conversations[:limit]
+        
+        next_cursor = None
+        if has_more:
+            last = conversations[-1]
+            next_cursor = self._encode_cursor(last.updated_at, last.id)
+        
+        return ConversationPageDTO(
+            items=[ConversationDTO.from_entity(conversation) for conversation in conversations],
+            next_cursor=next_cursor
+        )
+    
+    @staticmethod
+    def _encode_cursor(updated_at: datetime, id: str) -> str:
+        raw = f"{updated_at.isoformat()}|{id}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            updated_at, id = raw.split("|", 1)
+            return datetime.fromisoformat(updated_at), id
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValidationException("Invalid cursor")
@@ -0,0 +1,36 @@
+from typing import Optional
+from domain.entities.conversation import Conversation
+from domain.repositories.abstract_repository import AbstractRepository
+from application.features.conversation.dtos import ConversationDTO, ConversationPageDTO
+from application.exceptions import ValidationException
+
+class SearchConversationsUseCase:
+    """
+    Use case for searching conversations by title, returning ranked pages of results.
+    """
+    def __init__(self, repository: AbstractRepository[Conversation]):
+        self.repository = repository
+    
+    def execute(self, query: str, limit: int = 10, cursor: Optional[str] = None) -> ConversationPageDTO:
+        if not query or not query.strip():
+            raise ValidationException("Search query is required")
+        
+        if limit < 1:
+            raise ValidationException("Limit must be a positive number")
+        
+        # Ranked results are paged by position, so the cursor is the offset of the next page
+        if cursor is None:
+            offset = 0
+        elif cursor.isdigit():
+            offset = int(cursor)
+        else:
+            raise ValidationException("Invalid cursor")
+        
+        # Fetch one extra conversation to know whether there is a next page
+        conversations = self.repository.search_conversations(query, limit + 1, offset)
+        has_more = len(conversations) > limit
+        
+        return ConversationPageDTO(
+            items=[ConversationDTO.from_entity(conversation) for conversation in conversations[:limit]],
+            next_cursor=str(offset + limit) if has_more else None
+        )
@@ -1,2 +1,3 @@
 from application.features.function.dtos.function_dto import FunctionDTO, FunctionParameterDTO
-from application.features.function.dtos.function_call_dto import FunctionCallDTO
\ No newline at end of file
+from application.features.function.dtos.function_call_dto import FunctionCallDTO
+from application.features.function.dtos.function_call_result_dto import FunctionCallResultDTO
\ No newline at end of file
@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+from application.features.function.dtos.function_call_dto import FunctionCallDTO
+
+class FunctionCallResultDTO(BaseModel):
+    name: str
+    # The status of the call, or "not_found" when there is no function with that name
+    status: str
+    call: Optional[FunctionCallDTO] = None
\ No newline at end of file
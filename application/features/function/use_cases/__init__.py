@@ -1,2 +1,3 @@
 from application.features.function.use_cases.list_functions import ListFunctionsUseCase
-from application.features.function.use_cases.call_function import CallFunctionUseCase
\ No newline at end of file
+from application.features.function.use_cases.call_function import CallFunctionUseCase
+from application.features.function.use_cases.call_functions_batch import CallFunctionsBatchUseCase
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import Dict, Any
+from domain.entities.function import Function
 from domain.services.abstract_function_caller import AbstractFunctionCaller
 from application.features.function.dtos.function_call_dto import FunctionCallDTO
 from application.exceptions import NotFoundException, ValidationException
@@ -19,6 +20,29 @@ class CallFunctionUseCase:
         function_name: str,
         arguments: Dict[str, Any]
     ) -> FunctionCallDTO:
+        function = self._find_function(function_name)
+        
+        function_call = self.function_caller.call_function(function, arguments)
+        
+        function_call_dto = FunctionCallDTO.from_entity(function_call)
+        
+        return function_call_dto
+    
+    async def execute_async(
+        self,
+        function_name: str,
+        arguments: Dict[str, Any]
+    ) -> FunctionCallDTO:
+        """
+        Asynchronous variant of execute, awaiting the function call.
+        """
+        function = self._find_function(function_name)
+        
+        function_call = await self.function_caller.call_function_async(function, arguments)
+        
+        return FunctionCallDTO.from_entity(function_call)
+    
+    def _find_function(self, function_name: str) -> Function:
         if not function_name:
             raise ValidationException("Function name is required")
         
@@ -27,8 +51,4 @@ class CallFunctionUseCase:
         if not function:
             raise NotFoundException(f"Function '{function_name}' not found")
         
-        function_call = self.function_caller.call_function(function, arguments)
-        
-        function_call_dto = FunctionCallDTO.from_entity(function_call)
-        
-        return function_call_dto
\ No newline at end of file
+        return function
\ No newline at end of file
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Optional, Tuple
+from domain.services.abstract_function_caller import AbstractFunctionCaller
+from application.features.function.dtos.function_call_dto import FunctionCallDTO
+from application.features.function.dtos.function_call_result_dto import FunctionCallResultDTO
+from application.exceptions import ValidationException
+from infrastructure.services.function_registry import FunctionRegistry
+
+class CallFunctionsBatchUseCase:
+    """
+    Use case for calling many functions in one request.
+    
+    Every call is resolved and validated before any is executed. Calls to
+    unknown functions or with invalid parameters fail without running, and
+    the others run concurrently. Each call gets its own result and status,
+    in the order of the calls.
+    """
+    def __init__(
+        self,
+        function_caller: AbstractFunctionCaller
+    ):
+        self.function_caller = function_caller
+    
+    async def execute_async(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None
+    ) -> List[FunctionCallResultDTO]:
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValidationException("Max concurrency must be a positive number")
+        
+        functions = [FunctionRegistry.get_function_by_name(name) for name, _ in calls]
+        found = [
+            (function, arguments)
+            for function, (_, arguments) in zip(functions, calls)
+            if function is not None
+        ]
+        function_calls = iter(await self.function_caller.call_functions_async(found, max_concurrency))
+        
+        results = []
+        for function, (name, _) in zip(functions, calls):
+            if function is None:
+                results.append(FunctionCallResultDTO(name=name, status="not_found"))
+            else:
+                function_call = next(function_calls)
+                results.append(FunctionCallResultDTO(
+                    name=name,
+                    status=function_call.status,
+                    call=FunctionCallDTO.from_entity(function_call)
+                ))
+        
+        return results
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Benchmark for the columnar message store.
+
+Stores the same messages in the in-memory repository and in the columnar
+store, then reports the memory allocated per message, as measured by
+tracemalloc, and the time taken by sender and time-range scans.
+
+Run with:
+    python -m benchmarks.bench_columnar [--messages 200000] [--queries 20]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, List
+from domain.entities.message import Message
+from domain.repositories.abstract_repository import AbstractRepository
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories import columnar_message_repository
+from infrastructure.repositories.columnar_message_repository import ColumnarMessageRepository
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+SENDERS = 100
+START = datetime(2024, 1, 1)
+
+def fill(repository: AbstractRepository[Message], count: int) -> float:
+    """Save count messages and return the number of bytes allocated per message."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        message = Message(
+            id=f"msg_{i}",
+            content=f"Message number {i}",
+            sender=f"user_{i % SENDERS}",
+            conversation_id=f"conv_{i % 1000}"
+        )
+        message.created_at = START + timedelta(seconds=i)
+        repository.save(message)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+def time_queries(query: Callable[[int], List[Message]], queries: int) -> float:
+    """Return the mean number of milliseconds taken by a query."""
+    started = time.perf_counter()
+    for i in range(queries):
+        query(i)
+    return (time.perf_counter() - started) * 1000 / queries
+
+def measure(name: str, repository: AbstractRepository[Message], count: int, queries: int) -> None:
+    bytes_per_message = fill(repository, count)
+    # Each sender scan matches 1% of the messages, each time-range scan 10%
+    by_sender = time_queries(lambda i: repository.find_messages_by_sender(f"user_{i % SENDERS}"), queries)
+    window = timedelta(seconds=count // 10)
+    by_time = time_queries(
+        lambda i: repository.find_messages_in_time_range(START + i * window / 2, START + i * window / 2 + window),
+        queries
+    )
+    print(f"{name:<24} {bytes_per_message:>14.1f} {by_sender:>12.2f} {by_time:>14.2f}")
+
+def run(count: int, queries: int) -> None:
+    print(f"{'store':<24} {'bytes/message':>14} {'sender ms':>12} {'time range ms':>14}")
+    clear_database()
+    measure("in-memory", InMemoryRepository[Message]("messages"), count, queries)
+    clear_database()
+    if columnar_message_repository.NUMPY_AVAILABLE:
+        measure("columnar (numpy)", ColumnarMessageRepository(), count, queries)
+    columnar_message_repository.NUMPY_AVAILABLE = False
+    measure("columnar (pure Python)", ColumnarMessageRepository(), count, queries)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+    run(args.messages, args.queries)
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Benchmark for InMemoryRepository throughput under concurrent threads.
+
+Runs a mix of saves, lookups and index queries from an increasing number
+of threads, as the threadpool serving requests would, and reports the
+total throughput. Operations on different collections take different
+locks, so a workload touching several collections contends less than one
+hammering a single collection.
+
+Run with:
+    python -m benchmarks.bench_concurrency [--threads 1 2 4 8 16]
+"""
+import argparse
+import threading
+import time
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+CONVERSATIONS = 100
+
+def worker(thread: int, operations: int, barrier: threading.Barrier) -> None:
+    messages = InMemoryRepository[Message]("messages")
+    conversations = InMemoryRepository[Conversation]("conversations")
+    barrier.wait()
+    
+    for i in range(operations):
+        conversation = conversations.find_by_id(f"conv_{i % CONVERSATIONS}")
+        message = Message(id=f"msg_{thread}_{i}", content="hello", sender="user", conversation_id=conversation.id)
+        messages.save(message)
+        conversation.updated_at = message.created_at
+        conversations.save(conversation)
+        messages.find_messages_by_conversation_id(conversation.id)
+        conversations.find_recent_conversations(limit=10)
+
+def run(thread_counts, operations: int) -> None:
+    print(f"{'threads':>7} {'ops/s':>12} {'saved':>8}")
+    for threads in thread_counts:
+        clear_database()
+        conversations = InMemoryRepository[Conversation]("conversations")
+        for i in range(CONVERSATIONS):
+            conversations.save(Conversation(id=f"conv_{i}", title=f"Conversation {i}", owner_id="user_1"))
+        
+        per_thread = operations // threads
+        barrier = threading.Barrier(threads + 1)
+        workers = [threading.Thread(target=worker, args=(t, per_thread, barrier)) for t in range(threads)]
+        for thread in workers:
+            thread.start()
+        
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        
+        # Each iteration performs five repository operations
+        saved = len(InMemoryRepository[Message]("messages").find_all())
+        print(f"{threads:>7} {per_thread * threads * 5 / elapsed:>12,.0f} {saved:>8}")
+    clear_database()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--operations", type=int, default=80_000)
+    args = parser.parse_args()
+    run(args.threads, args.operations)
\ No newline at end of file
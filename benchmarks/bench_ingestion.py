@@ -0,0 +1,77 @@
+"""
+Benchmark for message ingestion.
+
+Adds messages spread over several conversations, without responding to
+them, one at a time through AddMessageUseCase and in batches through
+AddMessagesBatchUseCase, and reports the number of messages added per
+second.
+
+Run with:
+    python -m benchmarks.bench_ingestion [--messages 100000] [--batch-sizes 100 1000 10000]
+"""
+import argparse
+import time
+from typing import List, Optional
+from application.features.conversation.dtos import NewMessageDTO
+from application.features.conversation.use_cases.add_message import AddMessageUseCase
+from application.features.conversation.use_cases.add_messages_batch import AddMessagesBatchUseCase
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from domain.services.abstract_message_processor import AbstractMessageProcessor
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+CONVERSATIONS = 100
+
+class SilentProcessor(AbstractMessageProcessor):
+    """Message processor that never responds, so only the ingestion is measured."""
+    def process(self, message: Message) -> Optional[Message]:
+        return None
+
+def setup() -> tuple:
+    clear_database()
+    conversations = InMemoryRepository[Conversation]("conversations")
+    messages = InMemoryRepository[Message]("messages")
+    for i in range(CONVERSATIONS):
+        conversations.save(Conversation(id=f"conv_{i}", title=f"Imported {i}", owner_id="user_1"))
+    return conversations, messages
+
+def new_messages(count: int) -> List[NewMessageDTO]:
+    return [
+        NewMessageDTO(conversation_id=f"conv_{i % CONVERSATIONS}", content=f"Imported message {i}", owner_id="user_1")
+        for i in range(count)
+    ]
+
+def one_at_a_time(count: int) -> float:
+    conversations, messages = setup()
+    use_case = AddMessageUseCase(conversations, messages, SilentProcessor())
+    items = new_messages(count)
+    
+    start = time.perf_counter()
+    for item in items:
+        use_case.execute(item.conversation_id, item.content, item.owner_id)
+    return count / (time.perf_counter() - start)
+
+def batched(count: int, batch_size: int) -> float:
+    conversations, messages = setup()
+    use_case = AddMessagesBatchUseCase(conversations, messages, SilentProcessor())
+    items = new_messages(count)
+    
+    start = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        use_case.execute(items[offset:offset + batch_size], process=False)
+    return count / (time.perf_counter() - start)
+
+def run(count: int, batch_sizes: List[int]) -> None:
+    print(f"{'mode':<20} {'messages/s':>12}")
+    print(f"{'one at a time':<20} {one_at_a_time(count):>12.0f}")
+    for batch_size in batch_sizes:
+        print(f"{f'batches of {batch_size}':<20} {batched(count, batch_size):>12.0f}")
+    clear_database()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+    run(args.messages, args.batch_sizes)
\ No newline at end of file
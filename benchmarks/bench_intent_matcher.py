@@ -0,0 +1,83 @@
+"""
+Benchmark for function call extraction with many registered functions.
+
+Registers synthetic functions with their own trigger words and compares
+the latency of extract_function_calls with a naive scan testing every
+trigger of every function against the message. Also measures the
+throughput of classifying messages in bulk.
+
+Run with:
+    python -m benchmarks.bench_intent_matcher [--functions 10 100 1000]
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+from domain.entities.function import Function
+from infrastructure.services.function_registry import FunctionRegistry
+from infrastructure.services.intent_classifier import get_intent_classifier
+from infrastructure.services.openai_service import OpenAIService
+
+TRIGGERS_PER_FUNCTION = 10
+BATCH_SIZE = 50_000
+
+MESSAGES = [
+    "What's the weather in Paris and the time in Tokyo?",
+    "Please calculate 12 times 7",
+    "Nothing to see here, just a friendly hello to everyone reading this message",
+    "Can you run synthetic_0500 with trigger_0042_3 and tell me the forecast?"
+]
+
+def register_synthetic_functions(count: int) -> None:
+    for i in range(len(FunctionRegistry.get_available_functions()), count):
+        FunctionRegistry.register(
+            name=f"synthetic_{i:04d}",
+            description=f"Synthetic function {i}",
+            triggers=[f"trigger_{i:04d}_{j}" for j in range(TRIGGERS_PER_FUNCTION)]
+        )
+
+def naive_scan(message_content: str, available_functions: List[Function]) -> List[str]:
+    message_lower = message_content.lower()
+    matched = []
+    for function in available_functions:
+        for trigger in [function.name.lower(), *FunctionRegistry.get_triggers(function.name)]:
+            if re.search(rf"(?<!\w){re.escape(trigger)}(?!\w)", message_lower):
+                matched.append(function.name)
+                break
+    return matched
+
+def measure(extract, message: str, functions: List[Function], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        extract(message, functions)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def run(sizes: List[int], repeat: int) -> None:
+    service = OpenAIService(api_key="benchmark")
+    rng = random.Random(42)
+    
+    print(f"{'functions':>9} {'matcher (ms)':>13} {'naive (ms)':>11} {'batch (msg/s)':>14}")
+    for size in sorted(sizes):
+        register_synthetic_functions(size)
+        functions = FunctionRegistry.get_available_functions()
+        # The first call compiles the matcher for the new function list
+        service.extract_function_calls("", functions)
+        
+        matcher = naive = 0.0
+        for message in rng.sample(MESSAGES, len(MESSAGES)):
+            matcher += measure(service.extract_function_calls, message, functions, repeat)
+            naive += measure(naive_scan, message, functions, repeat)
+        
+        batch = [rng.choice(MESSAGES) for _ in range(BATCH_SIZE)]
+        start = time.perf_counter()
+        get_intent_classifier(functions).classify_many(batch)
+        throughput = BATCH_SIZE / (time.perf_counter() - start)
+        print(f"{len(functions):>9} {matcher / len(MESSAGES):>13.3f} {naive / len(MESSAGES):>11.3f} {throughput:>14,.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--functions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.functions, args.repeat)
\ No newline at end of file
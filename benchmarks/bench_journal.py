@@ -0,0 +1,61 @@
+"""
+Benchmark for the in-memory database journal.
+
+Saves messages with the journal recording them, then measures startup
+time when the whole log has to be replayed and when a snapshot is loaded
+instead. Startup from a snapshot skips re-indexing every entity.
+
+Run with:
+    python -m benchmarks.bench_journal [--messages 1000000]
+"""
+import argparse
+import tempfile
+import time
+from domain.entities.message import Message
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.database.in_memory_journal import InMemoryJournal
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+def fill(count: int) -> float:
+    repository = InMemoryRepository[Message]("messages")
+    start = time.perf_counter()
+    for i in range(count):
+        repository.save(Message(id=f"msg_{i}", content=f"Message number {i}", sender="user", conversation_id=f"conv_{i % 1000}"))
+    return time.perf_counter() - start
+
+def start_up(directory: str) -> float:
+    clear_database()
+    journal = InMemoryJournal(directory, snapshot_interval=None)
+    start = time.perf_counter()
+    journal.open()
+    elapsed = time.perf_counter() - start
+    journal.close(snapshot=False)
+    return elapsed
+
+def run(count: int) -> None:
+    clear_database()
+    print(f"Without journal: saved {count} messages in {fill(count):.2f}s")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        clear_database()
+        journal = InMemoryJournal(directory, snapshot_interval=None)
+        journal.open()
+        print(f"With journal:    saved {count} messages in {fill(count):.2f}s")
+        journal.close(snapshot=False)
+        
+        print(f"Startup replaying the log: {start_up(directory):.2f}s")
+        
+        journal = InMemoryJournal(directory, snapshot_interval=None)
+        journal.open()
+        start = time.perf_counter()
+        journal.close()
+        print(f"Snapshot written in {time.perf_counter() - start:.2f}s")
+        
+        print(f"Startup from the snapshot: {start_up(directory):.2f}s")
+    clear_database()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.messages)
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Benchmark for the memory footprint of stored messages.
+
+Adds messages to conversations through AddMessageUseCase and reports the
+memory allocated per message, as measured by tracemalloc. For comparison
+it also reports the footprint when every conversation additionally keeps
+its own list of messages, as conversations used to.
+
+Run with:
+    python -m benchmarks.bench_memory [--messages 1000000]
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Optional
+from application.features.conversation.use_cases.add_message import AddMessageUseCase
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from domain.services.abstract_message_processor import AbstractMessageProcessor
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+CONVERSATIONS = 1000
+
+class SilentProcessor(AbstractMessageProcessor):
+    """Message processor that never responds, so only user messages are stored."""
+    def process(self, message: Message) -> Optional[Message]:
+        return None
+
+def measure(count: int, keep_conversation_lists: bool) -> float:
+    """Return the number of bytes allocated per added message."""
+    clear_database()
+    gc.collect()
+    conversations = InMemoryRepository[Conversation]("conversations")
+    messages = InMemoryRepository[Message]("messages")
+    use_case = AddMessageUseCase(conversations, messages, SilentProcessor())
+    for i in range(CONVERSATIONS):
+        conversations.save(Conversation(id=f"conv_{i}", title=f"Conversation {i}", owner_id="user_1"))
+    # The former per-conversation message lists
+    conversation_lists = {f"conv_{i}": [] for i in range(CONVERSATIONS)}
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        conversation_id = f"conv_{i % CONVERSATIONS}"
+        added = use_case.execute(conversation_id, f"Message number {i}", "user_1")
+        if keep_conversation_lists:
+            conversation_lists[conversation_id].append(messages.find_by_id(added[0].id))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    clear_database()
+    return (after - before) / count
+
+def run(count: int) -> None:
+    print(f"{'layout':<34} {'bytes/message':>14}")
+    print(f"{'conversation lists + repository':<34} {measure(count, keep_conversation_lists=True):>14.1f}")
+    print(f"{'repository only':<34} {measure(count, keep_conversation_lists=False):>14.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.messages)
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Benchmark for InMemoryRepository primary-key operations.
+
+Fills the message collection with an increasing number of messages and
+measures the latency of save, find_by_id and delete, which should stay
+flat as the store grows.
+
+Run with:
+    python -m benchmarks.bench_repository [--sizes 1000 10000 100000 1000000]
+"""
+import argparse
+import random
+import time
+from domain.entities.message import Message
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+def fill(repository: InMemoryRepository, size: int) -> None:
+    for i in range(size):
+        repository.save(Message(
+            id=f"msg_{i}",
+            content=f"Message number {i}",
+            sender="user",
+            conversation_id=f"conv_{i % 1000}"
+        ))
+
+def measure(operation, ids, repeat: int = 5) -> float:
+    """Return the best mean latency in microseconds over several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for id in ids:
+            operation(id)
+        best = min(best, (time.perf_counter() - start) / len(ids))
+    return best * 1_000_000
+
+def run(sizes, operations: int) -> None:
+    print(f"{'stored':>10} {'save (us)':>10} {'find (us)':>10} {'delete+save (us)':>17}")
+    for size in sizes:
+        clear_database()
+        repository = InMemoryRepository[Message]("messages")
+        fill(repository, size)
+        
+        ids = [f"msg_{random.randrange(size)}" for _ in range(operations)]
+        new_messages = {
+            id: Message(id=id, content="updated", sender="user", conversation_id="conv_0")
+            for id in ids
+        }
+        
+        save = measure(lambda id: repository.save(new_messages[id]), ids)
+        find = measure(repository.find_by_id, ids)
+        delete = measure(lambda id: (repository.delete(id), repository.save(new_messages[id])), ids)
+        
+        print(f"{size:>10} {save:>10.3f} {find:>10.3f} {delete:>17.3f}")
+    clear_database()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--operations", type=int, default=10_000)
+    args = parser.parse_args()
+    run(args.sizes, args.operations)
@@ -0,0 +1,50 @@
+"""
+Benchmark for conversation title search through the inverted index.
+
+Saves a large number of conversations with generated titles and measures
+the latency of ranked, paginated title searches.
+
+Run with:
+    python -m benchmarks.bench_search [--conversations 200000]
+"""
+import argparse
+import random
+import time
+from domain.entities.conversation import Conversation
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+WORDS = [
+    "weekly", "planning", "meeting", "budget", "review", "customer", "support",
+    "ticket", "release", "notes", "travel", "booking", "invoice", "roadmap",
+    "onboarding", "feedback", "incident", "retro", "design", "hiring"
+]
+
+QUERIES = ["budget", "customer support", "plan", "incident retro", "onb", "release notes 4217"]
+
+def run(size: int, repeat: int) -> None:
+    clear_database()
+    repository = InMemoryRepository[Conversation]("conversations")
+    rng = random.Random(42)
+    
+    start = time.perf_counter()
+    for i in range(size):
+        title = " ".join(rng.sample(WORDS, 3)) + f" {i}"
+        repository.save(Conversation(id=f"conv_{i}", title=title, owner_id=f"user_{i % 100}"))
+    print(f"Indexed {size} conversations in {time.perf_counter() - start:.2f}s")
+    
+    print(f"{'query':<22} {'latency (ms)':>12}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            repository.search_conversations(query, limit=10)
+        latency = (time.perf_counter() - start) / repeat * 1000
+        print(f"{query:<22} {latency:>12.3f}")
+    clear_database()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.conversations, args.repeat)
@@ -0,0 +1,113 @@
+"""
+Benchmark for the serialization of message lists.
+
+Measures the throughput of GET /api/conversations/{id}/messages for
+conversations of 10, 100 and 1000 messages, and compares the time spent
+serializing a page of messages on the fast path, which encodes the DTOs
+with pydantic's compiled serializer, with the former path, where FastAPI
+validated the DTOs again against the response model and encoded them with
+the json module. The fast path is also timed with DTOs built by
+model_construct instead of the validating constructor.
+
+Run with:
+    python -m benchmarks.bench_serialization [--sizes 10 100 1000] [--requests 200]
+"""
+import argparse
+import json
+import time
+import warnings
+from typing import Callable, List
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from api.app import create_app
+from api.responses import PydanticJSONResponse
+from application.features.conversation.dtos import MessageDTO
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from infrastructure.database.in_memory_database import clear_database
+
+MESSAGE_LIST_ADAPTER = TypeAdapter(List[MessageDTO])
+
+def fill(client: TestClient, size: int) -> List[Message]:
+    """Create a conversation of size messages and return them."""
+    conversations = client.app.state.conversation_repository
+    messages = client.app.state.message_repository
+    conversation = Conversation(id=f"conv_{size}", title="Benchmark", owner_id="user_1")
+    entities = []
+    for i in range(size):
+        message = Message(
+            id=f"msg_{size}_{i}",
+            content=f"Message number {i} with a few more words in it",
+            sender="user_1",
+            conversation_id=conversation.id
+        )
+        messages.save(message)
+        conversation.message_count += 1
+        entities.append(message)
+    conversations.save(conversation)
+    return entities
+
+def former_path(messages: List[Message]) -> bytes:
+    # Validated DTOs, validated again against the response model, then encoded by the json module
+    dtos = [
+        MessageDTO(
+            id=m.id,
+            content=m.content,
+            sender=m.sender,
+            conversation_id=m.conversation_id,
+            created_at=m.created_at
+        )
+        for m in messages
+    ]
+    validated = MESSAGE_LIST_ADAPTER.validate_python([dto.model_dump() for dto in dtos])
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode()
+
+def fast_path(messages: List[Message]) -> bytes:
+    return PydanticJSONResponse([MessageDTO.from_entity(m) for m in messages], MESSAGE_LIST_ADAPTER).body
+
+def constructed_path(messages: List[Message]) -> bytes:
+    # DTOs built without validation; the fast path uses the validating constructor, which is faster
+    dtos = [
+        MessageDTO.model_construct(
+            id=m.id,
+            content=m.content,
+            sender=m.sender,
+            conversation_id=m.conversation_id,
+            created_at=m.created_at
+        )
+        for m in messages
+    ]
+    return PydanticJSONResponse(dtos, MESSAGE_LIST_ADAPTER).body
+
+def timed(function: Callable[[], object], repeat: int) -> float:
+    """Return the mean number of microseconds taken by a call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1_000_000 / repeat
+
+def run(sizes: List[int], requests: int) -> None:
+    print(f"{'messages':>8} {'requests/s':>11} {'former (us)':>12} {'fast (us)':>10} {'speedup':>8} {'constructed (us)':>17}")
+    clear_database()
+    with TestClient(create_app()) as client:
+        for size in sizes:
+            messages = fill(client, size)
+            url = f"/api/conversations/conv_{size}/messages"
+            client.get(url, params={"limit": size})
+            elapsed = timed(lambda: client.get(url, params={"limit": size}), requests)
+            
+            repeat = max(10, 10_000 // size)
+            former = timed(lambda: former_path(messages), repeat)
+            fast = timed(lambda: fast_path(messages), repeat)
+            constructed = timed(lambda: constructed_path(messages), repeat)
+            print(f"{size:>8} {1_000_000 / elapsed:>11.0f} {former:>12.1f} {fast:>10.1f} {former / fast:>7.1f}x {constructed:>17.1f}")
+    clear_database()
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    run(args.sizes, args.requests)
\ No newline at end of file
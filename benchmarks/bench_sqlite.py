@@ -0,0 +1,90 @@
+"""
+Benchmark comparing SqliteRepository with InMemoryRepository.
+
+Saves conversations and messages one by one and in batched transactions,
+then measures the latency of the queries used by the API.
+
+Run with:
+    python -m benchmarks.bench_sqlite [--messages 100000]
+"""
+import argparse
+from contextlib import nullcontext
+import os
+import random
+import tempfile
+import time
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.database.sqlite_database import SqliteDatabase
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+from infrastructure.repositories.sqlite_repository import SqliteRepository
+
+CONVERSATIONS = 1000
+
+def make_messages(count: int):
+    return [
+        Message(id=f"msg_{i}", content=f"Message number {i}", sender="user", conversation_id=f"conv_{i % CONVERSATIONS}")
+        for i in range(count)
+    ]
+
+def timed(operation) -> float:
+    start = time.perf_counter()
+    operation()
+    return time.perf_counter() - start
+
+def query_latencies(conversations, messages, queries: int):
+    """Return the mean latency in microseconds of each API query."""
+    rng = random.Random(42)
+    conversation_ids = [f"conv_{rng.randrange(CONVERSATIONS)}" for _ in range(queries)]
+    
+    return {
+        "find_by_id": timed(lambda: [conversations.find_by_id(id) for id in conversation_ids]) / queries * 1e6,
+        "messages_of": timed(lambda: [messages.find_messages_by_conversation_id(id) for id in conversation_ids]) / queries * 1e6,
+        "recent": timed(lambda: [conversations.find_recent_conversations(limit=20) for _ in range(queries)]) / queries * 1e6,
+        "search": timed(lambda: [conversations.search_conversations("project 12") for _ in range(queries)]) / queries * 1e6
+    }
+
+def fill(conversations, messages, message_entities, transaction=None) -> float:
+    """Save all conversations and messages, in a single transaction if given one, and return the time taken."""
+    start = time.perf_counter()
+    with transaction() if transaction is not None else nullcontext():
+        for i in range(CONVERSATIONS):
+            conversations.save(Conversation(id=f"conv_{i}", title=f"Project {i} notes", owner_id="user_1"))
+        for message in message_entities:
+            messages.save(message)
+    return time.perf_counter() - start
+
+def run(message_count: int, queries: int) -> None:
+    message_entities = make_messages(message_count)
+    results = {}
+    
+    clear_database()
+    memory = (InMemoryRepository[Conversation]("conversations"), InMemoryRepository[Message]("messages"))
+    results["memory"] = (fill(*memory, message_entities), query_latencies(*memory, queries))
+    clear_database()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        for batch in (False, True):
+            database = SqliteDatabase(os.path.join(directory, f"bench_{batch}.db"))
+            sqlite = (SqliteRepository[Conversation]("conversations", database), SqliteRepository[Message]("messages", database))
+            name = "sqlite (batched)" if batch else "sqlite"
+            results[name] = (
+                fill(*sqlite, message_entities, database.transaction if batch else None),
+                query_latencies(*sqlite, queries)
+            )
+            database.close()
+    
+    print(f"{'repository':<17} {'fill (s)':>9} {'find (us)':>10} {'messages (us)':>14} {'recent (us)':>12} {'search (us)':>12}")
+    for name, (fill_time, latencies) in results.items():
+        print(
+            f"{name:<17} {fill_time:>9.2f} {latencies['find_by_id']:>10.1f} {latencies['messages_of']:>14.1f} "
+            f"{latencies['recent']:>12.1f} {latencies['search']:>12.1f}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+    run(args.messages, args.queries)
\ No newline at end of file
@@ -1,17 +1,46 @@
-from typing import List, override
+from typing import List, TYPE_CHECKING, override
+from datetime import datetime
 from domain.entities.message import Message
 from domain.entities.entity import Entity
 
+if TYPE_CHECKING:
+    from domain.repositories.abstract_repository import AbstractRepository
+
 class Conversation(Entity):
     """
     Base conversation class representing a private conversation between a specific owner and the assistant.
     By default, conversations are private and restricted to the owner.
+    
+    Messages are stored once, in the message repository. A conversation
+    only counts them, and its messages are read from the message repository
+    in use.
     """
+    __slots__ = ("title", "owner_id", "message_count", "created_at", "updated_at")
+    
     def __init__(self, id: str, title: str, owner_id: str):
         super().__init__(id)
         self.title = title
         self.owner_id = owner_id
-        self.messages: List[Message] = []
+        self.message_count = 0
+        self.created_at = datetime.now()
+        self.updated_at = self.created_at
+    
+    def can_add_message(self, message: Message) -> bool:
+        """
+        Check whether a message may be added to the conversation.
+        
+        Only messages from the owner or the assistant may be added, to maintain privacy.
+        """
+        return message.owner_id == self.owner_id or message.sender == "assistant"
+    
+    def can_import_message(self, message: Message) -> bool:
+        """
+        Check whether a message supplied by a client, such as a past message being imported, may be added.
+        
+        Unlike generated responses, the sender of such a message is not trusted,
+        so it must come from the owner whatever its sender.
+        """
+        return message.owner_id == self.owner_id
     
     def add_message(self, message: Message) -> None:
         """
@@ -20,42 +49,75 @@ class Conversation(Entity):
         This method has a contract that it will only add messages from the owner
         or the assistant to maintain privacy.
         """
-        if message.owner_id != self.owner_id and message.sender != "assistant":
+        if not self.can_add_message(message):
             raise PermissionError("Only the owner can add messages to this conversation")
         
-        self.messages.append(message)
+        # The message itself is stored by the message repository
+        self.count_messages(1, message.created_at)
     
-    def get_messages(self) -> List[Message]:
+    def count_messages(self, count: int, last_activity: datetime) -> None:
+        """
+        Count messages stored for the conversation.
+        
+        Args:
+            count: The number of messages stored
+            last_activity: The creation time of the most recent of them
+        """
+        self.message_count += count
+        # Imported messages may be older than the latest activity
+        self.updated_at = max(self.updated_at, last_activity)
+    
+    def get_messages(self, message_repository: "AbstractRepository[Message]") -> List[Message]:
         """
         Get all messages in the conversation.
         
         This method has a contract that it will only return messages
         from the owner and the assistant to maintain privacy.
+        
+        Args:
+            message_repository: The repository the messages are stored in
         """
-        return [msg for msg in self.messages if msg.sender == self.owner_id or msg.sender == "assistant"]
+        messages = message_repository.find_messages_by_conversation_id(self.id)
+        return [msg for msg in messages if msg.sender == self.owner_id or msg.sender == "assistant"]
     
     def get_message_count(self) -> int:
         """
         Get the number of messages in the conversation.
         """
-        return len(self.messages)
+        return self.message_count
 
 
 class PublicConversation(Conversation):
     """
     A public conversation that allows messages from any sender and makes all messages visible.
     """
+    __slots__ = ()
+    
+    @override
+    def can_add_message(self, message: Message) -> bool:
+        """
+        Messages from any sender may be added.
+        """
+        return True
+    
+    @override
+    def can_import_message(self, message: Message) -> bool:
+        """
+        User messages from any sender may be imported, assistant messages only from the owner.
+        """
+        return message.sender == "user" or message.owner_id == self.owner_id
+    
     @override
     def add_message(self, message: Message) -> None:
         """
         Allows messages from any sender to be added.
         """
         # Bypass the permission check in the parent class
-        self.messages.append(message)
+        self.count_messages(1, message.created_at)
     
     @override
-    def get_messages(self) -> List[Message]:
+    def get_messages(self, message_repository: "AbstractRepository[Message]") -> List[Message]:
         """
         Returns all messages without filtering.
         """
-        return self.messages
\ No newline at end of file
+        return message_repository.find_messages_by_conversation_id(self.id)
\ No newline at end of file
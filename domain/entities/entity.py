@@ -6,6 +6,11 @@ class Entity(ABC):
     
     This abstract class provides a common interface for all entities,
     ensuring they all have an ID property.
+    
+    Entities declare their attributes in __slots__, so instances carry no
+    per-instance dictionary.
     """
+    __slots__ = ("id",)
+    
     def __init__(self, id: str):
         self.id = id
\ No newline at end of file
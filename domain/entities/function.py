@@ -10,6 +10,8 @@ class Function(Entity):
     It includes metadata about the function such as its name, description,
     and parameters.
     """
+    __slots__ = ("name", "description", "parameters")
+    
     def __init__(
         self,
         id: str,
@@ -8,6 +8,8 @@ class FunctionCall(Entity):
     This class represents a call to a function with specific parameters
     and the result of the call.
     """
+    __slots__ = ("function_id", "parameters", "result", "status")
+    
     def __init__(
         self,
         id: str,
@@ -1,36 +1,48 @@
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
+import sys
 from domain.entities.entity import Entity
 
+# Creation times are stored as seconds since this naive instant; a float takes half the memory of a datetime
+EPOCH = datetime(1970, 1, 1)
+
 class Message(Entity):
     """
     Message entity representing a message in a conversation.
+    
+    Messages are by far the most numerous entities, so they are kept
+    compact: sender, owner and conversation IDs are interned, so messages
+    share one copy of each, and the creation time is stored as a float.
     """
+    __slots__ = ("content", "sender", "conversation_id", "owner_id", "_created_at")
+    
     def __init__(self, id: str, content: str, sender: str, conversation_id: str, owner_id: str = None):
         super().__init__(id)
         self.content = content
-        self.sender = sender
-        self.conversation_id = conversation_id
-        self.owner_id = owner_id
+        self.sender = sys.intern(sender)
+        self.conversation_id = sys.intern(conversation_id)
+        self.owner_id = sys.intern(owner_id) if owner_id is not None else None
         self.created_at = datetime.now()
+    
+    @property
+    def created_at(self) -> datetime:
+        """
+        The time the message was created.
+        """
+        return EPOCH + timedelta(seconds=self._created_at)
+    
+    @created_at.setter
+    def created_at(self, created_at: datetime) -> None:
+        self._created_at = (created_at - EPOCH).total_seconds()
         
     def save_to_database(self) -> None:
         """
         Directly saves the message to the in-memory database.
         """
-        from infrastructure.database.in_memory_database import database
+        from infrastructure.repositories.in_memory_repository import InMemoryRepository
         
-        if "messages" not in database:
-            database["messages"] = []
-            
-        database["messages"].append({
-            "id": self.id,
-            "content": self.content,
-            "sender": self.sender,
-            "owner_id": self.owner_id,
-            "conversation_id": self.conversation_id,
-            "created_at": self.created_at.isoformat()
-        })
+        # Go through the repository so the message indexes stay consistent
+        InMemoryRepository[Message]("messages").save(self)
         
     def process_content(self) -> Dict[str, Any]:
         """
@@ -40,32 +52,11 @@ class Message(Entity):
             A dictionary containing the processed information
         """
         if self.sender == "user":
-            message_lower = self.content.lower()
-            
-            # Function call intent triggers
-            function_call_triggers = [
-                "call", "function", "run", "execute", "perform", "use", "invoke",
-                "calculate", "compute", "weather", "time", "get", "find", "show"
-            ]
-            
-            # Check for function call intent
-            is_function_call = False
-            for trigger in function_call_triggers:
-                if trigger in message_lower:
-                    is_function_call = True
-                    break
-            
-            # Check for specific function patterns
-            if any(keyword in message_lower for keyword in ["add", "subtract", "multiply", "divide", "plus", "minus", "times", "+", "-", "*", "/"]):
-                is_function_call = True
-            
-            if any(keyword in message_lower for keyword in ["weather", "temperature", "forecast", "rain", "sunny"]):
-                is_function_call = True
-                
-            if any(keyword in message_lower for keyword in ["time", "clock", "hour", "minute", "timezone"]):
-                is_function_call = True
+            from infrastructure.services.intent_classifier import get_intent_classifier
             
-            return {"intent": "function_call" if is_function_call else "question"}
+            # Shares its triggers with function call extraction
+            classification = get_intent_classifier().classify(self.content)
+            return {"intent": classification["intent"]}
         else:
             return {"type": "response"}
             
@@ -1,4 +1,5 @@
-from typing import List, Optional, Generic, TypeVar
+from typing import List, Optional, Generic, Tuple, TypeVar
+from datetime import datetime
 from domain.entities.message import Message
 from domain.entities.conversation import Conversation
 from domain.entities.function import Function
@@ -18,6 +19,15 @@ class AbstractRepository(Generic[T]):
         """
         pass
     
+    def save_many(self, entities: List[T]) -> None:
+        """
+        Save several entities in one write.
+        
+        Args:
+            entities: The entities to save, in order
+        """
+        pass
+    
     def find_by_id(self, id: str) -> Optional[T]:
         """
         Find an entity by ID.
@@ -48,6 +58,23 @@ class AbstractRepository(Generic[T]):
         """
         pass
     
+    def record_messages(self, conversation_id: str, count: int, last_activity: datetime) -> Optional[Conversation]:
+        """
+        Count messages stored for a conversation in one atomic update.
+        
+        Unlike loading the conversation and saving it again, messages added
+        concurrently to the same conversation are all counted.
+        
+        Args:
+            conversation_id: The ID of the conversation
+            count: The number of messages stored
+            last_activity: The creation time of the most recent of them
+            
+        Returns:
+            The updated conversation if found, None otherwise
+        """
+        pass
+    
     def find_messages_by_conversation_id(self, conversation_id: str) -> List[Message]:
         """
         Find all messages in a conversation.
@@ -60,6 +87,29 @@ class AbstractRepository(Generic[T]):
         """
         pass
     
+    def find_messages_page(
+        self,
+        conversation_id: str,
+        limit: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        newest_first: bool = False
+    ) -> List[Message]:
+        """
+        Find a window of consecutive messages in a conversation.
+        
+        Args:
+            conversation_id: The ID of the conversation
+            limit: The maximum number of messages to return
+            before: An optional message ID; only messages added before it are returned
+            after: An optional message ID; only messages added after it are returned
+            newest_first: Whether to return the most recent messages first
+        
+        Returns:
+            A list of messages, empty if before or after is not in the conversation
+        """
+        pass
+    
     def find_messages_by_sender(self, sender: str) -> List[Message]:
         """
         Find all messages from a specific sender.
@@ -72,6 +122,37 @@ class AbstractRepository(Generic[T]):
         """
         pass
     
+    def find_messages_in_time_range(
+        self,
+        start: datetime,
+        end: datetime,
+        sender: Optional[str] = None
+    ) -> List[Message]:
+        """
+        Find the messages created in a time range, ordered by creation time.
+        
+        Args:
+            start: The earliest creation time, inclusive
+            end: The latest creation time, exclusive
+            sender: An optional sender the messages must be from
+            
+        Returns:
+            A list of messages created in the time range
+        """
+        pass
+    
+    def find_conversations_by_owner_id(self, owner_id: str) -> List[Conversation]:
+        """
+        Find all conversations belonging to an owner.
+        
+        Args:
+            owner_id: The ID of the owner
+            
+        Returns:
+            A list of conversations owned by the owner
+        """
+        pass
+    
     def find_conversations_by_title(self, title: str) -> List[Conversation]:
         """
         Find conversations by title.
@@ -84,12 +165,32 @@ class AbstractRepository(Generic[T]):
         """
         pass
     
-    def find_recent_conversations(self, limit: int = 10) -> List[Conversation]:
+    def search_conversations(self, query: str, limit: int = 10, offset: int = 0) -> List[Conversation]:
+        """
+        Search conversation titles, best match first.
+        
+        Args:
+            query: The words to search for; each word also matches as a prefix
+            limit: The maximum number of conversations to return
+            offset: The number of best matches to skip
+            
+        Returns:
+            A list of matching conversations ordered by relevance
+        """
+        pass
+    
+    def find_recent_conversations(
+        self,
+        limit: int = 10,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Conversation]:
         """
-        Find recent conversations.
+        Find recent conversations, ordered by last activity (most recent first).
         
         Args:
             limit: The maximum number of conversations to return
+            before: An optional (updated_at, id) position to resume from; only
+                conversations strictly older than it are returned
             
         Returns:
             A list of recent conversations
@@ -1,5 +1,6 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional
 from abc import ABC, abstractmethod
+import asyncio
 from domain.entities.function import Function
 
 class AbstractAIService(ABC):
@@ -7,12 +8,14 @@ class AbstractAIService(ABC):
     Service interface for interacting with AI models.
     """
     @abstractmethod
-    def generate_response(self, message_content: str) -> str:
+    def generate_response(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> str:
         """
         Generate a response to a message.
         
         Args:
             message_content: The content of the message to respond to
+            context: The previous turns of the conversation, as chat messages
+                with a role and a content, oldest first
             
         Returns:
             The generated response
@@ -31,4 +34,55 @@ class AbstractAIService(ABC):
         Returns:
             A list of function calls extracted from the message
         """
-        pass
\ No newline at end of file
+        pass
+    
+    async def generate_response_async(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> str:
+        """
+        Asynchronous variant of generate_response.
+        
+        The default implementation runs generate_response in a worker thread so
+        that a blocking implementation does not stall the event loop. Services
+        backed by a non-blocking client should override it.
+        
+        Args:
+            message_content: The content of the message to respond to
+            context: The previous turns of the conversation, as chat messages
+                with a role and a content, oldest first
+            
+        Returns:
+            The generated response
+        """
+        return await asyncio.to_thread(self.generate_response, message_content, context)
+    
+    async def extract_function_calls_async(self, message_content: str, available_functions: List[Function]) -> List[Dict[str, Any]]:
+        """
+        Asynchronous variant of extract_function_calls.
+        
+        The default implementation runs extract_function_calls in a worker thread.
+        
+        Args:
+            message_content: The content of the message to extract function calls from
+            available_functions: The list of available functions
+            
+        Returns:
+            A list of function calls extracted from the message
+        """
+        return await asyncio.to_thread(self.extract_function_calls, message_content, available_functions)
+    
+    async def stream_response(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> AsyncIterator[str]:
+        """
+        Generate a response to a message incrementally.
+        
+        The default implementation yields the whole response of
+        generate_response_async at once. Services able to produce partial
+        output should override it.
+        
+        Args:
+            message_content: The content of the message to respond to
+            context: The previous turns of the conversation, as chat messages
+                with a role and a content, oldest first
+            
+        Returns:
+            An asynchronous iterator over successive chunks of the response
+        """
+        yield await self.generate_response_async(message_content, context)
\ No newline at end of file
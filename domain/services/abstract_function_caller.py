@@ -1,5 +1,6 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from abc import ABC, abstractmethod
+import asyncio
 from domain.entities.function import Function
 from domain.entities.function_call import FunctionCall
 
@@ -21,6 +22,50 @@ class AbstractFunctionCaller(ABC):
         """
         pass
     
+    async def call_function_async(self, function: Function, parameters: Dict[str, Any]) -> FunctionCall:
+        """
+        Asynchronous variant of call_function.
+        
+        The default implementation runs call_function in a worker thread so that
+        a blocking implementation does not stall the event loop.
+        
+        Args:
+            function: The function to call
+            parameters: The parameters to pass to the function
+            
+        Returns:
+            A FunctionCall object representing the function call
+        """
+        return await asyncio.to_thread(self.call_function, function, parameters)
+    
+    async def call_functions_async(
+        self,
+        calls: List[Tuple[Function, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None
+    ) -> List[FunctionCall]:
+        """
+        Call several functions concurrently.
+        
+        The default implementation runs call_function_async for every call,
+        at most max_concurrency at a time.
+        
+        Args:
+            calls: The functions to call, each with the parameters to pass to it
+            max_concurrency: The maximum number of calls running at once; unlimited when None
+            
+        Returns:
+            A FunctionCall object for each call, in the order of the calls
+        """
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+        
+        async def call(function: Function, parameters: Dict[str, Any]) -> FunctionCall:
+            if semaphore is None:
+                return await self.call_function_async(function, parameters)
+            async with semaphore:
+                return await self.call_function_async(function, parameters)
+        
+        return list(await asyncio.gather(*(call(function, parameters) for function, parameters in calls)))
+    
     @abstractmethod
     def validate_parameters(self, function: Function, parameters: Dict[str, Any]) -> bool:
         """
@@ -1,5 +1,6 @@
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from abc import ABC, abstractmethod
+import asyncio
 from domain.entities.message import Message
 
 class AbstractMessageProcessor(ABC):
@@ -17,4 +18,43 @@ class AbstractMessageProcessor(ABC):
         Returns:
             A response message if applicable, None otherwise
         """
-        pass
\ No newline at end of file
+        pass
+    
+    async def process_async(self, message: Message) -> Optional[Message]:
+        """
+        Asynchronous variant of process.
+        
+        The default implementation runs process in a worker thread so that a
+        blocking implementation does not stall the event loop.
+        
+        Args:
+            message: The message to process
+            
+        Returns:
+            A response message if applicable, None otherwise
+        """
+        return await asyncio.to_thread(self.process, message)
+    
+    async def process_stream(self, message: Message) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a message, reporting progress as events while the response is generated.
+        
+        Every event has a "type". "token" events carry a chunk of the response
+        text in "content", and the last event is a "response" event carrying
+        the response Message in "message". Implementations may also report
+        "function_call" and "function_result" events. Nothing is yielded when
+        there is no response.
+        
+        The default implementation awaits process_async and reports its
+        response as a single chunk.
+        
+        Args:
+            message: The message to process
+            
+        Returns:
+            An asynchronous iterator over the processing events
+        """
+        response = await self.process_async(message)
+        if response:
+            yield {"type": "token", "content": response.content}
+            yield {"type": "response", "message": response}
\ No newline at end of file
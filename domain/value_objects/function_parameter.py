@@ -5,6 +5,8 @@ class FunctionParameter:
     This class represents a parameter for a function, including its name,
     type, description, and whether it's required.
     """
+    __slots__ = ("name", "type", "description", "required")
+    
     def __init__(
         self,
         name: str,
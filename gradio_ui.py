@@ -1,3 +1,4 @@
+import json
 import gradio as gr
 import requests
 
@@ -27,91 +28,105 @@ def create_conversation():
         print(f"Error creating conversation: {e}")
         return False
 
-def send_message(message, owner_id="gradio_user"):
+def stream_message(message, owner_id="gradio_user"):
     """
-    Send a message to the API.
+    Send a message to the API and open a stream of the response events.
     
     Args:
         message (str): The message content
         owner_id (str): The ID of the message owner
         
     Returns:
-        Response: The API response
+        Response: The streaming API response
     """
     global CONVERSATION_ID
     
     print(f"Sending message to conversation {CONVERSATION_ID}: {message}")
     response = requests.post(
-        f"{API_BASE_URL}/conversations/{CONVERSATION_ID}/messages",
-        json={"content": message, "owner_id": owner_id}
+        f"{API_BASE_URL}/conversations/{CONVERSATION_ID}/messages/stream",
+        json={"content": message, "owner_id": owner_id},
+        stream=True
     )
     
     print(f"Response status: {response.status_code}")
     return response
 
-def extract_assistant_response(messages):
+def read_events(response):
     """
-    Extract the most recent assistant response from a list of messages.
+    Parse the Server-Sent Events of a streaming response.
     
     Args:
-        messages (list): List of message objects
+        response (Response): The streaming API response
         
-    Returns:
-        str: The assistant's response or a default message
+    Yields:
+        tuple: The event name and its decoded data
     """
-    ai_messages = [msg for msg in messages if msg["sender"] == "assistant"]
-    
-    if ai_messages:
-        latest_response = ai_messages[-1]["content"]
-        print(f"Latest AI response: {latest_response}")
-        return latest_response
-    else:
-        print("No AI response found")
-        return "I'm processing your request..."
+    event = None
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            yield event, json.loads(line[len("data: "):])
 
 def respond(message, history):
     """
-    Send a user message to the API and get the assistant's response.
+    Send a user message to the API and stream the assistant's response.
     This is the main function used by the Gradio interface.
     
     Args:
         message (str): The user's message
         history (list): Chat history (managed by Gradio)
         
-    Returns:
-        str: The assistant's response
+    Yields:
+        str: The assistant's response so far
     """
     global CONVERSATION_ID
     
     # Create conversation if it doesn't exist
     if CONVERSATION_ID is None:
         if not create_conversation():
-            return "Sorry, I couldn't connect to the AI service. Please try again later."
+            yield "Sorry, I couldn't connect to the AI service. Please try again later."
+            return
     
     try:
         # Send user message to API
-        response = send_message(message)
+        response = stream_message(message)
         
         # Handle 404 error (conversation not found)
         if response.status_code == 404:
             print("Conversation not found (404). Creating a new conversation...")
             if not create_conversation():
-                return "Sorry, I couldn't connect to the AI service. Please try again later."
+                yield "Sorry, I couldn't connect to the AI service. Please try again later."
+                return
             
             # Re-send the message after creating the conversation
-            response = send_message(message)
+            response = stream_message(message)
             response.raise_for_status()
         else:
             response.raise_for_status()
-
-        # Process the response
-        messages = response.json()
-        print(f"Retrieved {len(messages)} messages from response")
-        return extract_assistant_response(messages)
+        
+        # Show the response as it is generated
+        partial_response = ""
+        yield "I'm processing your request..."
+        for event, data in read_events(response):
+            if event == "function_call":
+                yield f"{partial_response}Calling {data['name']}..."
+            elif event == "token":
+                partial_response += data["content"]
+                yield partial_response
+            elif event == "message" and data["message"]["sender"] == "assistant":
+                print(f"Latest AI response: {data['message']['content']}")
+                yield data["message"]["content"]
+            elif event == "error":
+                # The stream ended before a response was stored
+                print(f"Error generating response: {data['detail']}")
+                error_message = f"Sorry, there was an error generating the response: {data['detail']}"
+                yield f"{partial_response}\n\n{error_message}" if partial_response else error_message
+                return
             
     except requests.exceptions.RequestException as e:
         print(f"Error communicating with API: {e}")
-        return f"Sorry, there was an error communicating with the AI service: {str(e)}"
+        yield f"Sorry, there was an error communicating with the AI service: {str(e)}"
 
 # Create a Gradio chat interface
 demo = gr.ChatInterface(
@@ -1,30 +1,136 @@
-from typing import Dict, List
+from typing import Any, Dict, Iterator, Optional
+from contextlib import contextmanager
+import threading
 from domain.entities.entity import Entity
+from infrastructure.database.indexes import Index, HashIndex, InvertedIndex, RecencyIndex
 
 """
 In-memory database for entities.
 
 This module provides a simple in-memory database for entities.
+Each collection maps entity IDs to entities, so lookups, updates and
+deletes by ID are O(1). Python dictionaries preserve insertion order,
+which keeps the order in which entities were first saved.
+
+Secondary indexes are kept next to the collections they cover and are
+maintained by the repositories on every save and delete.
+
+Mutations can also be recorded in a journal, which makes the database
+survive restarts.
+
+Each collection has its own lock. Repositories hold it while they change
+a collection and its indexes, and while they read the indexes, so
+requests served by different threads never see a half-updated index.
+Operations on different collections do not wait for each other.
 """
 
-# Global in-memory database storing domain objects
-database: Dict[str, List[Entity]] = {
-    "messages": [],
-    "conversations": [],
-    "functions": [],
-    "function_calls": []
+# Global in-memory database storing domain objects keyed by ID
+database: Dict[str, Dict[str, Entity]] = {
+    "messages": {},
+    "conversations": {},
+    "functions": {},
+    "function_calls": {}
 }
 
+def create_indexes() -> Dict[str, Dict[str, Index]]:
+    """
+    Create the secondary indexes for each collection.
+    
+    Returns:
+        The indexes keyed by collection name, then by indexed attribute
+    """
+    return {
+        "messages": {
+            "conversation_id": HashIndex("conversation_id"),
+            "sender": HashIndex("sender")
+        },
+        "conversations": {
+            "owner_id": HashIndex("owner_id"),
+            "updated_at": RecencyIndex("updated_at"),
+            "title": InvertedIndex("title")
+        },
+        "functions": {
+            "name": InvertedIndex("name")
+        },
+        "function_calls": {}
+    }
+
+# Global secondary indexes over the collections in the database
+indexes: Dict[str, Dict[str, Index]] = create_indexes()
+
+# Global locks guarding each collection together with its indexes
+locks: Dict[str, threading.RLock] = {name: threading.RLock() for name in database}
+locks_lock = threading.Lock()
+
+def get_lock(collection: str) -> threading.RLock:
+    """
+    Get the lock of a collection, creating it for new collections.
+    
+    Args:
+        collection: The name of the collection
+    
+    Returns:
+        The reentrant lock guarding the collection and its indexes
+    """
+    lock = locks.get(collection)
+    if lock is None:
+        with locks_lock:
+            lock = locks.setdefault(collection, threading.RLock())
+    
+    return lock
+
+@contextmanager
+def lock_database() -> Iterator[None]:
+    """
+    Hold the locks of all collections, blocking every repository write.
+    """
+    # Locks are always taken in the same order, so this cannot deadlock
+    collection_locks = [get_lock(name) for name in sorted(database)]
+    for lock in collection_locks:
+        lock.acquire()
+    
+    try:
+        yield
+    finally:
+        for lock in reversed(collection_locks):
+            lock.release()
+
 def clear_database():
     """
     Clear all data from the database.
     
     This is useful for testing.
     """
-    database["messages"] = []
-    database["conversations"] = []
-    database["functions"] = []
-    database["function_calls"] = []
+    with lock_database():
+        database["messages"] = {}
+        database["conversations"] = {}
+        database["functions"] = {}
+        database["function_calls"] = {}
+        
+        indexes.clear()
+        indexes.update(create_indexes())
+
+# Global journal recording the mutations made through the repositories, if any
+journal: Optional[Any] = None
+
+def get_journal():
+    """
+    Get the journal recording the mutations of the database.
+    
+    Returns:
+        The journal, or None if mutations are not recorded
+    """
+    return journal
+
+def set_journal(new_journal) -> None:
+    """
+    Start or stop recording the mutations of the database.
+    
+    Args:
+        new_journal: The journal to record mutations in, or None to stop recording
+    """
+    global journal
+    journal = new_journal
 
 def get_database():
     """
@@ -33,4 +139,13 @@ def get_database():
     Returns:
         The database containing domain object collections
     """
-    return database
\ No newline at end of file
+    return database
+
+def get_indexes():
+    """
+    Get the secondary indexes.
+    
+    Returns:
+        The indexes keyed by collection name, then by indexed attribute
+    """
+    return indexes
\ No newline at end of file
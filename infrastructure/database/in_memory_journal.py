@@ -0,0 +1,275 @@
+from typing import List, Optional
+import gc
+import os
+import pickle
+import threading
+from domain.entities.entity import Entity
+from infrastructure.database.in_memory_database import database, indexes, lock_database, set_journal
+from infrastructure.database.write_ahead_log import WriteAheadLog
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+"""
+Crash safety for the in-memory database.
+
+Every save and delete made through the repositories is appended to a
+write-ahead log. The whole database, indexes included, is periodically
+written to a snapshot, after which the log is emptied. At startup the
+snapshot is loaded and only the records logged after it are replayed, so
+startup time is bounded by the size of the snapshot rather than by the
+whole history of the database.
+
+Writes are only blocked while the database is serialized for a snapshot.
+The log is rotated at the same time, so records logged while the snapshot
+is written are kept in the new log, and the previous log is removed once
+the snapshot is on disk.
+"""
+
+SNAPSHOT_FILE = "snapshot.pickle"
+LOG_FILE = "journal.log"
+# The log covered by the snapshot being written
+PREVIOUS_LOG_FILE = "journal.log.1"
+
+class InMemoryJournal:
+    """
+    Journal persisting the in-memory database to a directory.
+    
+    Replaying a record is idempotent, so records already contained in the
+    snapshot may safely be replayed again if the process stops between
+    writing a snapshot and emptying the log.
+    
+    Attributes:
+        directory: The directory holding the snapshot and the log
+        synchronous_commit: Whether writes wait until they are on disk
+        snapshot_interval: The number of seconds between snapshots, if taken periodically
+    """
+    def __init__(
+        self,
+        directory: str,
+        synchronous_commit: bool = False,
+        snapshot_interval: Optional[float] = 300.0
+    ):
+        """
+        Initialize the journal; call open to load the database and start recording.
+        
+        Args:
+            directory: The directory holding the snapshot and the log
+            synchronous_commit: Whether repository writes block until they are
+                fsynced; otherwise they return at once and are fsynced in the
+                background, so a crash loses at most the last group of writes,
+                even if they were acknowledged
+            snapshot_interval: The number of seconds between snapshots, or None
+                to only take them on demand and when the journal is closed
+        """
+        self.directory = directory
+        self.synchronous_commit = synchronous_commit
+        self.snapshot_interval = snapshot_interval
+        self._log: Optional[WriteAheadLog] = None
+        self._previous_log: Optional[WriteAheadLog] = None
+        self._snapshot_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._snapshotter: Optional[threading.Thread] = None
+    
+    def open(self) -> None:
+        """
+        Load the latest snapshot, replay the log over it, and start recording mutations.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        log_path = os.path.join(self.directory, LOG_FILE)
+        previous_log_path = os.path.join(self.directory, PREVIOUS_LOG_FILE)
+        
+        with lock_database():
+            self._load_snapshot()
+            interrupted = os.path.exists(previous_log_path)
+            self._replay(previous_log_path)
+            self._replay(log_path)
+            
+            if interrupted:
+                # The process stopped while a snapshot was written; the previous
+                # log can only be dropped once a snapshot covers it
+                self._write_snapshot(pickle.dumps((database, indexes), protocol=pickle.HIGHEST_PROTOCOL))
+                os.remove(previous_log_path)
+                open(log_path, "wb").close()
+            
+            self._log = WriteAheadLog(log_path)
+            set_journal(self)
+        
+        if self.snapshot_interval is not None:
+            self._snapshotter = threading.Thread(target=self._snapshot_loop, name="snapshot", daemon=True)
+            self._snapshotter.start()
+    
+    def record_save(self, collection: str, entity: Entity) -> int:
+        """
+        Record that an entity was saved.
+        
+        Args:
+            collection: The collection of the entity
+            entity: The saved entity
+        
+        Returns:
+            The sequence number of the record, to pass to wait
+        """
+        return self._log.append(("save", collection, entity))
+    
+    def record_save_many(self, collection: str, entities: List[Entity]) -> int:
+        """
+        Record that several entities were saved, as a single record.
+        
+        Args:
+            collection: The collection of the entities
+            entities: The saved entities, in order
+        
+        Returns:
+            The sequence number of the record, to pass to wait
+        """
+        return self._log.append(("save_many", collection, entities))
+    
+    def record_delete(self, collection: str, id: str) -> int:
+        """
+        Record that an entity was deleted.
+        
+        Args:
+            collection: The collection of the entity
+            id: The ID of the deleted entity
+        
+        Returns:
+            The sequence number of the record, to pass to wait
+        """
+        return self._log.append(("delete", collection, id))
+    
+    def wait(self, sequence: int) -> None:
+        """
+        Wait until a record is on disk, if commits are synchronous.
+        
+        Args:
+            sequence: The sequence number of the record
+        """
+        if self.synchronous_commit:
+            # The current log is read first; the previous one is only cleared once closed
+            log = self._log
+            previous_log = self._previous_log
+            if previous_log is not None and sequence <= previous_log.appended:
+                previous_log.wait(sequence)
+            else:
+                log.wait(sequence)
+    
+    def snapshot(self) -> None:
+        """
+        Write the whole database to a new snapshot and empty the log.
+        
+        Writes are only blocked while the collections and indexes are
+        serialized, not while the snapshot is written to disk.
+        """
+        log_path = os.path.join(self.directory, LOG_FILE)
+        previous_log_path = os.path.join(self.directory, PREVIOUS_LOG_FILE)
+        
+        with self._snapshot_lock:
+            with lock_database():
+                # Entities are updated in place, so they are serialized at the
+                # same point as the log is rotated, not while the snapshot is written
+                data = pickle.dumps((database, indexes), protocol=pickle.HIGHEST_PROTOCOL)
+                
+                # Records logged from now on go to a new log, which the snapshot does not cover
+                previous_log = self._log
+                os.replace(log_path, previous_log_path)
+                self._previous_log = previous_log
+                self._log = WriteAheadLog(log_path, first_sequence=previous_log.appended)
+            
+            try:
+                self._write_snapshot(data)
+            except BaseException:
+                self._merge_logs()
+                raise
+            
+            previous_log.close()
+            self._previous_log = None
+            os.remove(previous_log_path)
+    
+    def close(self, snapshot: bool = True) -> None:
+        """
+        Stop recording mutations and close the log.
+        
+        Args:
+            snapshot: Whether to take a final snapshot, so that the next start
+                does not have to replay the log
+        """
+        self._stopped.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        
+        if snapshot:
+            self.snapshot()
+        set_journal(None)
+        self._log.close()
+    
+    def _snapshot_loop(self) -> None:
+        while not self._stopped.wait(self.snapshot_interval):
+            self.snapshot()
+    
+    def _write_snapshot(self, data: bytes) -> None:
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        temporary_path = path + ".tmp"
+        
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        
+        # The new snapshot replaces the old one atomically
+        os.replace(temporary_path, path)
+    
+    def _merge_logs(self) -> None:
+        # Without a new snapshot, the previous log is still needed; the records
+        # logged since are moved back after it, so the next snapshot can rotate again
+        log_path = os.path.join(self.directory, LOG_FILE)
+        previous_log_path = os.path.join(self.directory, PREVIOUS_LOG_FILE)
+        
+        with lock_database():
+            log = self._log
+            log.close()
+            self._previous_log.close()
+            
+            with open(log_path, "rb") as source, open(previous_log_path, "ab") as destination:
+                destination.write(source.read())
+                destination.flush()
+                os.fsync(destination.fileno())
+            os.replace(previous_log_path, log_path)
+            
+            self._log = WriteAheadLog(log_path, first_sequence=log.appended)
+            self._previous_log = None
+    
+    def _load_snapshot(self) -> None:
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return
+        
+        # Collecting garbage while millions of objects are created only slows loading down
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, "rb") as file:
+                loaded_database, loaded_indexes = pickle.load(file)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        
+        # Repositories hold references to these dictionaries, so they are updated in place
+        database.clear()
+        database.update(loaded_database)
+        indexes.clear()
+        indexes.update(loaded_indexes)
+    
+    def _replay(self, log_path: str) -> None:
+        repositories = {}
+        
+        # Mutations are not recorded again while the journal is not set
+        for operation, collection, value in WriteAheadLog.read(log_path):
+            repository = repositories.get(collection)
+            if repository is None:
+                repository = repositories[collection] = InMemoryRepository(collection)
+            
+            if operation == "save":
+                repository.save(value)
+            elif operation == "save_many":
+                repository.save_many(value)
+            else:
+                repository.delete(value)
\ No newline at end of file
@@ -0,0 +1,429 @@
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from datetime import datetime
+from itertools import islice
+import math
+import re
+from domain.entities.entity import Entity
+
+"""
+Secondary indexes for the in-memory database.
+
+Indexes are maintained by the repositories on every save and delete so
+that attribute lookups do not need to scan a whole collection.
+"""
+
+# Words are runs of letters and digits; underscores split words so that
+# "get_weather" is indexed as "get" and "weather"
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into case-folded search tokens.
+    
+    Args:
+        text: The text to tokenize
+        
+    Returns:
+        The tokens in the order they appear
+    """
+    return TOKEN_PATTERN.findall(text.casefold())
+
+class Index(ABC):
+    """
+    Interface shared by all secondary indexes.
+    """
+    @abstractmethod
+    def add(self, entity: Entity) -> None:
+        """
+        Index an entity, or re-index it if it is already indexed.
+        
+        Args:
+            entity: The entity to index
+        """
+        pass
+    
+    def add_many(self, entities: List[Entity]) -> None:
+        """
+        Index several entities, in order.
+        
+        Args:
+            entities: The entities to index
+        """
+        for entity in entities:
+            self.add(entity)
+    
+    @abstractmethod
+    def remove(self, id: str) -> None:
+        """
+        Remove an entity from the index.
+        
+        Args:
+            id: The ID of the entity to remove
+        """
+        pass
+
+
+class HashIndex(Index):
+    """
+    Index mapping an entity attribute value to the IDs of the entities holding it.
+    
+    IDs are kept in the order they were first indexed, so lookups return
+    entities in insertion order. The index remembers the key each ID was
+    stored under, which keeps it consistent when an entity is mutated in
+    place and saved again.
+    
+    Each ID is numbered when it is indexed under its key, and the IDs of a
+    key are kept in that order, so the position of an ID is found by
+    bisection rather than by walking the IDs before it.
+    """
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+        self._entries: Dict[Hashable, List[str]] = {}
+        self._keys: Dict[str, Hashable] = {}
+        self._sequences: Dict[str, int] = {}
+        self._next_sequence = 0
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Snapshots written before IDs were numbered hold the IDs of each key in a dict
+        if "_sequences" not in state:
+            entries = state["_entries"]
+            state["_entries"] = {key: list(ids) for key, ids in entries.items()}
+            state["_sequences"] = {id: sequence for sequence, id in enumerate(id for ids in entries.values() for id in ids)}
+            state["_next_sequence"] = len(state["_sequences"])
+        self.__dict__.update(state)
+    
+    def add(self, entity: Entity) -> None:
+        key = getattr(entity, self.attribute, None)
+        
+        if entity.id in self._keys:
+            if self._keys[entity.id] == key:
+                return
+            self.remove(entity.id)
+        
+        if key is None:
+            return
+        
+        self._entries.setdefault(key, []).append(entity.id)
+        self._keys[entity.id] = key
+        self._sequences[entity.id] = self._next_sequence
+        self._next_sequence += 1
+    
+    def add_many(self, entities: List[Entity]) -> None:
+        attribute = self.attribute
+        entries = self._entries
+        keys = self._keys
+        sequences = self._sequences
+        
+        for entity in entities:
+            if entity.id in keys:
+                self.add(entity)
+                continue
+            
+            key = getattr(entity, attribute, None)
+            if key is None:
+                continue
+            
+            ids = entries.get(key)
+            if ids is None:
+                ids = entries[key] = []
+            ids.append(entity.id)
+            keys[entity.id] = key
+            sequences[entity.id] = self._next_sequence
+            self._next_sequence += 1
+    
+    def remove(self, id: str) -> None:
+        if id not in self._keys:
+            return
+        
+        key = self._keys.pop(id)
+        ids = self._entries[key]
+        del ids[self._position(ids, id)]
+        del self._sequences[id]
+        if not ids:
+            del self._entries[key]
+    
+    def get(self, key: Any) -> Iterator[str]:
+        """
+        Get the IDs of the entities indexed under a key.
+        
+        Args:
+            key: The attribute value to look up
+            
+        Returns:
+            An iterator over the matching IDs in insertion order
+        """
+        return iter(self._entries.get(key, ()))
+    
+    def window(
+        self,
+        key: Any,
+        limit: int,
+        start: Optional[str] = None,
+        stop: Optional[str] = None,
+        reverse: bool = False
+    ) -> List[str]:
+        """
+        Get consecutive IDs indexed under a key, without visiting the IDs past the window.
+        
+        Args:
+            key: The attribute value to look up
+            limit: The maximum number of IDs to return
+            start: An optional ID the window starts right after
+            stop: An optional ID the window ends right before
+            reverse: Whether to walk from the most recently indexed ID
+        
+        Returns:
+            The IDs in walking order, empty if start or stop is not indexed
+            under the key, or if stop comes before start
+        """
+        ids = self._entries.get(key, [])
+        for cursor in [start, stop]:
+            if cursor is not None and (cursor not in self._keys or self._keys[cursor] != key):
+                return []
+        
+        # Bounds of the window in insertion order
+        lower, upper = 0, len(ids)
+        if start is not None:
+            if reverse:
+                upper = self._position(ids, start)
+            else:
+                lower = self._position(ids, start) + 1
+        if stop is not None:
+            if reverse:
+                lower = self._position(ids, stop) + 1
+            else:
+                upper = self._position(ids, stop)
+        
+        if reverse:
+            return ids[max(lower, upper - limit):upper][::-1]
+        return ids[lower:min(upper, lower + limit)]
+    
+    def _position(self, ids: List[str], id: str) -> int:
+        return bisect_left(ids, self._sequences[id], key=self._sequences.__getitem__)
+    
+    def count(self, key: Any) -> int:
+        """
+        Get the number of entities indexed under a key.
+        """
+        return len(self._entries.get(key, ()))
+
+
+class RecencyIndex(Index):
+    """
+    Index keeping entity IDs ordered by a timestamp attribute.
+    
+    Entries are kept sorted as (timestamp, id) pairs, with the ID breaking
+    ties so the order is total. New activity is usually the most recent,
+    so re-indexing an entity is mostly a removal plus an append. Reading
+    the newest entries is O(log n + limit).
+    """
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+        self._entries: List[Tuple[float, str]] = []
+        self._keys: Dict[str, Tuple[float, str]] = {}
+    
+    def add(self, entity: Entity) -> None:
+        timestamp: Optional[datetime] = getattr(entity, self.attribute, None)
+        if timestamp is None:
+            self.remove(entity.id)
+            return
+        
+        key = (timestamp.timestamp(), entity.id)
+        if self._keys.get(entity.id) == key:
+            return
+        
+        self.remove(entity.id)
+        if not self._entries or self._entries[-1] < key:
+            self._entries.append(key)
+        else:
+            insort(self._entries, key)
+        self._keys[entity.id] = key
+    
+    def remove(self, id: str) -> None:
+        if id not in self._keys:
+            return
+        
+        key = self._keys.pop(id)
+        del self._entries[bisect_left(self._entries, key)]
+    
+    def newest(self, limit: int, before: Optional[Tuple[datetime, str]] = None) -> List[str]:
+        """
+        Get the IDs of the most recent entities.
+        
+        Args:
+            limit: The maximum number of IDs to return
+            before: An optional (timestamp, id) position; only entries strictly
+                older than it are returned
+            
+        Returns:
+            The matching IDs, most recent first
+        """
+        end = len(self._entries)
+        if before is not None:
+            end = bisect_left(self._entries, (before[0].timestamp(), before[1]))
+        
+        start = max(0, end - limit)
+        return [id for _, id in reversed(self._entries[start:end])]
+
+
+class InvertedIndex(Index):
+    """
+    Full-text index mapping the tokens of a text attribute to the entities containing them.
+    
+    A query matches entities containing every query token. With prefix
+    matching enabled, a query token also matches indexed tokens starting
+    with it, found by binary search over the sorted vocabulary. Results are
+    ranked by the inverse document frequency of the matched tokens, with
+    exact matches weighted above prefix matches; ties go to the most
+    recently indexed entity. Postings are walked best weight first and most
+    recent first, so the walk stops as soon as the requested page can no
+    longer change.
+    """
+    PREFIX_WEIGHT = 0.5
+    
+    def __init__(self, attribute: str, max_prefix_expansions: int = 64):
+        self.attribute = attribute
+        self.max_prefix_expansions = max_prefix_expansions
+        self._postings: Dict[str, Dict[str, None]] = {}
+        self._documents: Dict[str, Tuple[str, ...]] = {}
+        self._vocabulary: List[str] = []
+    
+    def add(self, entity: Entity) -> None:
+        text = getattr(entity, self.attribute, None)
+        terms = tuple(dict.fromkeys(tokenize(text))) if text else ()
+        if self._documents.get(entity.id) == terms:
+            return
+        
+        self.remove(entity.id)
+        if not terms:
+            return
+        
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            posting[entity.id] = None
+        self._documents[entity.id] = terms
+    
+    def remove(self, id: str) -> None:
+        terms = self._documents.pop(id, None)
+        if terms is None:
+            return
+        
+        for term in terms:
+            posting = self._postings[term]
+            del posting[id]
+            if not posting:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+    
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        prefix: bool = True
+    ) -> List[str]:
+        """
+        Get the IDs of the entities matching a query, best match first.
+        
+        Args:
+            query: The text to search for
+            limit: The maximum number of IDs to return, or None for all matches
+            offset: The number of best matches to skip
+            prefix: Whether query tokens also match longer indexed tokens
+            
+        Returns:
+            The matching IDs ordered by decreasing relevance
+        """
+        tokens = dict.fromkeys(tokenize(query))
+        matches = [self._match_terms(token, prefix) for token in tokens]
+        if not matches or not all(matches):
+            return []
+        
+        end = None if limit is None else offset + limit
+        if len(matches) == 1:
+            return list(islice(self._rank_single(matches[0]), offset, end))
+        
+        # Walk the most selective token and check the others for each candidate
+        matches.sort(key=lambda terms: sum(len(posting) for _, posting in terms))
+        first, others = matches[0], matches[1:]
+        
+        scores: Dict[str, float] = {}
+        for weight, posting in first:
+            # No candidate left in this posting can score above this bound, so
+            # walking stops once enough candidates have reached it
+            bound = weight
+            for terms in others:
+                bound += terms[0][0]
+            reached = sum(1 for score in scores.values() if score >= bound)
+            if end is not None and reached >= end:
+                break
+            
+            for id in reversed(posting):
+                if id in scores:
+                    continue
+                
+                score = weight
+                for terms in others:
+                    best = next((w for w, other in terms if id in other), None)
+                    if best is None:
+                        break
+                    score += best
+                else:
+                    scores[id] = score
+                    if score >= bound:
+                        reached += 1
+                        if end is not None and reached >= end:
+                            break
+            else:
+                continue
+            break
+        
+        # The sort is stable, so equal scores keep the most recent entity first
+        return sorted(scores, key=scores.__getitem__, reverse=True)[offset:end]
+    
+    def _match_terms(self, token: str, prefix: bool) -> List[Tuple[float, Dict[str, None]]]:
+        """
+        Get the weighted postings of the indexed terms matching a query token, heaviest first.
+        """
+        terms = [token] if token in self._postings else []
+        if prefix:
+            vocabulary = self._vocabulary
+            position = bisect_left(vocabulary, token)
+            end = min(len(vocabulary), position + self.max_prefix_expansions + 1)
+            terms.extend(
+                term for term in vocabulary[position:end]
+                if term != token and term.startswith(token)
+            )
+        
+        total = len(self._documents)
+        weighted = []
+        for term in terms:
+            posting = self._postings[term]
+            weight = math.log(1 + total / len(posting))
+            if term != token:
+                weight *= self.PREFIX_WEIGHT
+            weighted.append((weight, posting))
+        
+        weighted.sort(key=lambda item: item[0], reverse=True)
+        return weighted
+    
+    @staticmethod
+    def _rank_single(terms: List[Tuple[float, Dict[str, None]]]) -> Iterator[str]:
+        """
+        Yield the IDs matching a single query token in rank order.
+        """
+        if len(terms) == 1:
+            yield from reversed(terms[0][1])
+            return
+        
+        seen = set()
+        for _, posting in terms:
+            for id in reversed(posting):
+                if id not in seen:
+                    seen.add(id)
+                    yield id
\ No newline at end of file
@@ -0,0 +1,237 @@
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+import sqlite3
+import threading
+
+"""
+SQLite database for entities.
+
+This module provides a persistent alternative to the in-memory database.
+The database runs in WAL mode, so readers in other processes are not
+blocked by a writer and several workers can share the same file.
+
+Each collection is a table with an index for every attribute the
+repositories query on. Rows are numbered in the order entities are first
+saved, which keeps the insertion order of the in-memory database.
+Conversation titles and function names also have full-text indexes.
+
+The schema version is stored in the database file. Files created with an
+older schema are migrated when they are opened.
+"""
+
+# Version of SCHEMA; databases created before versions were recorded have version 1
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    owner_id TEXT NOT NULL,
+    is_public INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_owner_id ON conversations (owner_id);
+CREATE INDEX IF NOT EXISTS conversations_updated_at ON conversations (updated_at, id);
+
+CREATE TABLE IF NOT EXISTS messages (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    content TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    conversation_id TEXT NOT NULL,
+    owner_id TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_conversation_id ON messages (conversation_id, seq);
+CREATE INDEX IF NOT EXISTS messages_sender ON messages (sender, seq);
+CREATE INDEX IF NOT EXISTS messages_created_at ON messages (created_at);
+
+CREATE TABLE IF NOT EXISTS functions (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    parameters TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS function_calls (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    function_id TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    result TEXT,
+    status TEXT NOT NULL
+);
+"""
+
+# Statements bringing a database from the previous schema version to each version
+MIGRATIONS = {
+    # Conversations count their messages instead of holding them
+    2: """
+ALTER TABLE conversations ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0;
+UPDATE conversations SET message_count = (
+    SELECT COUNT(*) FROM messages WHERE messages.conversation_id = conversations.id
+);
+"""
+}
+
+def full_text_index(table: str, column: str) -> str:
+    """
+    Get the schema of a full-text index over a text column, kept in sync by triggers.
+    
+    Args:
+        table: The indexed table
+        column: The indexed column
+    
+    Returns:
+        The statements creating the index, named "<table>_<column>", and its triggers
+    """
+    index = f"{table}_{column}"
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5 (
+    {column}, content='{table}', content_rowid='seq', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS {index}_insert AFTER INSERT ON {table} BEGIN
+    INSERT INTO {index} (rowid, {column}) VALUES (new.seq, new.{column});
+END;
+CREATE TRIGGER IF NOT EXISTS {index}_delete AFTER DELETE ON {table} BEGIN
+    INSERT INTO {index} ({index}, rowid, {column}) VALUES ('delete', old.seq, old.{column});
+END;
+CREATE TRIGGER IF NOT EXISTS {index}_update AFTER UPDATE OF {column} ON {table} BEGIN
+    INSERT INTO {index} ({index}, rowid, {column}) VALUES ('delete', old.seq, old.{column});
+    INSERT INTO {index} (rowid, {column}) VALUES (new.seq, new.{column});
+END;
+"""
+
+class SqliteDatabase:
+    """
+    Connection to a SQLite database file shared by the SQLite repositories.
+    
+    The connection is shared between threads and guarded by a lock. Writes
+    are committed immediately, unless they are made inside a transaction
+    block, in which case they are committed together when the block exits.
+    """
+    def __init__(self, path: str):
+        """
+        Open the database, creating the file and the schema if needed.
+        
+        Args:
+            path: The path of the database file, or ":memory:"
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        
+        # Transactions are managed explicitly, so the driver must not open its own
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only risks the last transactions on power loss, never corruption
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=OFF")
+        self._migrate()
+        self._connection.executescript(SCHEMA)
+        self._connection.executescript(full_text_index("conversations", "title"))
+        self._connection.executescript(full_text_index("functions", "name"))
+    
+    def _migrate(self) -> None:
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            existing = self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations'"
+            ).fetchone()
+            if existing is None:
+                # New databases are created with the latest schema
+                self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                return
+            version = 1
+        
+        for next_version in range(version + 1, SCHEMA_VERSION + 1):
+            self._connection.executescript(
+                f"BEGIN; {MIGRATIONS[next_version]} PRAGMA user_version = {next_version}; COMMIT;"
+            )
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group the writes made in the block into a single transaction.
+        
+        Committing once for many writes is much faster than committing each
+        of them. Blocks may be nested; the outermost block commits, or rolls
+        back if an exception escapes it.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._connection.execute("BEGIN")
+            self._depth += 1
+            
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute("ROLLBACK")
+                raise
+            
+            self._depth -= 1
+            if self._depth == 0:
+                self._connection.execute("COMMIT")
+    
+    def execute(self, sql: str, parameters: Iterable[Any] = ()) -> None:
+        """
+        Execute a write statement.
+        
+        Args:
+            sql: The statement; statements are prepared once and cached by text
+            parameters: The values bound to the statement placeholders
+        """
+        with self.transaction():
+            self._connection.execute(sql, tuple(parameters))
+    
+    def execute_many(self, sql: str, rows: Iterable[Iterable[Any]]) -> None:
+        """
+        Execute a write statement once per row, in a single transaction.
+        
+        Args:
+            sql: The statement
+            rows: The values bound to the statement placeholders for each execution
+        """
+        with self.transaction():
+            self._connection.executemany(sql, rows)
+    
+    def query(self, sql: str, parameters: Iterable[Any] = ()) -> List[Tuple[Any, ...]]:
+        """
+        Execute a read statement.
+        
+        Args:
+            sql: The statement
+            parameters: The values bound to the statement placeholders
+        
+        Returns:
+            The rows returned by the statement
+        """
+        with self._lock:
+            return self._connection.execute(sql, tuple(parameters)).fetchall()
+    
+    def query_one(self, sql: str, parameters: Iterable[Any] = ()) -> Optional[Tuple[Any, ...]]:
+        """
+        Execute a read statement returning at most one row.
+        
+        Args:
+            sql: The statement
+            parameters: The values bound to the statement placeholders
+        
+        Returns:
+            The row, or None if the statement returned no row
+        """
+        with self._lock:
+            return self._connection.execute(sql, tuple(parameters)).fetchone()
+    
+    def close(self) -> None:
+        """
+        Close the connection.
+        """
+        with self._lock:
+            self._connection.close()
\ No newline at end of file
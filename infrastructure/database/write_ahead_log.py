@@ -0,0 +1,184 @@
+from typing import Any, Iterator, List, Optional
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+"""
+Append-only log of database mutations.
+
+Each record is framed by its length and a CRC32 checksum, so a record
+torn by a crash is detected and dropped when the log is read back.
+
+Records are buffered in memory and written by a background thread. The
+records appended while the thread waits for an fsync are written and
+fsynced together by the next one (group commit), so a single fsync covers
+many writes when they are frequent, however many threads make them.
+"""
+
+# Length and CRC32 of the payload
+FRAME_HEADER = struct.Struct("<II")
+
+class WriteAheadLog:
+    """
+    Append-only, group-committed log of records.
+    
+    Attributes:
+        path: The path of the log file
+    """
+    def __init__(self, path: str, first_sequence: int = 0):
+        """
+        Open the log for appending, creating the file if needed.
+        
+        Args:
+            path: The path of the log file
+            first_sequence: The sequence number records are numbered after,
+                to continue the numbering of a previous log
+        """
+        self.path = path
+        self._file = open(path, "ab")
+        self._file_lock = threading.Lock()
+        self._buffer: List[bytes] = []
+        self._appended = first_sequence
+        self._committed = first_sequence
+        self._closed = False
+        self._condition = threading.Condition()
+        self._writer = threading.Thread(target=self._commit_loop, name="write-ahead-log", daemon=True)
+        self._writer.start()
+    
+    def append(self, record: Any) -> int:
+        """
+        Append a record to the log.
+        
+        The record is durable once the background thread has committed it;
+        call wait to block until then.
+        
+        Args:
+            record: The record, which must be picklable
+        
+        Returns:
+            The sequence number of the record
+        """
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        frame = FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        
+        with self._condition:
+            if self._closed:
+                raise ValueError("The write-ahead log is closed")
+            
+            self._buffer.append(frame)
+            self._appended += 1
+            # The writer only sleeps while the buffer is empty
+            if len(self._buffer) == 1:
+                self._condition.notify_all()
+            return self._appended
+    
+    @property
+    def appended(self) -> int:
+        """
+        The sequence number of the last record appended.
+        """
+        return self._appended
+    
+    def wait(self, sequence: int) -> None:
+        """
+        Block until a record is committed to disk.
+        
+        Args:
+            sequence: The sequence number returned by append
+        """
+        with self._condition:
+            while self._committed < sequence and not self._closed:
+                self._condition.wait()
+    
+    def flush(self) -> None:
+        """
+        Block until every record appended so far is committed to disk.
+        """
+        with self._condition:
+            sequence = self._appended
+        self.wait(sequence)
+    
+    def truncate(self) -> None:
+        """
+        Commit pending records, then empty the log.
+        
+        Used once a snapshot holds the effects of every record in the log.
+        """
+        self.flush()
+        with self._file_lock:
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._fsync()
+    
+    def close(self) -> None:
+        """
+        Commit pending records and close the log.
+        """
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join()
+        self._file.close()
+    
+    def _commit_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+                if not self._buffer:
+                    return
+                
+                frames, self._buffer = self._buffer, []
+                sequence = self._appended
+            
+            # Appends are not blocked while the batch is written; they form the next batch
+            with self._file_lock:
+                self._file.write(b"".join(frames))
+                self._fsync()
+            
+            with self._condition:
+                self._committed = sequence
+                self._condition.notify_all()
+    
+    def _fsync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    @staticmethod
+    def read(path: str) -> Iterator[Any]:
+        """
+        Read the records of a log, oldest first.
+        
+        A torn or corrupt record ends the log; it and anything after it are
+        removed from the file, so that new records are appended after the
+        last valid one.
+        
+        Args:
+            path: The path of the log file
+        
+        Returns:
+            An iterator over the records
+        """
+        if not os.path.exists(path):
+            return
+        
+        with open(path, "rb") as file:
+            data = file.read()
+        
+        position = 0
+        while position + FRAME_HEADER.size <= len(data):
+            length, checksum = FRAME_HEADER.unpack_from(data, position)
+            start = position + FRAME_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            
+            yield pickle.loads(payload)
+            position = start + length
+        
+        if position < len(data):
+            with open(path, "r+b") as file:
+                file.truncate(position)
\ No newline at end of file
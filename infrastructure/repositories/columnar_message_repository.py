@@ -0,0 +1,266 @@
+from typing import Dict, List, Optional
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+import importlib.util
+import sys
+import threading
+from domain.repositories.abstract_repository import AbstractRepository
+from domain.entities.message import EPOCH, Message
+
+# Filters are vectorized with numpy when it is installed, and run in pure Python otherwise
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+if NUMPY_AVAILABLE:
+    import numpy
+
+# Rewrite the content buffer once replaced or deleted content takes more than this share of it
+COMPACTION_THRESHOLD = 0.5
+
+class ColumnarMessageRepository(AbstractRepository[Message]):
+    """
+    Message repository storing each message attribute in its own contiguous column.
+    
+    Timestamps are stored in a float array, senders, owners and
+    conversation IDs as integer codes into a table of distinct strings,
+    and contents back to back in a single UTF-8 buffer indexed by offset.
+    Scans by sender or time range therefore read a few arrays instead of
+    touching a Python object per message, and Message entities are only
+    built for the messages returned.
+    
+    Rows keep the order in which messages were first saved. Deleted rows
+    are marked and skipped. Messages are also indexed by conversation, the
+    most frequent query.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        # Seconds since EPOCH, as messages store their creation time
+        self._created_at = array("d")
+        self._senders = array("i")
+        self._conversations = array("i")
+        self._owners = array("i")
+        self._content = bytearray()
+        self._content_offsets = array("q")
+        self._content_lengths = array("q")
+        self._deleted = bytearray()
+        self._garbage = 0
+        # Table of the distinct coded strings; -1 codes None
+        self._codes: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self._conversation_rows: Dict[int, List[int]] = {}
+        # Order in which each row joined its conversation; the rows of a
+        # conversation are sorted by it, so they can be searched by bisection
+        self._joined = array("q")
+        self._joins = 0
+    
+    def save(self, message: Message) -> None:
+        content = message.content.encode()
+        conversation = self._encode(message.conversation_id)
+        
+        with self._lock:
+            row = self._rows.get(message.id)
+            if row is None:
+                row = self._rows[message.id] = len(self._ids)
+                self._ids.append(message.id)
+                self._created_at.append(0.0)
+                self._senders.append(0)
+                self._conversations.append(conversation)
+                self._owners.append(0)
+                self._content_offsets.append(0)
+                self._content_lengths.append(0)
+                self._deleted.append(0)
+                self._joined.append(0)
+                self._join_conversation(conversation, row)
+            else:
+                self._garbage += self._content_lengths[row]
+                if self._conversations[row] != conversation:
+                    self._leave_conversation(self._conversations[row], row)
+                    self._join_conversation(conversation, row)
+                    self._conversations[row] = conversation
+            
+            self._created_at[row] = message._created_at
+            self._senders[row] = self._encode(message.sender)
+            self._owners[row] = self._encode(message.owner_id)
+            self._content_offsets[row] = len(self._content)
+            self._content_lengths[row] = len(content)
+            self._content += content
+            
+            self._compact_content()
+    
+    def save_many(self, messages: List[Message]) -> None:
+        with self._lock:
+            for message in messages:
+                self.save(message)
+    
+    def find_by_id(self, id: str) -> Optional[Message]:
+        with self._lock:
+            row = self._rows.get(id)
+            return self._message(row) if row is not None else None
+    
+    def find_all(self) -> List[Message]:
+        with self._lock:
+            return [self._message(row) for row in self._rows.values()]
+    
+    def delete(self, id: str) -> None:
+        with self._lock:
+            row = self._rows.pop(id, None)
+            if row is None:
+                return
+            
+            self._deleted[row] = 1
+            self._leave_conversation(self._conversations[row], row)
+            self._garbage += self._content_lengths[row]
+            self._compact_content()
+    
+    def find_messages_by_conversation_id(self, conversation_id: str) -> List[Message]:
+        with self._lock:
+            rows = self._conversation_rows.get(self._codes.get(conversation_id), [])
+            return [self._message(row) for row in rows]
+    
+    def find_messages_page(
+        self,
+        conversation_id: str,
+        limit: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        newest_first: bool = False
+    ) -> List[Message]:
+        with self._lock:
+            code = self._codes.get(conversation_id)
+            rows = self._conversation_rows.get(code, [])
+            after_position = self._position(rows, after) if after is not None else -1
+            last = self._position(rows, before) if before is not None else len(rows)
+            if after_position is None or last is None:
+                # The cursor is not a message of the conversation
+                return []
+            first = after_position + 1
+            
+            if newest_first:
+                window = rows[max(first, last - limit):last][::-1]
+            else:
+                window = rows[first:min(last, first + limit)]
+            return [self._message(row) for row in window]
+    
+    def find_messages_by_sender(self, sender: str) -> List[Message]:
+        with self._lock:
+            code = self._codes.get(sender)
+            if code is None:
+                return []
+            
+            return [self._message(row) for row in self._filter(sender=code)]
+    
+    def find_messages_in_time_range(
+        self,
+        start: datetime,
+        end: datetime,
+        sender: Optional[str] = None
+    ) -> List[Message]:
+        with self._lock:
+            code = None
+            if sender is not None:
+                code = self._codes.get(sender)
+                if code is None:
+                    return []
+            
+            rows = self._filter(start=(start - EPOCH).total_seconds(), end=(end - EPOCH).total_seconds(), sender=code)
+            # Rows are in insertion order; results are in creation order
+            created_at = self._created_at
+            rows.sort(key=lambda row: created_at[row])
+            return [self._message(row) for row in rows]
+    
+    def count(self) -> int:
+        """
+        Count the stored messages.
+        
+        Returns:
+            The number of messages
+        """
+        return len(self._rows)
+    
+    def _filter(self, start: Optional[float] = None, end: Optional[float] = None, sender: Optional[int] = None) -> List[int]:
+        """
+        Find the rows of live messages created in [start, end) by a sender, in row order.
+        """
+        if NUMPY_AVAILABLE:
+            # Zero-copy views of the columns; they are released before the columns can grow again
+            mask = numpy.frombuffer(self._deleted, dtype=numpy.uint8) == 0
+            if sender is not None:
+                mask &= numpy.frombuffer(self._senders, dtype=numpy.int32) == sender
+            if start is not None:
+                created_at = numpy.frombuffer(self._created_at, dtype=numpy.float64)
+                mask &= (created_at >= start) & (created_at < end)
+            return numpy.flatnonzero(mask).tolist()
+        
+        rows = [row for row, deleted in enumerate(self._deleted) if not deleted]
+        if sender is not None:
+            senders = self._senders
+            rows = [row for row in rows if senders[row] == sender]
+        if start is not None:
+            created_at = self._created_at
+            rows = [row for row in rows if start <= created_at[row] < end]
+        return rows
+    
+    def _position(self, rows: List[int], id: str) -> Optional[int]:
+        """
+        Find the position of a message in the rows of a conversation.
+        """
+        row = self._rows.get(id)
+        if row is None:
+            return None
+        
+        position = bisect_left(rows, self._joined[row], key=self._joined.__getitem__)
+        return position if position < len(rows) and rows[position] == row else None
+    
+    def _join_conversation(self, conversation: int, row: int) -> None:
+        self._joined[row] = self._joins
+        self._joins += 1
+        self._conversation_rows.setdefault(conversation, []).append(row)
+    
+    def _leave_conversation(self, conversation: int, row: int) -> None:
+        rows = self._conversation_rows[conversation]
+        del rows[bisect_left(rows, self._joined[row], key=self._joined.__getitem__)]
+    
+    def _encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.setdefault(value, len(self._strings))
+                if code == len(self._strings):
+                    self._strings.append(sys.intern(value))
+        return code
+    
+    def _decode(self, code: int) -> Optional[str]:
+        return self._strings[code] if code >= 0 else None
+    
+    def _message(self, row: int) -> Message:
+        # Built from the columns directly: the constructor would intern the
+        # already shared strings and take the current time only to replace it
+        offset = self._content_offsets[row]
+        message = Message.__new__(Message)
+        message.id = self._ids[row]
+        message.content = self._content[offset:offset + self._content_lengths[row]].decode()
+        message.sender = self._strings[self._senders[row]]
+        message.conversation_id = self._strings[self._conversations[row]]
+        message.owner_id = self._decode(self._owners[row])
+        message._created_at = self._created_at[row]
+        return message
+    
+    def _compact_content(self) -> None:
+        """
+        Rewrite the content buffer without the contents of replaced and deleted messages once they dominate it.
+        """
+        if self._garbage <= len(self._content) * COMPACTION_THRESHOLD:
+            return
+        
+        content = bytearray()
+        for row in self._rows.values():
+            offset = self._content_offsets[row]
+            self._content_offsets[row] = len(content)
+            content += self._content[offset:offset + self._content_lengths[row]]
+        
+        self._content = content
+        self._garbage = 0
\ No newline at end of file
@@ -1,10 +1,11 @@
-from typing import List, Optional, TypeVar, cast
+from typing import List, Optional, Tuple, TypeVar, cast
+from datetime import datetime
 from domain.repositories.abstract_repository import AbstractRepository
 from domain.entities.entity import Entity
 from domain.entities.message import Message
 from domain.entities.conversation import Conversation
 from domain.entities.function import Function
-from infrastructure.database.in_memory_database import database
+from infrastructure.database.in_memory_database import database, indexes, get_lock, get_journal
 
 T = TypeVar('T', bound=Entity)
 
@@ -12,129 +13,241 @@ class InMemoryRepository(AbstractRepository[T]):
     """
     Implementation of the Repository interface using in-memory storage.
     Stores domain objects directly instead of converting to dictionaries.
+    
+    Secondary indexes of the collection are updated on every save and
+    delete, so attribute queries only touch the matching entities.
+    
+    Repositories are safe to share between threads: writes and index reads
+    hold the lock of the collection, so a collection and its indexes are
+    always seen in a consistent state.
     """
     def __init__(self, entity_type: str):
         self.entity_type = entity_type
+        self._lock = get_lock(entity_type)
     
     def save(self, entity: T) -> None:
-        if self.entity_type not in database:
-            database[self.entity_type] = []
-        
-        # Check if entity already exists
-        for i, item in enumerate(database[self.entity_type]):
-            if item.id == entity.id:
-                # Update existing entity
-                database[self.entity_type][i] = entity
-                return
-        
-        # Add new entity
-        database[self.entity_type].append(entity)
+        journal = get_journal()
+        
+        with self._lock:
+            if self.entity_type not in database:
+                database[self.entity_type] = {}
+            
+            # Updating an existing key keeps its original insertion position
+            database[self.entity_type][entity.id] = entity
+            
+            for index in indexes.get(self.entity_type, {}).values():
+                index.add(entity)
+            
+            # Recorded under the lock, so the journal has the same order as the collection
+            if journal is not None:
+                sequence = journal.record_save(self.entity_type, entity)
+        
+        if journal is not None:
+            journal.wait(sequence)
+    
+    def save_many(self, entities: List[T]) -> None:
+        journal = get_journal()
+        
+        with self._lock:
+            if self.entity_type not in database:
+                database[self.entity_type] = {}
+            
+            collection = database[self.entity_type]
+            for entity in entities:
+                collection[entity.id] = entity
+            
+            for index in indexes.get(self.entity_type, {}).values():
+                index.add_many(entities)
+            
+            if journal is not None:
+                sequence = journal.record_save_many(self.entity_type, entities)
+        
+        if journal is not None:
+            journal.wait(sequence)
     
     def find_by_id(self, id: str) -> Optional[T]:
-        if self.entity_type not in database:
+        # A single dictionary lookup is atomic, so it does not need the lock
+        collection = database.get(self.entity_type)
+        if collection is None:
             return None
         
-        for item in database[self.entity_type]:
-            if item.id == id:
-                return cast(T, item)
-        
-        return None
+        return cast(Optional[T], collection.get(id))
     
     def find_all(self) -> List[T]:
-        if self.entity_type not in database:
-            return []
-        
-        return cast(List[T], database[self.entity_type])
+        with self._lock:
+            if self.entity_type not in database:
+                return []
+            
+            return cast(List[T], list(database[self.entity_type].values()))
     
     def delete(self, id: str) -> None:
-        if self.entity_type not in database:
-            return
+        journal = get_journal()
         
-        database[self.entity_type] = [item for item in database[self.entity_type] if item.id != id]
+        with self._lock:
+            if self.entity_type not in database:
+                return
+            
+            database[self.entity_type].pop(id, None)
+            
+            for index in indexes.get(self.entity_type, {}).values():
+                index.remove(id)
+            
+            if journal is not None:
+                sequence = journal.record_delete(self.entity_type, id)
+        
+        if journal is not None:
+            journal.wait(sequence)
+    
+    def record_messages(self, conversation_id: str, count: int, last_activity: datetime) -> Optional[Conversation]:
+        journal = get_journal()
+        
+        with self._lock:
+            conversation = database.get(self.entity_type, {}).get(conversation_id)
+            if not isinstance(conversation, Conversation):
+                return None
+            
+            # Updated in place under the lock, so concurrent updates are not lost
+            conversation.count_messages(count, last_activity)
+            
+            for index in indexes.get(self.entity_type, {}).values():
+                index.add(conversation)
+            
+            if journal is not None:
+                sequence = journal.record_save(self.entity_type, conversation)
+        
+        if journal is not None:
+            journal.wait(sequence)
+        
+        return conversation
     
     def find_messages_by_conversation_id(self, conversation_id: str) -> List[Message]:
         if self.entity_type != "messages":
             return []
         
-        if "messages" not in database:
+        return self._find_by_index("conversation_id", conversation_id)
+    
+    def find_messages_page(
+        self,
+        conversation_id: str,
+        limit: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        newest_first: bool = False
+    ) -> List[Message]:
+        if self.entity_type != "messages":
             return []
         
-        messages = []
-        for message in database["messages"]:
-            if isinstance(message, Message) and message.conversation_id == conversation_id:
-                messages.append(message)
-        
-        return messages
+        with self._lock:
+            collection = database[self.entity_type]
+            index = indexes[self.entity_type]["conversation_id"]
+            if newest_first:
+                ids = index.window(conversation_id, limit, start=before, stop=after, reverse=True)
+            else:
+                ids = index.window(conversation_id, limit, start=after, stop=before)
+            
+            return [collection[id] for id in ids]
     
     def find_messages_by_sender(self, sender: str) -> List[Message]:
         if self.entity_type != "messages":
             return []
         
-        if "messages" not in database:
+        return self._find_by_index("sender", sender)
+    
+    def find_messages_in_time_range(
+        self,
+        start: datetime,
+        end: datetime,
+        sender: Optional[str] = None
+    ) -> List[Message]:
+        if self.entity_type != "messages":
             return []
         
-        messages = []
-        for message in database["messages"]:
-            if isinstance(message, Message) and message.sender == sender:
-                messages.append(message)
-        
+        messages = self._find_by_index("sender", sender) if sender is not None else self.find_all()
+        messages = [message for message in messages if start <= message.created_at < end]
+        messages.sort(key=lambda message: message.created_at)
         return messages
     
-    def find_conversations_by_title(self, title: str) -> List[Conversation]:
+    def find_conversations_by_owner_id(self, owner_id: str) -> List[Conversation]:
         if self.entity_type != "conversations":
             return []
         
-        if "conversations" not in database:
+        return self._find_by_index("owner_id", owner_id)
+    
+    def find_conversations_by_title(self, title: str) -> List[Conversation]:
+        if self.entity_type != "conversations":
             return []
         
-        conversations = []
-        for conversation in database["conversations"]:
-            if isinstance(conversation, Conversation) and title.lower() in conversation.title.lower():
-                conversations.append(conversation)
-        
-        return conversations
+        return self._search_index("title", title)
     
-    def find_recent_conversations(self, limit: int = 10) -> List[Conversation]:
+    def search_conversations(self, query: str, limit: int = 10, offset: int = 0) -> List[Conversation]:
         if self.entity_type != "conversations":
             return []
         
-        if "conversations" not in database:
+        return self._search_index("title", query, limit, offset)
+    
+    def find_recent_conversations(
+        self,
+        limit: int = 10,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Conversation]:
+        if self.entity_type != "conversations":
             return []
         
-        # Sort by created_at (descending) and take the first 'limit' items
-        # We assume all conversations have a created_at attribute
-        sorted_conversations = sorted(
-            database["conversations"],
-            key=lambda x: getattr(x, "created_at", None),
-            reverse=True
-        )[:limit]
-        
-        return sorted_conversations
+        with self._lock:
+            if "conversations" not in database:
+                return []
+            
+            # The recency index is kept sorted by last activity, so only 'limit' entries are read
+            collection = database["conversations"]
+            ids = indexes["conversations"]["updated_at"].newest(limit, before)
+            
+            return [collection[id] for id in ids]
     
     def find_functions_by_name(self, name: str) -> List[Function]:
         if self.entity_type != "functions":
             return []
         
-        if "functions" not in database:
-            return []
-        
-        functions = []
-        for function in database["functions"]:
-            if isinstance(function, Function) and name.lower() in function.name.lower():
-                functions.append(function)
-        
-        return functions
+        return self._search_index("name", name)
     
     def find_functions_by_category(self, category: str) -> List[Function]:
         if self.entity_type != "functions":
             return []
         
-        if "functions" not in database:
-            return []
-        
         functions = []
-        for function in database["functions"]:
+        for function in self.find_all():
             if isinstance(function, Function) and hasattr(function, "category") and function.category == category:
                 functions.append(function)
         
-        return functions
\ No newline at end of file
+        return functions
+    
+    def _find_by_index(self, attribute: str, value: str) -> List[T]:
+        """
+        Resolve the entities indexed under a value of one of the collection's indexes.
+        """
+        with self._lock:
+            if self.entity_type not in database:
+                return []
+            
+            collection = database[self.entity_type]
+            index = indexes[self.entity_type][attribute]
+            
+            return [cast(T, collection[id]) for id in index.get(value)]
+    
+    def _search_index(
+        self,
+        attribute: str,
+        query: str,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[T]:
+        """
+        Resolve the entities matching a query against one of the collection's full-text indexes.
+        """
+        with self._lock:
+            if self.entity_type not in database:
+                return []
+            
+            collection = database[self.entity_type]
+            index = indexes[self.entity_type][attribute]
+            
+            return [cast(T, collection[id]) for id in index.search(query, limit, offset)]
\ No newline at end of file
@@ -0,0 +1,316 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, cast
+from datetime import datetime
+import json
+from domain.repositories.abstract_repository import AbstractRepository
+from domain.entities.entity import Entity
+from domain.entities.message import Message
+from domain.entities.conversation import Conversation, PublicConversation
+from domain.entities.function import Function
+from domain.entities.function_call import FunctionCall
+from domain.value_objects.function_parameter import FunctionParameter
+from infrastructure.database.indexes import tokenize
+from infrastructure.database.sqlite_database import SqliteDatabase
+
+T = TypeVar('T', bound=Entity)
+
+Row = Tuple[Any, ...]
+
+def format_timestamp(timestamp: datetime) -> str:
+    # A fixed width keeps the text order identical to the chronological order
+    return timestamp.isoformat(timespec="microseconds")
+
+def conversation_to_row(conversation: Conversation) -> Row:
+    return (
+        conversation.id,
+        conversation.title,
+        conversation.owner_id,
+        isinstance(conversation, PublicConversation),
+        conversation.message_count,
+        format_timestamp(conversation.created_at),
+        format_timestamp(conversation.updated_at)
+    )
+
+def conversation_from_row(row: Row) -> Conversation:
+    id, title, owner_id, is_public, message_count, created_at, updated_at = row
+    conversation_type = PublicConversation if is_public else Conversation
+    conversation = conversation_type(id=id, title=title, owner_id=owner_id)
+    conversation.message_count = message_count
+    conversation.created_at = datetime.fromisoformat(created_at)
+    conversation.updated_at = datetime.fromisoformat(updated_at)
+    return conversation
+
+def message_to_row(message: Message) -> Row:
+    return (
+        message.id,
+        message.content,
+        message.sender,
+        message.conversation_id,
+        message.owner_id,
+        format_timestamp(message.created_at)
+    )
+
+def message_from_row(row: Row) -> Message:
+    id, content, sender, conversation_id, owner_id, created_at = row
+    message = Message(id=id, content=content, sender=sender, conversation_id=conversation_id, owner_id=owner_id)
+    message.created_at = datetime.fromisoformat(created_at)
+    return message
+
+def function_to_row(function: Function) -> Row:
+    parameters = [
+        {"name": p.name, "type": p.type, "description": p.description, "required": p.required}
+        for p in function.parameters
+    ]
+    return function.id, function.name, function.description, json.dumps(parameters)
+
+def function_from_row(row: Row) -> Function:
+    id, name, description, parameters = row
+    return Function(
+        id=id,
+        name=name,
+        description=description,
+        parameters=[FunctionParameter(**parameter) for parameter in json.loads(parameters)]
+    )
+
+def function_call_to_row(function_call: FunctionCall) -> Row:
+    result = json.dumps(function_call.result) if function_call.result is not None else None
+    return function_call.id, function_call.function_id, json.dumps(function_call.parameters), result, function_call.status
+
+def function_call_from_row(row: Row) -> FunctionCall:
+    id, function_id, parameters, result, status = row
+    return FunctionCall(
+        id=id,
+        function_id=function_id,
+        parameters=json.loads(parameters),
+        result=json.loads(result) if result is not None else None,
+        status=status
+    )
+
+# Columns of each table, in the order of the rows built by the mapping functions
+TABLES: Dict[str, Tuple[List[str], Callable[[Any], Row], Callable[[Row], Any]]] = {
+    "conversations": (
+        ["id", "title", "owner_id", "is_public", "message_count", "created_at", "updated_at"],
+        conversation_to_row,
+        conversation_from_row
+    ),
+    "messages": (
+        ["id", "content", "sender", "conversation_id", "owner_id", "created_at"],
+        message_to_row,
+        message_from_row
+    ),
+    "functions": (
+        ["id", "name", "description", "parameters"],
+        function_to_row,
+        function_from_row
+    ),
+    "function_calls": (
+        ["id", "function_id", "parameters", "result", "status"],
+        function_call_to_row,
+        function_call_from_row
+    )
+}
+
+def full_text_query(query: str) -> Optional[str]:
+    """
+    Build a full-text query matching every word of a search, exactly or as a prefix.
+    
+    Exact matches satisfy both alternatives of a word, so they rank above
+    prefix matches, as in the in-memory inverted index.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    
+    # Tokens only contain letters and digits, so they can be quoted as is
+    return " AND ".join(f'("{token}" OR "{token}"*)' for token in tokens)
+
+class SqliteRepository(AbstractRepository[T]):
+    """
+    Implementation of the Repository interface using a SQLite database.
+    
+    Entities are stored as rows of the table named after the entity type
+    and rebuilt on every read, so unlike the in-memory repository, changes
+    to a loaded entity are only stored when it is saved again. Messages are
+    stored in their own table; conversations only store their message count.
+    
+    Writes are committed one by one. Wrap many writes in a
+    database.transaction() block to commit them together.
+    """
+    def __init__(self, entity_type: str, database: SqliteDatabase):
+        """
+        Initialize the repository.
+        
+        Args:
+            entity_type: The collection of the entities, which names their table
+            database: The database storing the table
+        """
+        if entity_type not in TABLES:
+            raise ValueError(f"Unknown entity type: {entity_type}")
+        
+        self.entity_type = entity_type
+        self.database = database
+        
+        columns, self._to_row, self._from_row = TABLES[entity_type]
+        column_list = ", ".join(columns)
+        qualified_columns = ", ".join(f"t.{column}" for column in columns)
+        
+        # Statements are built once; SQLite prepares each distinct statement text once
+        self._select = f"SELECT {column_list} FROM {entity_type}"
+        self._select_qualified = f"SELECT {qualified_columns} FROM {entity_type} t"
+        self._upsert = (
+            f"INSERT INTO {entity_type} ({column_list}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columns[1:])}"
+        )
+    
+    def save(self, entity: T) -> None:
+        self.database.execute(self._upsert, self._to_row(entity))
+    
+    def save_many(self, entities: List[T]) -> None:
+        self.database.execute_many(self._upsert, [self._to_row(entity) for entity in entities])
+    
+    def find_by_id(self, id: str) -> Optional[T]:
+        row = self.database.query_one(f"{self._select} WHERE id = ?", (id,))
+        return cast(Optional[T], self._from_row(row)) if row is not None else None
+    
+    def find_all(self) -> List[T]:
+        return self._find(f"{self._select} ORDER BY seq")
+    
+    def delete(self, id: str) -> None:
+        self.database.execute(f"DELETE FROM {self.entity_type} WHERE id = ?", (id,))
+    
+    def record_messages(self, conversation_id: str, count: int, last_activity: datetime) -> Optional[Conversation]:
+        if self.entity_type != "conversations":
+            return None
+        
+        # Timestamps have a fixed width, so the larger text is the later time
+        with self.database.transaction():
+            self.database.execute(
+                "UPDATE conversations SET message_count = message_count + ?, updated_at = max(updated_at, ?) WHERE id = ?",
+                (count, format_timestamp(last_activity), conversation_id)
+            )
+            return cast(Optional[Conversation], self.find_by_id(conversation_id))
+    
+    def find_messages_by_conversation_id(self, conversation_id: str) -> List[Message]:
+        if self.entity_type != "messages":
+            return []
+        
+        return self._find(f"{self._select} WHERE conversation_id = ? ORDER BY seq", (conversation_id,))
+    
+    def find_messages_page(
+        self,
+        conversation_id: str,
+        limit: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        newest_first: bool = False
+    ) -> List[Message]:
+        if self.entity_type != "messages":
+            return []
+        
+        # An unknown cursor makes its bound NULL, which matches no message
+        conditions = ["conversation_id = ?"]
+        parameters: List[Any] = [conversation_id]
+        for cursor, operator in [(before, "<"), (after, ">")]:
+            if cursor is not None:
+                conditions.append(f"seq {operator} (SELECT seq FROM messages WHERE id = ? AND conversation_id = ?)")
+                parameters.extend([cursor, conversation_id])
+        order = "DESC" if newest_first else "ASC"
+        
+        return self._find(
+            f"{self._select} WHERE {' AND '.join(conditions)} ORDER BY seq {order} LIMIT ?",
+            (*parameters, limit)
+        )
+    
+    def find_messages_by_sender(self, sender: str) -> List[Message]:
+        if self.entity_type != "messages":
+            return []
+        
+        return self._find(f"{self._select} WHERE sender = ? ORDER BY seq", (sender,))
+    
+    def find_messages_in_time_range(
+        self,
+        start: datetime,
+        end: datetime,
+        sender: Optional[str] = None
+    ) -> List[Message]:
+        if self.entity_type != "messages":
+            return []
+        
+        if sender is None:
+            return self._find(
+                f"{self._select} WHERE created_at >= ? AND created_at < ? ORDER BY created_at, seq",
+                (format_timestamp(start), format_timestamp(end))
+            )
+        return self._find(
+            f"{self._select} WHERE sender = ? AND created_at >= ? AND created_at < ? ORDER BY created_at, seq",
+            (sender, format_timestamp(start), format_timestamp(end))
+        )
+    
+    def find_conversations_by_owner_id(self, owner_id: str) -> List[Conversation]:
+        if self.entity_type != "conversations":
+            return []
+        
+        return self._find(f"{self._select} WHERE owner_id = ? ORDER BY seq", (owner_id,))
+    
+    def find_conversations_by_title(self, title: str) -> List[Conversation]:
+        if self.entity_type != "conversations":
+            return []
+        
+        return self._search("title", title)
+    
+    def search_conversations(self, query: str, limit: int = 10, offset: int = 0) -> List[Conversation]:
+        if self.entity_type != "conversations":
+            return []
+        
+        return self._search("title", query, limit, offset)
+    
+    def find_recent_conversations(
+        self,
+        limit: int = 10,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Conversation]:
+        if self.entity_type != "conversations":
+            return []
+        
+        # The (updated_at, id) index is walked backwards, so only 'limit' rows are read
+        if before is None:
+            return self._find(f"{self._select} ORDER BY updated_at DESC, id DESC LIMIT ?", (limit,))
+        
+        return self._find(
+            f"{self._select} WHERE (updated_at, id) < (?, ?) ORDER BY updated_at DESC, id DESC LIMIT ?",
+            (format_timestamp(before[0]), before[1], limit)
+        )
+    
+    def find_functions_by_name(self, name: str) -> List[Function]:
+        if self.entity_type != "functions":
+            return []
+        
+        return self._search("name", name)
+    
+    def find_functions_by_category(self, category: str) -> List[Function]:
+        if self.entity_type != "functions":
+            return []
+        
+        # Functions have no stored category
+        return [function for function in self.find_all() if getattr(function, "category", None) == category]
+    
+    def _find(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[T]:
+        from_row = self._from_row
+        return [cast(T, from_row(row)) for row in self.database.query(sql, parameters)]
+    
+    def _search(self, column: str, query: str, limit: Optional[int] = None, offset: int = 0) -> List[T]:
+        """
+        Find the entities matching a query against the full-text index of a column, best match first.
+        """
+        match = full_text_query(query)
+        if match is None:
+            return []
+        
+        index = f"{self.entity_type}_{column}"
+        # Ties go to the most recently active conversation, or the most recently added entity
+        tie_breaker = "t.updated_at DESC" if self.entity_type == "conversations" else "t.seq DESC"
+        
+        return self._find(
+            f"{self._select_qualified} JOIN {index} ON t.seq = {index}.rowid "
+            f"WHERE {index} MATCH ? ORDER BY bm25({index}), {tie_breaker} LIMIT ? OFFSET ?",
+            (match, limit if limit is not None else -1, offset)
+        )
\ No newline at end of file
@@ -0,0 +1,124 @@
+from typing import Any, Dict
+from datetime import datetime
+import operator
+import re
+from domain.value_objects.function_parameter import FunctionParameter
+from infrastructure.services.function_registry import FunctionRegistry
+
+"""
+Built-in functions available to the AI assistant.
+
+Each function is registered with its implementation, so adding a function
+only requires adding a decorated handler here.
+"""
+
+CALCULATE_OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv
+}
+
+# An arithmetic operator between two numbers; on their own, symbols such as
+# "/" and "-" also appear in time zones, place names and dates
+ARITHMETIC_EXPRESSION_PATTERN = re.compile(r"(\d+)\s*([-+*/])\s*(\d+)")
+
+@FunctionRegistry.function(
+    name="get_weather",
+    description="Get the weather for a location",
+    parameters=[
+        FunctionParameter(
+            name="location",
+            type="string",
+            description="The location to get weather for",
+            required=False
+        )
+    ],
+    timeout=5.0,
+    # Weather changes slowly, so a recent result is as good as a new one
+    cacheable=True,
+    cache_ttl=60.0,
+    triggers=[
+        "weather", "temperature", "forecast", "rain", "sunny", "cloudy",
+        "humidity", "precipitation", "climate", "meteorological"
+    ]
+)
+def get_weather(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    # Mock implementation
+    return {
+        "temperature": 72,
+        "condition": "sunny",
+        "location": parameters.get("location", "Unknown")
+    }
+
+@FunctionRegistry.function(
+    name="get_time",
+    description="Get the current time",
+    parameters=[
+        FunctionParameter(
+            name="timezone",
+            type="string",
+            description="The timezone to get time for",
+            required=False
+        )
+    ],
+    timeout=1.0,
+    triggers=[
+        "time", "clock", "hour", "minute", "current time", "what time",
+        "timezone", "local time", "utc", "gmt"
+    ]
+)
+def get_time(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "time": datetime.now().isoformat(),
+        "timezone": parameters.get("timezone", "UTC")
+    }
+
+@FunctionRegistry.function(
+    name="calculate",
+    description="Perform a calculation",
+    parameters=[
+        FunctionParameter(
+            name="operation",
+            type="string",
+            description="The operation to perform (add, subtract, multiply, divide)",
+            required=False
+        ),
+        FunctionParameter(
+            name="a",
+            type="number",
+            description="The first number",
+            required=False
+        ),
+        FunctionParameter(
+            name="b",
+            type="number",
+            description="The second number",
+            required=False
+        )
+    ],
+    timeout=1.0,
+    cacheable=True,
+    pure=True,
+    triggers=[
+        "calculate", "compute", "add", "subtract", "multiply", "divide",
+        "sum", "difference", "product", "quotient", "math", "calculation",
+        "plus", "minus", "times", "divided by"
+    ],
+    patterns=[ARITHMETIC_EXPRESSION_PATTERN]
+)
+def calculate(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    operation = parameters.get("operation", "add")
+    a = parameters.get("a")
+    b = parameters.get("b")
+    
+    if operation not in CALCULATE_OPERATIONS:
+        return {"error": f"Unknown operation: {operation}"}
+    
+    if a is None or b is None:
+        return {"error": "Two numbers are required"}
+    
+    if operation == "divide" and b == 0:
+        return {"error": "Division by zero"}
+    
+    return {"result": CALCULATE_OPERATIONS[operation](a, b)}
\ No newline at end of file
@@ -0,0 +1,210 @@
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional, Tuple
+import hashlib
+import json
+import sys
+import threading
+import time
+from domain.entities.function import Function
+from domain.services.abstract_ai_service import AbstractAIService
+
+"""
+Response cache in front of an AI service.
+
+Repeated messages, such as greetings or "what time is it?", are answered
+from the cache instead of calling the model again. Messages are compared
+after normalization, so case, spacing and trailing punctuation do not
+matter.
+"""
+
+def normalize_message(message_content: str) -> str:
+    """
+    Normalize a message so that trivially different repeats share a cache key.
+    
+    Args:
+        message_content: The content of the message
+    
+    Returns:
+        The casefolded content with collapsed whitespace and no trailing punctuation
+    """
+    return " ".join(message_content.casefold().split()).rstrip(".!? ")
+
+
+class CachingAIService(AbstractAIService):
+    """
+    AI service caching the responses and function calls of another service.
+    
+    Responses expire after a time to live, and the least recently used
+    entries are evicted once the cache exceeds its memory bound. Responses
+    to messages rejected by the should_cache predicate, for example messages
+    expecting a fresh or random answer, always go to the wrapped service.
+    
+    Extracted function calls only depend on the message and the available
+    functions, so they are cached until the list of functions changes.
+    
+    Attributes:
+        hits: The number of responses and function calls served from the cache
+        misses: The number of lookups that had to call the wrapped service
+    """
+    def __init__(
+        self,
+        service: AbstractAIService,
+        ttl: Optional[float] = 300.0,
+        max_bytes: int = 16 * 1024 * 1024,
+        should_cache: Optional[Callable[[str], bool]] = None
+    ):
+        """
+        Wrap an AI service.
+        
+        Args:
+            service: The service generating responses on cache misses
+            ttl: The number of seconds a response stays fresh; it never expires when None
+            max_bytes: The approximate maximum memory used by cached entries
+            should_cache: Whether the response to a message may be cached;
+                all responses are cached when None
+        """
+        self.service = service
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.should_cache = should_cache
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Tuple[Optional[float], Any, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Keys of function calls include a generation that changes with the list of functions
+        self._functions: Optional[List[Function]] = None
+        self._functions_generation = 0
+    
+    def generate_response(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> str:
+        if not self._is_cacheable(message_content):
+            return self.service.generate_response(message_content, context)
+        
+        key = self._response_key(message_content, context)
+        response = self._get(key)
+        if response is None:
+            response = self.service.generate_response(message_content, context)
+            self._set(key, response, self.ttl)
+        
+        return response
+    
+    async def generate_response_async(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> str:
+        if not self._is_cacheable(message_content):
+            return await self.service.generate_response_async(message_content, context)
+        
+        key = self._response_key(message_content, context)
+        response = self._get(key)
+        if response is None:
+            response = await self.service.generate_response_async(message_content, context)
+            self._set(key, response, self.ttl)
+        
+        return response
+    
+    async def stream_response(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> AsyncIterator[str]:
+        if not self._is_cacheable(message_content):
+            async for chunk in self.service.stream_response(message_content, context):
+                yield chunk
+            return
+        
+        key = self._response_key(message_content, context)
+        response = self._get(key)
+        if response is not None:
+            yield response
+            return
+        
+        # Only a response streamed to the end is complete enough to be cached
+        chunks = []
+        async for chunk in self.service.stream_response(message_content, context):
+            chunks.append(chunk)
+            yield chunk
+        self._set(key, "".join(chunks), self.ttl)
+    
+    def extract_function_calls(self, message_content: str, available_functions: List[Function]) -> List[Dict[str, Any]]:
+        key = self._function_calls_key(message_content, available_functions)
+        function_calls = self._get(key)
+        if function_calls is None:
+            function_calls = self.service.extract_function_calls(message_content, available_functions)
+            self._set(key, function_calls, None)
+        
+        return function_calls
+    
+    async def extract_function_calls_async(self, message_content: str, available_functions: List[Function]) -> List[Dict[str, Any]]:
+        key = self._function_calls_key(message_content, available_functions)
+        function_calls = self._get(key)
+        if function_calls is None:
+            function_calls = await self.service.extract_function_calls_async(message_content, available_functions)
+            self._set(key, function_calls, None)
+        
+        return function_calls
+    
+    def clear(self) -> None:
+        """
+        Remove all cached entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+        
+        Returns:
+            The number of hits, misses, cached entries and their approximate size in bytes
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "bytes": self._size}
+    
+    def _is_cacheable(self, message_content: str) -> bool:
+        return self.should_cache is None or self.should_cache(message_content)
+    
+    def _response_key(self, message_content: str, context: Optional[List[Dict[str, str]]]) -> Hashable:
+        # Responses also depend on the previous turns, which are keyed by a digest to keep keys small
+        context_digest = None
+        if context:
+            context_digest = hashlib.blake2b(json.dumps(context).encode(), digest_size=16).digest()
+        
+        return "response", context_digest, normalize_message(message_content)
+    
+    def _function_calls_key(self, message_content: str, available_functions: List[Function]) -> Hashable:
+        with self._lock:
+            if available_functions is not self._functions:
+                self._functions = available_functions
+                self._functions_generation += 1
+            generation = self._functions_generation
+        
+        return "function_calls", generation, normalize_message(message_content)
+    
+    def _get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, size = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                
+                del self._entries[key]
+                self._size -= size
+            
+            self.misses += 1
+            return None
+    
+    def _set(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = sys.getsizeof(key[-1]) + (sys.getsizeof(value) if isinstance(value, str) else sys.getsizeof(repr(value)))
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[2]
+            
+            self._entries[key] = (expires_at, value, size)
+            self._size += size
+            
+            while self._size > self.max_bytes and self._entries:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
\ No newline at end of file
@@ -0,0 +1,291 @@
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+import re
+import threading
+from domain.entities.message import Message
+from domain.repositories.abstract_repository import AbstractRepository
+
+"""
+Context windows for AI responses.
+
+A model answering a message needs the previous turns of the conversation,
+but sending a long conversation in full is slow and eventually exceeds the
+model's context length. Each conversation therefore keeps a window of its
+latest turns within a token budget, and turns leaving the window are
+folded into a rolling summary of the older history.
+
+Token counts are computed once, when a turn enters the window, and the
+window is updated incrementally as messages are added, so building the
+context of a new message only copies the window. A conversation that is
+not in memory is read backwards from its latest message, only as far as
+its window and summary reach, so loading it does not depend on the length
+of its history.
+"""
+
+# Word pieces of up to four characters and single punctuation marks,
+# which approximates the tokens of common tokenizers for English text
+TOKEN_PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+
+# Characters of a turn kept in the rolling summary
+SUMMARY_LINE_LENGTH = 120
+
+# Number of locks conversations are spread over; contexts of conversations
+# sharing a lock are not built at the same time
+CONVERSATION_LOCKS = 64
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+    
+    Args:
+        text: The text to measure
+    
+    Returns:
+        The approximate number of tokens
+    """
+    return len(TOKEN_PATTERN.findall(text))
+
+def summarize_turns(summary: str, turns: List[Tuple[str, str]]) -> str:
+    """
+    Extend a rolling summary with turns leaving the context window.
+    
+    Each turn is summarized by its first line, shortened to a fixed length.
+    
+    Args:
+        summary: The summary of the turns that left the window before
+        turns: The (role, content) pairs leaving the window, oldest first
+    
+    Returns:
+        The extended summary
+    """
+    lines = [summary] if summary else []
+    for role, content in turns:
+        line = content.strip().split("\n", 1)[0]
+        if len(line) > SUMMARY_LINE_LENGTH:
+            line = line[:SUMMARY_LINE_LENGTH - 3] + "..."
+        lines.append(f"{role}: {line}")
+    return "\n".join(lines)
+
+Summarizer = Callable[[str, List[Tuple[str, str]]], str]
+
+
+class ConversationContext:
+    """
+    Window of the latest turns of a conversation and summary of the turns before it.
+    
+    Attributes:
+        turns: The (message ID, role, content, token count) of each turn in the window, oldest first
+        tokens: The total token count of the turns in the window
+        summary: The rolling summary of the turns that left the window
+        summary_tokens: The token count of the summary
+    """
+    __slots__ = ("turns", "tokens", "summary", "summary_tokens")
+    
+    def __init__(self):
+        self.turns: Deque[Tuple[str, str, str, int]] = deque()
+        self.tokens = 0
+        self.summary = ""
+        self.summary_tokens = 0
+
+
+class ContextBuilder:
+    """
+    Builds the context sent to the AI service along with a new message.
+    
+    The context is a list of chat messages: a system message with the
+    summary of the older history, if any, followed by the latest turns.
+    The turns and the summary together stay within max_tokens, and the
+    summary within summary_tokens.
+    
+    Contexts of the most recently active conversations are kept in memory.
+    Other conversations are loaded from the message repository once, when
+    they become active again, and so are conversations whose messages were
+    stored without going through the builder.
+    
+    The repository is read while holding a lock of the conversation only,
+    so loading a long conversation does not hold up the others. Reading the
+    repository may block; async callers should build contexts in a worker
+    thread.
+    """
+    def __init__(
+        self,
+        message_repository: AbstractRepository[Message],
+        max_tokens: int = 3000,
+        max_turns: int = 50,
+        summary_tokens: int = 500,
+        max_conversations: int = 1024,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+        summarize: Summarizer = summarize_turns
+    ):
+        """
+        Initialize the builder.
+        
+        Args:
+            message_repository: The repository conversations are loaded from
+            max_tokens: The maximum number of tokens in a context
+            max_turns: The maximum number of turns in a context
+            summary_tokens: The maximum number of tokens in the summary of older turns
+            max_conversations: The maximum number of conversations kept in memory
+            count_tokens: Counts the tokens of a text, for the tokenizer of the model
+            summarize: Extends a summary with the (role, content) pairs leaving the window
+        """
+        self.message_repository = message_repository
+        self.max_tokens = max_tokens
+        self.max_turns = max_turns
+        self.summary_tokens = summary_tokens
+        self.max_conversations = max_conversations
+        self.count_tokens = count_tokens
+        self.summarize = summarize
+        self._contexts: OrderedDict[str, ConversationContext] = OrderedDict()
+        # Guards the contexts dictionary only; contexts are guarded by their conversation lock
+        self._lock = threading.Lock()
+        self._conversation_locks = [threading.Lock() for _ in range(CONVERSATION_LOCKS)]
+    
+    def build(self, message: Message) -> List[Dict[str, str]]:
+        """
+        Build the context of a message, recording the message as the latest turn.
+        
+        Args:
+            message: The message to respond to
+        
+        Returns:
+            The chat messages preceding the message, oldest first
+        """
+        with self._conversation_lock(message.conversation_id):
+            context = self._get(message.conversation_id, message)
+            self._append(context, message)
+            
+            chat_messages = []
+            if context.summary:
+                chat_messages.append({
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation:\n{context.summary}"
+                })
+            # The last turn is the message itself
+            for _, role, content, _ in list(context.turns)[:-1]:
+                chat_messages.append({"role": role, "content": content})
+            return chat_messages
+    
+    def add(self, message: Message) -> None:
+        """
+        Record a message as the latest turn of its conversation.
+        
+        Args:
+            message: The message added to the conversation
+        """
+        with self._conversation_lock(message.conversation_id):
+            self._append(self._get(message.conversation_id), message)
+    
+    def forget(self, conversation_id: str) -> None:
+        """
+        Drop the context of a conversation, so it is loaded again when next needed.
+        
+        Args:
+            conversation_id: The ID of the conversation
+        """
+        with self._conversation_lock(conversation_id), self._lock:
+            self._contexts.pop(conversation_id, None)
+    
+    def _conversation_lock(self, conversation_id: str) -> threading.Lock:
+        return self._conversation_locks[hash(conversation_id) % CONVERSATION_LOCKS]
+    
+    def _get(self, conversation_id: str, message: Optional[Message] = None) -> ConversationContext:
+        with self._lock:
+            context = self._contexts.get(conversation_id)
+            if context is not None:
+                self._contexts.move_to_end(conversation_id)
+        
+        if context is not None and (message is None or not self._is_stale(context, message)):
+            return context
+        
+        context = self._load(conversation_id)
+        with self._lock:
+            self._contexts[conversation_id] = context
+            self._contexts.move_to_end(conversation_id)
+            while len(self._contexts) > self.max_conversations:
+                self._contexts.popitem(last=False)
+        return context
+    
+    def _load(self, conversation_id: str) -> ConversationContext:
+        # Read the conversation backwards, only as far as the window and the
+        # summary reach: each summarized turn takes at least one token of the
+        # summary, so the turns before the newest summary_tokens of them
+        # would be dropped from it anyway
+        summarized_turns = max(self.summary_tokens, 1)
+        window: List[Tuple[str, str, str, int]] = []
+        tokens = 0
+        older: List[Tuple[str, str]] = []
+        before = None
+        while True:
+            page = self.message_repository.find_messages_page(conversation_id, self.max_turns, before=before, newest_first=True)
+            for message in page:
+                if not older:
+                    count = self.count_tokens(message.content)
+                    if not window or (len(window) < self.max_turns and tokens + count <= self.max_tokens):
+                        window.append((message.id, self._role(message), message.content, count))
+                        tokens += count
+                        continue
+                older.append((self._role(message), message.content))
+            if len(page) < self.max_turns or len(older) >= summarized_turns:
+                break
+            before = page[-1].id
+        
+        # Once there is a summary, its whole budget is reserved
+        if older:
+            while len(window) > 1 and tokens + self.summary_tokens > self.max_tokens:
+                _, role, content, count = window.pop()
+                tokens -= count
+                older.insert(0, (role, content))
+        
+        context = ConversationContext()
+        context.turns.extend(reversed(window))
+        context.tokens = tokens
+        if older:
+            self._fold(context, older[summarized_turns - 1::-1])
+        return context
+    
+    def _is_stale(self, context: ConversationContext, message: Message) -> bool:
+        # Messages may be stored without going through the builder, for example by batch imports
+        last_id = context.turns[-1][0] if context.turns else None
+        if last_id == message.id:
+            return False
+        
+        previous = self.message_repository.find_messages_page(message.conversation_id, 1, before=message.id, newest_first=True)
+        return bool(previous) and previous[0].id != last_id
+    
+    def _append(self, context: ConversationContext, message: Message) -> None:
+        if context.turns and context.turns[-1][0] == message.id:
+            return
+        
+        tokens = self.count_tokens(message.content)
+        context.turns.append((message.id, self._role(message), message.content, tokens))
+        context.tokens += tokens
+        
+        # Fold the oldest turns into the summary, always keeping the latest one;
+        # once there is a summary, its whole budget is reserved
+        folded = []
+        while len(context.turns) > 1 and (
+            len(context.turns) > self.max_turns
+            or context.tokens + (self.summary_tokens if context.summary or folded else 0) > self.max_tokens
+        ):
+            _, role, content, tokens = context.turns.popleft()
+            context.tokens -= tokens
+            folded.append((role, content))
+        if folded:
+            self._fold(context, folded)
+    
+    def _fold(self, context: ConversationContext, turns: List[Tuple[str, str]]) -> None:
+        summary = self.summarize(context.summary, turns)
+        summary_tokens = self.count_tokens(summary)
+        
+        # Drop the oldest lines of a summary outgrowing its budget
+        while summary_tokens > self.summary_tokens and "\n" in summary:
+            summary = summary.split("\n", 1)[1]
+            summary_tokens = self.count_tokens(summary)
+        
+        context.summary = summary
+        context.summary_tokens = summary_tokens
+    
+    @staticmethod
+    def _role(message: Message) -> str:
+        return "assistant" if message.sender == "assistant" else "user"
\ No newline at end of file
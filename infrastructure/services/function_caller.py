@@ -1,66 +1,162 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 import uuid
 from domain.services.abstract_function_caller import AbstractFunctionCaller
 from domain.entities.function import Function
 from domain.entities.function_call import FunctionCall
+from infrastructure.services.function_handler import FunctionHandler
+from infrastructure.services.function_registry import FunctionRegistry
+from infrastructure.services.function_result_cache import FunctionResultCache
 
 class FunctionCaller(AbstractFunctionCaller):
+    """
+    Calls functions by dispatching to the handler registered for their name.
+    
+    Results of handlers declared cacheable are reused for calls with the
+    same parameters until they expire, without calling the handler again.
+    
+    Batches of calls run concurrently, at most max_concurrency at a time.
+    """
+    def __init__(
+        self,
+        handlers: Optional[Dict[str, FunctionHandler]] = None,
+        default_timeout: Optional[float] = None,
+        cache: Optional[FunctionResultCache] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        """
+        Initialize the caller with a handler table.
+        
+        Args:
+            handlers: The handlers keyed by function name; defaults to the
+                handlers registered in the FunctionRegistry
+            default_timeout: The timeout, in seconds, of asynchronous calls to
+                handlers that do not declare one
+            cache: The cache of results of cacheable handlers
+            max_concurrency: The maximum number of calls of a batch running at
+                once, which batches may only lower; unlimited when None
+        """
+        self.handlers = handlers if handlers is not None else FunctionRegistry.get_handlers()
+        self.default_timeout = default_timeout
+        self.cache = cache if cache is not None else FunctionResultCache()
+        self.max_concurrency = max_concurrency
+    
     def call_function(self, function: Function, parameters: Dict[str, Any]) -> FunctionCall:
         if not self.validate_parameters(function, parameters):
-            function_call = FunctionCall(
-                id=f"call_{uuid.uuid4()}",
-                function_id=function.id,
-                parameters=parameters,
-                result={"error": "Invalid parameters"},
-                status="failed"
-            )
-            return function_call
+            return self._invalid_call(function, parameters)
+        
+        function_call = FunctionCall(
+            id=f"call_{uuid.uuid4()}",
+            function_id=function.id,
+            parameters=parameters
+        )
         
-        result = self._execute_function(function, parameters)
+        try:
+            function_call.set_result(self._execute_function(function, parameters))
+        except Exception as e:
+            function_call.set_failed(str(e))
+        
+        return function_call
+    
+    async def call_function_async(self, function: Function, parameters: Dict[str, Any]) -> FunctionCall:
+        if not self.validate_parameters(function, parameters):
+            return self._invalid_call(function, parameters)
         
         function_call = FunctionCall(
             id=f"call_{uuid.uuid4()}",
             function_id=function.id,
-            parameters=parameters,
-            result=result,
-            status="completed"
+            parameters=parameters
         )
         
+        try:
+            function_call.set_result(await self._execute_function_async(function, parameters))
+        except TimeoutError:
+            function_call.set_failed(f"Function '{function.name}' timed out")
+        except Exception as e:
+            function_call.set_failed(str(e))
+        
         return function_call
     
+    async def call_functions_async(
+        self,
+        calls: List[Tuple[Function, Dict[str, Any]]],
+        max_concurrency: Optional[int] = None
+    ) -> List[FunctionCall]:
+        # Callers may lower the limit of the caller, never raise it
+        if max_concurrency is None or (self.max_concurrency is not None and max_concurrency > self.max_concurrency):
+            max_concurrency = self.max_concurrency
+        
+        # Invalid calls fail before any call starts, and do not take a slot
+        results: List[Optional[FunctionCall]] = [
+            None if self.validate_parameters(function, parameters) else self._invalid_call(function, parameters)
+            for function, parameters in calls
+        ]
+        valid = [position for position, result in enumerate(results) if result is None]
+        
+        executed = await super().call_functions_async([calls[position] for position in valid], max_concurrency)
+        for position, function_call in zip(valid, executed):
+            results[position] = function_call
+        
+        return results
+    
     def validate_parameters(self, function: Function, parameters: Dict[str, Any]) -> bool:
         return function.validate_parameters(parameters)
     
+    def _invalid_call(self, function: Function, parameters: Dict[str, Any]) -> FunctionCall:
+        return FunctionCall(
+            id=f"call_{uuid.uuid4()}",
+            function_id=function.id,
+            parameters=parameters,
+            result={"error": "Invalid parameters"},
+            status="failed"
+        )
+    
     def _execute_function(self, function: Function, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        # Mock implementation for different functions
-        if function.name == "get_weather":
-            return {
-                "temperature": 72,
-                "condition": "sunny",
-                "location": parameters.get("location", "Unknown")
-            }
-        elif function.name == "get_time":
-            from datetime import datetime
-            return {
-                "time": datetime.now().isoformat(),
-                "timezone": parameters.get("timezone", "UTC")
-            }
-        elif function.name == "calculate":
-            operation = parameters.get("operation", "add")
-            a = parameters.get("a", 0)
-            b = parameters.get("b", 0)
-            
-            if operation == "add":
-                return {"result": a + b}
-            elif operation == "subtract":
-                return {"result": a - b}
-            elif operation == "multiply":
-                return {"result": a * b}
-            elif operation == "divide":
-                if b == 0:
-                    return {"error": "Division by zero"}
-                return {"result": a / b}
-            else:
-                return {"error": f"Unknown operation: {operation}"}
+        handler = self.handlers.get(function.name)
+        
+        if handler is None:
+            return {"error": f"Function not implemented: {function.name}"}
+        
+        if handler.is_async:
+            raise RuntimeError(f"Function '{function.name}' is asynchronous and cannot be called synchronously")
+        
+        if handler.cacheable:
+            cached = self.cache.get(function.name, parameters)
+            if cached is not None:
+                return cached
+        
+        result = handler.callable(parameters)
+        self._cache_result(handler, parameters, result)
+        return result
+    
+    async def _execute_function_async(self, function: Function, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        handler = self.handlers.get(function.name)
+        
+        if handler is None:
+            return {"error": f"Function not implemented: {function.name}"}
+        
+        if handler.cacheable:
+            cached = self.cache.get(function.name, parameters)
+            if cached is not None:
+                return cached
+        
+        # Pure handlers only compute on their parameters and can run on the event loop;
+        # other synchronous handlers may block on I/O, so they run in a worker thread
+        if handler.is_async:
+            call = handler.callable(parameters)
+        elif handler.pure:
+            result = handler.callable(parameters)
+            self._cache_result(handler, parameters, result)
+            return result
         else:
-            return {"error": f"Function not implemented: {function.name}"}
\ No newline at end of file
+            call = asyncio.to_thread(handler.callable, parameters)
+        
+        timeout = handler.timeout if handler.timeout is not None else self.default_timeout
+        result = await asyncio.wait_for(call, timeout=timeout)
+        self._cache_result(handler, parameters, result)
+        return result
+    
+    def _cache_result(self, handler: FunctionHandler, parameters: Dict[str, Any], result: Dict[str, Any]) -> None:
+        # Errors may be transient, so only successful results are reused
+        if handler.cacheable and "error" not in result:
+            self.cache.set(handler.name, parameters, result, ttl=handler.cache_ttl)
\ No newline at end of file
@@ -0,0 +1,35 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+import inspect
+
+FunctionResult = Dict[str, Any]
+HandlerCallable = Callable[[Dict[str, Any]], Union[FunctionResult, Awaitable[FunctionResult]]]
+
+class FunctionHandler:
+    """
+    Implementation of a registered function together with its execution metadata.
+    
+    Attributes:
+        name: The name of the function the handler implements
+        callable: The implementation, called with the function parameters
+        is_async: Whether the implementation is a coroutine function
+        timeout: The maximum number of seconds a call may take, if limited
+        cacheable: Whether results may be reused for identical parameters
+        cache_ttl: The number of seconds a cached result stays fresh, if limited
+        pure: Whether the result depends only on the parameters
+    """
+    def __init__(
+        self,
+        name: str,
+        callable: HandlerCallable,
+        timeout: Optional[float] = None,
+        cacheable: bool = False,
+        cache_ttl: Optional[float] = None,
+        pure: bool = False
+    ):
+        self.name = name
+        self.callable = callable
+        self.is_async = inspect.iscoroutinefunction(callable)
+        self.timeout = timeout
+        self.cacheable = cacheable
+        self.cache_ttl = cache_ttl
+        self.pure = pure
\ No newline at end of file
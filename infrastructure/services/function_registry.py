@@ -1,88 +1,216 @@
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Pattern
 import uuid
 from domain.entities.function import Function
 from domain.value_objects.function_parameter import FunctionParameter
+from infrastructure.services.function_handler import FunctionHandler, HandlerCallable
+
+# Namespace used to derive stable function IDs from function names
+FUNCTION_ID_NAMESPACE = uuid.UUID("5b0f6c3e-8f0a-4f7e-9d2c-6a1b3c4d5e6f")
 
 class FunctionRegistry:
     """
     Registry of available functions.
+    
+    Functions are built once when they are registered and looked up by name
+    in O(1). Function IDs are derived from the function name, so they are
+    stable across calls and across processes.
+    
+    Each function may be registered with a handler implementing it. The
+    handler table is what FunctionCaller dispatches on.
     """
+    _functions: Dict[str, Function] = {}
+    _available_functions: List[Function] = []
+    _handlers: Dict[str, FunctionHandler] = {}
+    _triggers: Dict[str, List[str]] = {}
+    _patterns: Dict[str, List[Pattern[str]]] = {}
+    
+    @classmethod
+    def register(
+        cls,
+        name: str,
+        description: str,
+        parameters: Optional[List[FunctionParameter]] = None,
+        handler: Optional[HandlerCallable] = None,
+        timeout: Optional[float] = None,
+        cacheable: bool = False,
+        cache_ttl: Optional[float] = None,
+        pure: bool = False,
+        triggers: Optional[List[str]] = None,
+        patterns: Optional[List[Pattern[str]]] = None
+    ) -> Function:
+        """
+        Register a function.
+        
+        Args:
+            name: The unique name of the function
+            description: A description of what the function does
+            parameters: The parameters accepted by the function
+            handler: The implementation, called with the function parameters;
+                may be a coroutine function
+            timeout: The maximum number of seconds a call may take
+            cacheable: Whether results may be reused for identical parameters
+            cache_ttl: The number of seconds a cached result stays fresh;
+                cached results never expire when None
+            pure: Whether the result depends only on the parameters
+            triggers: Words or phrases indicating that a message asks for the function
+            patterns: Regular expressions matching requests for the function
+                that words alone do not identify
+        
+        Returns:
+            The registered Function entity
+        """
+        if name in cls._functions:
+            raise ValueError(f"Function '{name}' is already registered")
+        
+        function = Function(
+            id=f"func_{uuid.uuid5(FUNCTION_ID_NAMESPACE, name)}",
+            name=name,
+            description=description,
+            parameters=parameters or []
+        )
+        
+        cls._functions[name] = function
+        cls._available_functions = list(cls._functions.values())
+        cls._triggers[name] = list(triggers or [])
+        cls._patterns[name] = list(patterns or [])
+        
+        if handler is not None:
+            cls._handlers[name] = FunctionHandler(
+                name=name,
+                callable=handler,
+                timeout=timeout,
+                cacheable=cacheable,
+                cache_ttl=cache_ttl,
+                pure=pure
+            )
+        
+        return function
     
-    @staticmethod
-    def get_available_functions() -> List[Function]:
+    @classmethod
+    def function(
+        cls,
+        name: str,
+        description: str,
+        parameters: Optional[List[FunctionParameter]] = None,
+        timeout: Optional[float] = None,
+        cacheable: bool = False,
+        cache_ttl: Optional[float] = None,
+        pure: bool = False,
+        triggers: Optional[List[str]] = None,
+        patterns: Optional[List[Pattern[str]]] = None
+    ) -> Callable[[HandlerCallable], HandlerCallable]:
+        """
+        Decorator registering the decorated callable as the handler of a new function.
+        
+        Args:
+            name: The unique name of the function
+            description: A description of what the function does
+            parameters: The parameters accepted by the function
+            timeout: The maximum number of seconds a call may take
+            cacheable: Whether results may be reused for identical parameters
+            cache_ttl: The number of seconds a cached result stays fresh;
+                cached results never expire when None
+            pure: Whether the result depends only on the parameters
+            triggers: Words or phrases indicating that a message asks for the function
+            patterns: Regular expressions matching requests for the function
+                that words alone do not identify
+        
+        Returns:
+            A decorator returning the handler unchanged
+        """
+        def decorator(handler: HandlerCallable) -> HandlerCallable:
+            cls.register(
+                name=name,
+                description=description,
+                parameters=parameters,
+                handler=handler,
+                timeout=timeout,
+                cacheable=cacheable,
+                cache_ttl=cache_ttl,
+                pure=pure,
+                triggers=triggers,
+                patterns=patterns
+            )
+            return handler
+        
+        return decorator
+    
+    @classmethod
+    def get_available_functions(cls) -> List[Function]:
         """
         Get a list of available functions.
         
+        The list is shared between callers and must not be modified.
+        
         Returns:
             A list of Function entities
         """
-        return [
-            Function(
-                id=f"func_{uuid.uuid4()}",
-                name="get_weather",
-                description="Get the weather for a location",
-                parameters=[
-                    FunctionParameter(
-                        name="location",
-                        type="string",
-                        description="The location to get weather for",
-                        required=False
-                    )
-                ]
-            ),
-            Function(
-                id=f"func_{uuid.uuid4()}",
-                name="get_time",
-                description="Get the current time",
-                parameters=[
-                    FunctionParameter(
-                        name="timezone",
-                        type="string",
-                        description="The timezone to get time for",
-                        required=False
-                    )
-                ]
-            ),
-            Function(
-                id=f"func_{uuid.uuid4()}",
-                name="calculate",
-                description="Perform a calculation",
-                parameters=[
-                    FunctionParameter(
-                        name="operation",
-                        type="string",
-                        description="The operation to perform (add, subtract, multiply, divide)",
-                        required=False
-                    ),
-                    FunctionParameter(
-                        name="a",
-                        type="number",
-                        description="The first number",
-                        required=False
-                    ),
-                    FunctionParameter(
-                        name="b",
-                        type="number",
-                        description="The second number",
-                        required=False
-                    )
-                ]
-            )
-        ]
+        return cls._available_functions
     
-    @staticmethod
-    def get_function_by_name(name: str) -> Optional[Function]:
+    @classmethod
+    def get_function_by_name(cls, name: str) -> Optional[Function]:
         """
         Get a function by name.
         
         Args:
             name: The name of the function
-            
+        
         Returns:
             The function if found, None otherwise
         """
-        functions = FunctionRegistry.get_available_functions()
-        for function in functions:
-            if function.name == name:
-                return function
-        return None
\ No newline at end of file
+        return cls._functions.get(name)
+    
+    @classmethod
+    def get_triggers(cls, name: str) -> List[str]:
+        """
+        Get the words or phrases indicating that a message asks for a function.
+        
+        Args:
+            name: The name of the function
+        
+        Returns:
+            The triggers of the function, empty if it has none
+        """
+        return cls._triggers.get(name, [])
+    
+    @classmethod
+    def get_patterns(cls, name: str) -> List[Pattern[str]]:
+        """
+        Get the regular expressions matching requests for a function.
+        
+        Args:
+            name: The name of the function
+        
+        Returns:
+            The patterns of the function, empty if it has none
+        """
+        return cls._patterns.get(name, [])
+    
+    @classmethod
+    def get_handler(cls, name: str) -> Optional[FunctionHandler]:
+        """
+        Get the handler implementing a function.
+        
+        Args:
+            name: The name of the function
+        
+        Returns:
+            The handler if the function has one, None otherwise
+        """
+        return cls._handlers.get(name)
+    
+    @classmethod
+    def get_handlers(cls) -> Dict[str, FunctionHandler]:
+        """
+        Get the handler table, keyed by function name.
+        
+        The table is shared between callers and must not be modified.
+        
+        Returns:
+            The handlers of all functions registered with one
+        """
+        return cls._handlers
+
+
+# Register the built-in functions; imported last because they use the registry
+import infrastructure.services.builtin_functions
\ No newline at end of file
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import json
+import threading
+import time
+
+"""
+Cache of function call results.
+
+Results are keyed by function name and canonicalized parameters, so the
+same call with parameters in a different order hits the same entry. The
+cache is bounded: the least recently used entry is evicted once it is
+full, and entries may expire after a per-function time to live.
+"""
+
+class FunctionResultCache:
+    """
+    Thread-safe LRU cache of function results with per-entry expiry.
+    
+    Attributes:
+        max_size: The maximum number of cached results
+        hits: The number of lookups that found a fresh result
+        misses: The number of lookups that found nothing or an expired result
+    """
+    def __init__(self, max_size: int = 1024):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_size: The maximum number of cached results
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Tuple[Optional[float], Dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, function_name: str, parameters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached result of a call.
+        
+        The result is shared with other callers and must not be modified.
+        
+        Args:
+            function_name: The name of the called function
+            parameters: The parameters of the call
+        
+        Returns:
+            The result if cached and not expired, None otherwise
+        """
+        key = self._key(function_name, parameters)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                
+                del self._entries[key]
+            
+            self.misses += 1
+            return None
+    
+    def set(self, function_name: str, parameters: Dict[str, Any], result: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """
+        Cache the result of a call.
+        
+        Args:
+            function_name: The name of the called function
+            parameters: The parameters of the call
+            result: The result of the call
+            ttl: The number of seconds the result stays fresh; it never expires when None
+        """
+        key = self._key(function_name, parameters)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """
+        Remove all cached results and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+        
+        Returns:
+            The number of hits, misses and cached results
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _key(self, function_name: str, parameters: Dict[str, Any]) -> Hashable:
+        # Sorted keys make the key independent of the parameter order
+        return function_name, json.dumps(parameters, sort_keys=True, separators=(",", ":"), default=str)
\ No newline at end of file
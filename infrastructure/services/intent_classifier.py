@@ -0,0 +1,122 @@
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+from domain.entities.function import Function
+from infrastructure.services.function_registry import FunctionRegistry
+from infrastructure.services.intent_matcher import IntentMatcher, TOKEN_PATTERN
+
+"""
+Intent classification of user messages.
+
+A message is a function call when it mentions a registered function, one
+of its triggers, or a verb asking for an action to be performed. All the
+triggers are compiled into a single IntentMatcher, so a message is
+classified in one pass over its tokens. Functions may also be asked for
+by text matching one of their patterns, such as an arithmetic expression.
+"""
+
+# Verbs asking for an action, whatever the function
+FUNCTION_CALL_TRIGGERS = [
+    "call", "function", "run", "execute", "perform", "use", "invoke", "get", "find", "show"
+]
+
+# Intent of the generic triggers; never a valid function name
+GENERIC_INTENT = " function_call"
+
+class IntentClassifier:
+    """
+    Classifies messages as function calls or questions.
+    
+    Besides the intent, classification returns the functions a message asks
+    for, in the order they are mentioned.
+    """
+    def __init__(self, functions: List[Function]):
+        """
+        Compile the triggers of a list of functions.
+        
+        Args:
+            functions: The functions messages may ask for
+        """
+        self._functions = {function.name: function for function in functions}
+        
+        triggers = {GENERIC_INTENT: FUNCTION_CALL_TRIGGERS}
+        self._patterns: List[Tuple[str, Pattern[str]]] = []
+        for function in functions:
+            # A function is also triggered when its name is mentioned
+            triggers[function.name] = [function.name, *FunctionRegistry.get_triggers(function.name)]
+            self._patterns.extend((function.name, pattern) for pattern in FunctionRegistry.get_patterns(function.name))
+        
+        self._matcher = IntentMatcher(triggers)
+    
+    def classify(self, text: str) -> Dict[str, Any]:
+        """
+        Classify a message.
+        
+        Args:
+            text: The content of the message
+        
+        Returns:
+            The intent, "function_call" or "question", and the functions asked for
+        """
+        return self._classify_tokens(text, TOKEN_PATTERN.findall(text.lower()))
+    
+    def classify_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify many messages at once.
+        
+        Args:
+            texts: The contents of the messages
+        
+        Returns:
+            The classification of each message, in the same order
+        """
+        findall = TOKEN_PATTERN.findall
+        classify_tokens = self._classify_tokens
+        return [classify_tokens(text, findall(text.lower())) for text in texts]
+    
+    def get_function(self, name: str) -> Function:
+        """
+        Get one of the functions the classifier was compiled for.
+        
+        Args:
+            name: The name of the function, as returned by classify
+        
+        Returns:
+            The function
+        """
+        return self._functions[name]
+    
+    def _classify_tokens(self, text: str, tokens: List[str]) -> Dict[str, Any]:
+        matched = self._matcher.match_tokens(tokens)
+        for name, pattern in self._patterns:
+            if name not in matched and pattern.search(text):
+                matched.append(name)
+        if not matched:
+            return {"intent": "question", "functions": []}
+        
+        functions = [intent for intent in matched if intent != GENERIC_INTENT]
+        return {"intent": "function_call", "functions": functions}
+
+# The classifier of the last list of functions, compiled on first use
+_classifier: Optional[Tuple[List[Function], IntentClassifier]] = None
+
+def get_intent_classifier(functions: Optional[List[Function]] = None) -> IntentClassifier:
+    """
+    Get the classifier of a list of functions.
+    
+    The registry hands out the same list until a function is registered, so
+    the classifier is only compiled again when the list changes.
+    
+    Args:
+        functions: The functions messages may ask for, the registered ones by default
+    
+    Returns:
+        The compiled classifier
+    """
+    global _classifier
+    
+    if functions is None:
+        functions = FunctionRegistry.get_available_functions()
+    
+    if _classifier is None or _classifier[0] is not functions:
+        _classifier = (functions, IntentClassifier(functions))
+    
+    return _classifier[1]
\ No newline at end of file
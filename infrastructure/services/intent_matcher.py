@@ -0,0 +1,93 @@
+from typing import Dict, Iterable, List, Tuple
+import re
+
+"""
+Trigger phrase matching for intent detection.
+
+Messages are split into words and symbols by a single precompiled regular
+expression, and phrases are looked up in a table built once from all the
+triggers. Scanning a message therefore costs O(len(message)) whatever the
+number of intents and triggers.
+"""
+
+# Words, or single symbols such as "+" and "*"
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase words and symbols.
+    
+    Args:
+        text: The text to tokenize
+    
+    Returns:
+        The tokens in the order they appear
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class IntentMatcher:
+    """
+    Matches text against the trigger phrases of many intents in one pass.
+    
+    Triggers are whole words or phrases, so "times" does not match the
+    trigger "time". Each phrase is stored under its first token together
+    with the intents it triggers, which makes the lookup at each position
+    of the text a dictionary access.
+    """
+    def __init__(self, triggers: Dict[str, Iterable[str]]):
+        """
+        Compile the trigger table.
+        
+        Args:
+            triggers: The trigger phrases of each intent, keyed by intent name
+        """
+        self._phrases: Dict[str, List[Tuple[Tuple[str, ...], Tuple[str, ...]]]] = {}
+        
+        phrase_intents: Dict[Tuple[str, ...], List[str]] = {}
+        for intent, phrases in triggers.items():
+            for phrase in phrases:
+                tokens = tuple(tokenize(phrase))
+                if tokens and intent not in phrase_intents.setdefault(tokens, []):
+                    phrase_intents[tokens].append(intent)
+        
+        for tokens, intents in phrase_intents.items():
+            self._phrases.setdefault(tokens[0], []).append((tokens[1:], tuple(intents)))
+    
+    def match(self, text: str) -> List[str]:
+        """
+        Find the intents triggered by a text.
+        
+        Args:
+            text: The text to match
+        
+        Returns:
+            The triggered intents, in the order of their first trigger in the text
+        """
+        return self.match_tokens(tokenize(text))
+    
+    def match_tokens(self, tokens: List[str]) -> List[str]:
+        """
+        Find the intents triggered by an already tokenized text.
+        
+        Args:
+            tokens: The tokens of the text, as returned by tokenize
+        
+        Returns:
+            The triggered intents, in the order of their first trigger in the text
+        """
+        matched: Dict[str, None] = {}
+        phrases = self._phrases
+        
+        for position, token in enumerate(tokens):
+            candidates = phrases.get(token)
+            if candidates is None:
+                continue
+            
+            for rest, intents in candidates:
+                end = position + 1 + len(rest)
+                if not rest or tuple(tokens[position + 1:end]) == rest:
+                    for intent in intents:
+                        matched[intent] = None
+        
+        return list(matched)
\ No newline at end of file
@@ -1,23 +1,42 @@
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
 import uuid
 from domain.entities.message import Message
+from domain.entities.function_call import FunctionCall
+from domain.services.abstract_ai_service import AbstractAIService
 from domain.services.abstract_message_processor import AbstractMessageProcessor
 from domain.services.abstract_function_caller import AbstractFunctionCaller
+from infrastructure.services.context_builder import ContextBuilder
 from infrastructure.services.openai_service import OpenAIService
 from infrastructure.services.function_registry import FunctionRegistry
 
 class MessageProcessor(AbstractMessageProcessor):
+    """
+    Processes user messages by calling the functions they ask for, or by
+    generating a response when they do not ask for any.
+    
+    A message may ask for several functions; the asynchronous path runs
+    them concurrently and the results are combined into a single response.
+    
+    With a context builder, responses are generated from the previous turns
+    of the conversation as well as the message. The asynchronous paths use
+    it from a worker thread, since it may read the message repository.
+    """
     def __init__(
         self,
-        function_caller: AbstractFunctionCaller
+        function_caller: AbstractFunctionCaller,
+        ai_service: Optional[AbstractAIService] = None,
+        context_builder: Optional[ContextBuilder] = None
     ):
-        self.ai_service = OpenAIService(api_key="mock-api-key")
+        self.ai_service = ai_service or OpenAIService(api_key="mock-api-key")
         self.function_caller = function_caller
+        self.context_builder = context_builder
     
     def process(self, message: Message) -> Optional[Message]:
         if message.sender != "user":
             return None
         
+        context = self._build_context(message)
         available_functions = FunctionRegistry.get_available_functions()
         
         function_calls = self.ai_service.extract_function_calls(
@@ -27,28 +46,135 @@ class MessageProcessor(AbstractMessageProcessor):
         
         # If function calls were detected
         if function_calls:
-            function_call = function_calls[0]  # Take the first function call
-            function_name = function_call["name"]
-            arguments = function_call["arguments"]
+            results = [self._call_function(function_call) for function_call in function_calls]
+            response_content = self._describe_function_calls(function_calls, results)
+        else:
+            # Generate a standard response
+            response_content = self.ai_service.generate_response(message.content, context)
+        
+        return self._create_response_message(message, response_content)
+    
+    async def process_async(self, message: Message) -> Optional[Message]:
+        if message.sender != "user":
+            return None
+        
+        context = await asyncio.to_thread(self._build_context, message)
+        available_functions = FunctionRegistry.get_available_functions()
+        
+        function_calls = await self.ai_service.extract_function_calls_async(
+            message.content,
+            available_functions
+        )
+        
+        # If function calls were detected, run them concurrently
+        if function_calls:
+            results = await asyncio.gather(
+                *(self._call_function_async(function_call) for function_call in function_calls)
+            )
+            response_content = self._describe_function_calls(function_calls, results)
+        else:
+            # Generate a standard response
+            response_content = await self.ai_service.generate_response_async(message.content, context)
+        
+        return await asyncio.to_thread(self._create_response_message, message, response_content)
+    
+    async def process_stream(self, message: Message) -> AsyncIterator[Dict[str, Any]]:
+        if message.sender != "user":
+            return
+        
+        context = await asyncio.to_thread(self._build_context, message)
+        available_functions = FunctionRegistry.get_available_functions()
+        
+        function_calls = await self.ai_service.extract_function_calls_async(
+            message.content,
+            available_functions
+        )
+        
+        if function_calls:
+            for function_call in function_calls:
+                yield {"type": "function_call", "name": function_call["name"], "arguments": function_call["arguments"]}
             
-            function = FunctionRegistry.get_function_by_name(function_name)
+            # Run the calls concurrently and report each one as soon as it finishes
+            tasks = {
+                asyncio.ensure_future(self._call_function_async(function_call)): position
+                for position, function_call in enumerate(function_calls)
+            }
+            results: List[Optional[FunctionCall]] = [None] * len(function_calls)
+            pending = set(tasks)
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        position = tasks[task]
+                        result = results[position] = task.result()
+                        yield {
+                            "type": "function_result",
+                            "name": function_calls[position]["name"],
+                            "status": result.status if result else "not_found",
+                            "result": result.result if result else None
+                        }
+            finally:
+                # The client may stop listening before every call has finished
+                for task in pending:
+                    task.cancel()
             
-            if function:
-                result = self.function_caller.call_function(function, arguments)
-                
-                # Create a response message with the function result
-                response_content = f"I called the function '{function_name}' and got this result: {result.result}"
-            else:
-                response_content = f"I couldn't find the function '{function_name}'."
+            response_content = self._describe_function_calls(function_calls, results)
+            yield {"type": "token", "content": response_content}
         else:
-            # Generate a standard response
-            response_content = self.ai_service.generate_response(message.content)
+            chunks = []
+            async for chunk in self.ai_service.stream_response(message.content, context):
+                chunks.append(chunk)
+                yield {"type": "token", "content": chunk}
+            response_content = "".join(chunks)
+        
+        response = await asyncio.to_thread(self._create_response_message, message, response_content)
+        yield {"type": "response", "message": response}
+    
+    def _call_function(self, function_call: Dict[str, Any]) -> Optional[FunctionCall]:
+        function = FunctionRegistry.get_function_by_name(function_call["name"])
+        if not function:
+            return None
         
-        response_message = Message(
+        return self.function_caller.call_function(function, function_call["arguments"])
+    
+    async def _call_function_async(self, function_call: Dict[str, Any]) -> Optional[FunctionCall]:
+        function = FunctionRegistry.get_function_by_name(function_call["name"])
+        if not function:
+            return None
+        
+        return await self.function_caller.call_function_async(function, function_call["arguments"])
+    
+    def _describe_function_calls(
+        self,
+        function_calls: List[Dict[str, Any]],
+        results: List[Optional[FunctionCall]]
+    ) -> str:
+        return "\n".join(
+            self._describe_function_call(function_call["name"], result)
+            for function_call, result in zip(function_calls, results)
+        )
+    
+    def _describe_function_call(self, function_name: str, result: Optional[FunctionCall]) -> str:
+        if result is None:
+            return f"I couldn't find the function '{function_name}'."
+        
+        return f"I called the function '{function_name}' and got this result: {result.result}"
+    
+    def _build_context(self, message: Message) -> Optional[List[Dict[str, str]]]:
+        if self.context_builder is None:
+            return None
+        
+        return self.context_builder.build(message)
+    
+    def _create_response_message(self, message: Message, response_content: str) -> Message:
+        response = Message(
             id=f"msg_{uuid.uuid4()}",
             content=response_content,
             sender="assistant",
             conversation_id=message.conversation_id
         )
         
-        return response_message
\ No newline at end of file
+        if self.context_builder is not None:
+            self.context_builder.add(response)
+        
+        return response
\ No newline at end of file
@@ -1,24 +1,180 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, AsyncIterator
+import asyncio
+import importlib.util
+import json
 import random
+import re
+import httpx
 from domain.services.abstract_ai_service import AbstractAIService
 from domain.entities.function import Function
+from infrastructure.services.intent_classifier import get_intent_classifier
+from infrastructure.services.intent_matcher import IntentMatcher
+from infrastructure.services.builtin_functions import ARITHMETIC_EXPRESSION_PATTERN
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# A place name ends at punctuation or at a conjunction introducing another request
+PLACE_PATTERN = r"([a-zA-Z\s]+?)(?=\s+(?:and|or|then)\b|[^a-zA-Z\s]|$)"
+
+LOCATION_PATTERN = re.compile(r"(?:weather|temperature|forecast) (?:in|for|at) " + PLACE_PATTERN)
+TIMEZONE_PATTERN = re.compile(r"(?:(?:time|clock) (?:in|for)|timezone) " + PLACE_PATTERN)
+NUMBER_PATTERN = re.compile(r"\d+")
+
+# Operations of the calculate function, in the order they take precedence
+OPERATION_MATCHER = IntentMatcher({
+    "add": ["add", "plus"],
+    "subtract": ["subtract", "minus"],
+    "multiply": ["multiply", "times"],
+    "divide": ["divide", "divided by"]
+})
+OPERATION_PRECEDENCE = ["add", "subtract", "multiply", "divide"]
+
+# Operations of the operators of arithmetic expressions
+OPERATOR_OPERATIONS = {"+": "add", "-": "subtract", "*": "multiply", "/": "divide"}
+
+def extract_calculate_arguments(message_content: str, function: Function) -> Dict[str, Any]:
+    expression = ARITHMETIC_EXPRESSION_PATTERN.search(message_content)
+    if expression:
+        a, operator, b = expression.groups()
+        return {"operation": OPERATOR_OPERATIONS[operator], "a": int(a), "b": int(b)}
+    
+    operations = OPERATION_MATCHER.match(message_content)
+    # Default to add
+    operation = next((operation for operation in OPERATION_PRECEDENCE if operation in operations), "add")
+    
+    # Operands missing from the message are left out rather than made up
+    arguments: Dict[str, Any] = {"operation": operation}
+    for name, number in zip(("a", "b"), NUMBER_PATTERN.findall(message_content)):
+        arguments[name] = int(number)
+    
+    return arguments
+
+def extract_weather_arguments(message_content: str, function: Function) -> Dict[str, Any]:
+    match = LOCATION_PATTERN.search(message_content.lower())
+    return {"location": match.group(1).strip() if match else "New York"}
+
+def extract_time_arguments(message_content: str, function: Function) -> Dict[str, Any]:
+    match = TIMEZONE_PATTERN.search(message_content.lower())
+    return {"timezone": match.group(1).strip() if match else "UTC"}
+
+def extract_generic_arguments(message_content: str, function: Function) -> Dict[str, Any]:
+    placeholders = {"string": "sample_value", "number": 42, "boolean": True}
+    return {param.name: placeholders.get(param.type) for param in function.parameters}
+
+# Argument extractors of the built-in functions; other functions get placeholder values
+ARGUMENT_EXTRACTORS = {
+    "calculate": extract_calculate_arguments,
+    "get_weather": extract_weather_arguments,
+    "get_time": extract_time_arguments
+}
 
 class OpenAIService(AbstractAIService):
     """    
     This class provides a mock implementation of the OpenAI API for
     generating responses and extracting function calls.
+    
+    When a base URL is configured, responses are generated by calling the
+    chat completions endpoint of an OpenAI-compatible API instead. The
+    service then owns pooled keep-alive HTTP clients, so it is meant to be
+    created once per application and closed on shutdown.
     """
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20
+    ):
         """
         Initialize the service with an API key.
         
         Args:
             api_key: The OpenAI API key
+            base_url: The URL of an OpenAI-compatible API; responses are mocked when None
+            model: The model used for chat completions
+            timeout: The timeout of API requests, in seconds
+            max_connections: The maximum number of concurrent connections to the API
+            max_keepalive_connections: The maximum number of idle connections kept open
         """
         self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+        
+        if base_url is not None:
+            client_options = {
+                "base_url": base_url,
+                "headers": {"Authorization": f"Bearer {api_key}"},
+                "timeout": timeout,
+                "limits": httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive_connections
+                )
+            }
+            self._client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, **client_options)
+            self._sync_client = httpx.Client(http2=HTTP2_AVAILABLE, **client_options)
+    
+    def generate_response(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> str:
+        if self._sync_client is not None:
+            response = self._sync_client.post("/chat/completions", json=self._completion_request(message_content, context))
+            response.raise_for_status()
+            return self._completion_content(response.json())
+        
+        return self._mock_response(message_content)
     
-    def generate_response(self, message_content: str) -> str:
-        # In a real implementation, this would call the OpenAI API
+    async def generate_response_async(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> str:
+        if self._client is not None:
+            response = await self._client.post("/chat/completions", json=self._completion_request(message_content, context))
+            response.raise_for_status()
+            return self._completion_content(response.json())
+        
+        # The mock does not block, so there is no need for a worker thread
+        return self._mock_response(message_content)
+    
+    async def stream_response(self, message_content: str, context: Optional[List[Dict[str, str]]] = None) -> AsyncIterator[str]:
+        if self._client is not None:
+            request = {**self._completion_request(message_content, context), "stream": True}
+            async with self._client.stream("POST", "/chat/completions", json=request) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    content = json.loads(data)["choices"][0]["delta"].get("content")
+                    if content:
+                        yield content
+            return
+        
+        # Stream the mock response word by word, letting other requests run in between
+        for token in re.findall(r"\S+\s*", self._mock_response(message_content)):
+            yield token
+            await asyncio.sleep(0)
+    
+    async def aclose(self) -> None:
+        """
+        Close the pooled HTTP connections of the service.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+        if self._sync_client is not None:
+            self._sync_client.close()
+    
+    def _completion_request(self, message_content: str, context: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [*(context or []), {"role": "user", "content": message_content}]
+        }
+    
+    def _completion_content(self, completion: Dict[str, Any]) -> str:
+        return completion["choices"][0]["message"]["content"]
+    
+    def _mock_response(self, message_content: str) -> str:
         responses = [
             "I'm an AI assistant. How can I help you?",
             "That's an interesting question. Let me think about it.",
@@ -35,132 +191,25 @@ class OpenAIService(AbstractAIService):
             return random.choice(responses)
     
     def extract_function_calls(self, message_content: str, available_functions: List[Function]) -> List[Dict[str, Any]]:
-        # In a real implementation, this would use the OpenAI API to extract function calls
+        # Function calls are always extracted locally, even when responses come from the API
         function_calls = []
         
         if not available_functions:
             return function_calls
         
-        message_lower = message_content.lower()
-        
-        # Define function-specific triggers
-        function_triggers = {
-            "get_weather": [
-                "weather", "temperature", "forecast", "rain", "sunny", "cloudy",
-                "humidity", "precipitation", "climate", "meteorological"
-            ],
-            "get_time": [
-                "time", "clock", "hour", "minute", "current time", "what time",
-                "timezone", "local time", "utc", "gmt"
-            ],
-            "calculate": [
-                "calculate", "compute", "add", "subtract", "multiply", "divide",
-                "sum", "difference", "product", "quotient", "math", "calculation",
-                "plus", "minus", "times", "divided by", "+", "-", "*", "/"
-            ]
-        }
+        classifier = get_intent_classifier(available_functions)
         
-        # Check for function-specific triggers first
-        for function in available_functions:
-            function_name = function.name.lower()
-            
-            # Check if function name is explicitly mentioned
-            function_name_mentioned = function_name in message_lower
+        for function_name in classifier.classify(message_content)["functions"]:
+            function = classifier.get_function(function_name)
+            extract_arguments = ARGUMENT_EXTRACTORS.get(function.name, extract_generic_arguments)
             
-            # Check for function-specific triggers
-            trigger_found = function_name_mentioned
-            
-            # If function has defined triggers, check for them
-            if function_name in function_triggers:
-                triggers = function_triggers[function_name]
-                for trigger in triggers:
-                    if trigger in message_lower:
-                        trigger_found = True
-                        break
-            
-            if trigger_found:
-                # Create a mock function call
-                function_call = {
-                    "name": function.name,
-                    "arguments": {}
-                }
-                
-                # Special handling for calculate function
-                if function.name == "calculate":
-                    # Extract operation
-                    if "add" in message_lower or "plus" in message_lower or "+" in message_lower:
-                        function_call["arguments"]["operation"] = "add"
-                    elif "subtract" in message_lower or "minus" in message_lower or "-" in message_lower:
-                        function_call["arguments"]["operation"] = "subtract"
-                    elif "multiply" in message_lower or "times" in message_lower or "*" in message_lower:
-                        function_call["arguments"]["operation"] = "multiply"
-                    elif "divide" in message_lower or "divided by" in message_lower or "/" in message_lower:
-                        function_call["arguments"]["operation"] = "divide"
-                    else:
-                        function_call["arguments"]["operation"] = "add"  # Default to add
-                    
-                    # Extract numbers
-                    import re
-                    numbers = re.findall(r'\d+', message_content)
-                    if len(numbers) >= 2:
-                        function_call["arguments"]["a"] = int(numbers[0])
-                        function_call["arguments"]["b"] = int(numbers[1])
-                    else:
-                        # Default values
-                        function_call["arguments"]["a"] = 1
-                        function_call["arguments"]["b"] = 1
-                
-                # Special handling for get_weather function
-                elif function.name == "get_weather":
-                    # Try to extract location
-                    location = "New York"  # Default location
-                    location_patterns = [
-                        r"weather (?:in|for|at) ([a-zA-Z\s]+)",
-                        r"temperature (?:in|for|at) ([a-zA-Z\s]+)",
-                        r"forecast (?:in|for|at) ([a-zA-Z\s]+)"
-                    ]
-                    
-                    for pattern in location_patterns:
-                        import re
-                        match = re.search(pattern, message_lower)
-                        if match:
-                            location = match.group(1).strip()
-                            break
-                            
-                    function_call["arguments"]["location"] = location
-                
-                # Special handling for get_time function
-                elif function.name == "get_time":
-                    # Try to extract timezone
-                    timezone = "UTC"  # Default timezone
-                    timezone_patterns = [
-                        r"time (?:in|for) ([a-zA-Z\s]+)",
-                        r"clock (?:in|for) ([a-zA-Z\s]+)",
-                        r"timezone ([a-zA-Z\s]+)"
-                    ]
-                    
-                    for pattern in timezone_patterns:
-                        import re
-                        match = re.search(pattern, message_lower)
-                        if match:
-                            timezone = match.group(1).strip()
-                            break
-                            
-                    function_call["arguments"]["timezone"] = timezone
-                
-                # Generic handling for other functions
-                else:
-                    for param in function.parameters:
-                        if param.type == "string":
-                            function_call["arguments"][param.name] = "sample_value"
-                        elif param.type == "number":
-                            function_call["arguments"][param.name] = 42
-                        elif param.type == "boolean":
-                            function_call["arguments"][param.name] = True
-                        else:
-                            function_call["arguments"][param.name] = None
-                
-                function_calls.append(function_call)
-                break  # Just return the first match for simplicity
+            function_calls.append({
+                "name": function.name,
+                "arguments": extract_arguments(message_content, function)
+            })
         
-        return function_calls
\ No newline at end of file
+        return function_calls
+    
+    async def extract_function_calls_async(self, message_content: str, available_functions: List[Function]) -> List[Dict[str, Any]]:
+        # The mock does not block, so there is no need for a worker thread
+        return self.extract_function_calls(message_content, available_functions)
\ No newline at end of file
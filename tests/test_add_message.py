@@ -0,0 +1,32 @@
+import pytest
+from typing import Optional
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from domain.services.abstract_message_processor import AbstractMessageProcessor
+from application.features.conversation.use_cases.add_message import AddMessageUseCase
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+
+class SilentProcessor(AbstractMessageProcessor):
+    """Message processor that never responds."""
+    def process(self, message: Message) -> Optional[Message]:
+        return None
+
+
+def test_add_message_should_not_store_messages_it_rejects():
+    """
+    Test that a message from someone else than the owner of a private conversation is not stored.
+    """
+    clear_database()
+    conversations = InMemoryRepository[Conversation]("conversations")
+    conversations.save(Conversation(id="conv_1", title="Private", owner_id="user_1"))
+    messages = InMemoryRepository[Message]("messages")
+    use_case = AddMessageUseCase(conversations, messages, SilentProcessor())
+    
+    with pytest.raises(PermissionError):
+        use_case.execute("conv_1", "hello", "user_2")
+    
+    assert messages.find_messages_by_conversation_id("conv_1") == []
+    assert conversations.find_by_id("conv_1").message_count == 0
+    clear_database()
\ No newline at end of file
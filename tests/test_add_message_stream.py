@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from domain.services.abstract_message_processor import AbstractMessageProcessor
+from application.features.conversation.use_cases.add_message import AddMessageUseCase
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+from api.controllers.conversation_controller import _to_server_sent_events
+
+
+class SlowProcessor(AbstractMessageProcessor):
+    """Message processor streaming its response in two chunks, optionally failing in between."""
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+    
+    def process(self, message: Message) -> Optional[Message]:
+        return None
+    
+    async def process_stream(self, message: Message) -> AsyncIterator[Dict[str, Any]]:
+        yield {"type": "token", "content": "Hello "}
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("Model unavailable")
+        yield {"type": "token", "content": "there"}
+        yield {"type": "response", "message": Message(
+            id="msg_reply",
+            content="Hello there",
+            sender="assistant",
+            conversation_id=message.conversation_id
+        )}
+
+
+def create_use_case(processor: AbstractMessageProcessor):
+    clear_database()
+    conversations = InMemoryRepository[Conversation]("conversations")
+    conversations.save(Conversation(id="conv_1", title="Support", owner_id="user_1"))
+    messages = InMemoryRepository[Message]("messages")
+    return AddMessageUseCase(conversations, messages, processor), conversations, messages
+
+
+def test_add_message_stream_should_store_the_response_when_the_client_stops_listening():
+    """
+    Test that a response is stored even when its stream is abandoned.
+    
+    This test verifies that closing the stream after the first event does
+    not prevent the response from being stored and counted.
+    """
+    use_case, conversations, messages = create_use_case(SlowProcessor())
+    
+    async def listen_briefly():
+        events = await use_case.execute_stream("conv_1", "Hi", "user_1")
+        first = await events.__anext__()
+        await events.aclose()
+        await asyncio.sleep(0.1)
+        return first
+    
+    assert asyncio.run(listen_briefly())["type"] == "message"
+    assert [m.content for m in messages.find_messages_by_conversation_id("conv_1")] == ["Hi", "Hello there"]
+    assert conversations.find_by_id("conv_1").message_count == 2
+    clear_database()
+
+
+def test_add_message_stream_should_end_with_an_error_event_when_processing_fails():
+    """
+    Test that an exception raised mid-stream is reported as an error event.
+    """
+    use_case, conversations, messages = create_use_case(SlowProcessor(fail=True))
+    
+    async def stream():
+        events = await use_case.execute_stream("conv_1", "Hi", "user_1")
+        return [event async for event in _to_server_sent_events(events)]
+    
+    events = asyncio.run(stream())
+    
+    assert [event.split("\n", 1)[0] for event in events] == ["event: message", "event: token", "event: error"]
+    assert events[-1] == 'event: error\ndata: {"detail": "Internal server error: Model unavailable"}\n\n'
+    clear_database()
\ No newline at end of file
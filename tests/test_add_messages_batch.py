@@ -0,0 +1,142 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+import pytest
+from domain.entities.conversation import Conversation, PublicConversation
+from domain.entities.message import Message
+from domain.services.abstract_message_processor import AbstractMessageProcessor
+from application.exceptions import NotFoundException, ValidationException
+from application.features.conversation.dtos import NewMessageDTO
+from application.features.conversation.use_cases.add_messages_batch import AddMessagesBatchUseCase, MAX_PROCESSED_MESSAGES
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+
+class EchoProcessor(AbstractMessageProcessor):
+    """Message processor echoing user messages."""
+    def process(self, message: Message) -> Optional[Message]:
+        return Message(
+            id=f"reply_{message.id}",
+            content=f"Echo: {message.content}",
+            sender="assistant",
+            conversation_id=message.conversation_id
+        )
+
+
+@pytest.fixture
+def repositories():
+    clear_database()
+    conversations = InMemoryRepository[Conversation]("conversations")
+    conversations.save(Conversation(id="conv_1", title="Private", owner_id="user_1"))
+    conversations.save(PublicConversation(id="conv_2", title="Public", owner_id="user_1"))
+    yield conversations, InMemoryRepository[Message]("messages")
+    clear_database()
+
+
+def test_add_messages_batch_should_import_messages_across_conversations(repositories):
+    """
+    Test that a batch adds its messages in order to several conversations.
+    
+    This test verifies that imported messages keep their sender and time,
+    that conversations count them, that no response is generated when
+    processing is skipped, and that message IDs are random UUIDs.
+    """
+    conversations, messages = repositories
+    use_case = AddMessagesBatchUseCase(conversations, messages, EchoProcessor())
+    
+    result = use_case.execute([
+        NewMessageDTO(conversation_id="conv_1", content="Hi", owner_id="user_1", created_at=datetime(2023, 1, 1, 9, 0)),
+        NewMessageDTO(conversation_id="conv_2", content="Hello all", owner_id="user_2"),
+        NewMessageDTO(conversation_id="conv_1", content="Hi, how can I help?", owner_id="user_1", sender="assistant", created_at=datetime(2023, 1, 1, 9, 1))
+    ], process=False)
+    
+    assert result.added == 3 and result.responses == []
+    imported = messages.find_messages_by_conversation_id("conv_1")
+    assert [(m.sender, m.content, m.created_at) for m in imported] == [
+        ("user", "Hi", datetime(2023, 1, 1, 9, 0)),
+        ("assistant", "Hi, how can I help?", datetime(2023, 1, 1, 9, 1))
+    ]
+    assert conversations.find_by_id("conv_1").message_count == 2
+    assert conversations.find_by_id("conv_2").message_count == 1
+    assert uuid.UUID(imported[0].id.removeprefix("msg_")).version == 4
+
+
+def test_add_messages_batch_should_store_responses_after_their_message(repositories):
+    """
+    Test that processed batches store each response right after the message it answers.
+    """
+    conversations, messages = repositories
+    use_case = AddMessagesBatchUseCase(conversations, messages, EchoProcessor())
+    
+    result = use_case.execute([
+        NewMessageDTO(conversation_id="conv_1", content="One", owner_id="user_1"),
+        NewMessageDTO(conversation_id="conv_1", content="Two", owner_id="user_1")
+    ])
+    
+    assert [m.content for m in result.responses] == ["Echo: One", "Echo: Two"]
+    assert [m.content for m in messages.find_messages_by_conversation_id("conv_1")] == ["One", "Echo: One", "Two", "Echo: Two"]
+    assert conversations.find_by_id("conv_1").message_count == 4
+
+
+def test_add_messages_batch_should_add_nothing_when_a_message_is_rejected(repositories):
+    """
+    Test that a batch is rejected as a whole.
+    
+    This test verifies that no message is stored and no conversation is
+    changed when a message targets an unknown conversation or comes from
+    someone else than the owner of a private conversation, even when it
+    claims to be from the assistant.
+    """
+    conversations, messages = repositories
+    use_case = AddMessagesBatchUseCase(conversations, messages, EchoProcessor())
+    valid = NewMessageDTO(conversation_id="conv_1", content="Hi", owner_id="user_1")
+    
+    with pytest.raises(NotFoundException):
+        use_case.execute([valid, NewMessageDTO(conversation_id="conv_unknown", content="Hi", owner_id="user_1")])
+    with pytest.raises(PermissionError):
+        use_case.execute([valid, NewMessageDTO(conversation_id="conv_1", content="Hi", owner_id="user_2")])
+    with pytest.raises(PermissionError):
+        use_case.execute([valid, NewMessageDTO(conversation_id="conv_1", content="Hi", owner_id="user_2", sender="assistant")])
+    with pytest.raises(PermissionError):
+        use_case.execute([NewMessageDTO(conversation_id="conv_2", content="Hi", owner_id="user_2", sender="assistant")])
+    
+    assert messages.find_all() == []
+    assert conversations.find_by_id("conv_1").message_count == 0
+
+
+
+def test_add_messages_batch_should_limit_the_messages_responded_to(repositories):
+    """
+    Test that large batches are only accepted without processing.
+    """
+    conversations, messages = repositories
+    use_case = AddMessagesBatchUseCase(conversations, messages, EchoProcessor())
+    batch = [
+        NewMessageDTO(conversation_id="conv_1", content=f"Message {i}", owner_id="user_1")
+        for i in range(MAX_PROCESSED_MESSAGES + 1)
+    ]
+    
+    with pytest.raises(ValidationException):
+        use_case.execute(batch)
+    
+    assert messages.find_all() == []
+    assert use_case.execute(batch, process=False).added == MAX_PROCESSED_MESSAGES + 1
+
+
+
+def test_add_messages_batch_should_not_move_conversations_back_in_time(repositories):
+    """
+    Test that importing old messages keeps the latest activity of a conversation.
+    """
+    conversations, messages = repositories
+    use_case = AddMessagesBatchUseCase(conversations, messages, EchoProcessor())
+    updated_at = conversations.find_by_id("conv_1").updated_at
+    
+    use_case.execute([
+        NewMessageDTO(conversation_id="conv_1", content="Old", owner_id="user_1", created_at=datetime(2020, 1, 1)),
+        NewMessageDTO(conversation_id="conv_2", content="Old", owner_id="user_2", created_at=datetime(2020, 1, 1))
+    ], process=False)
+    
+    assert conversations.find_by_id("conv_1").updated_at == updated_at
+    assert conversations.find_by_id("conv_2").updated_at > datetime(2020, 1, 1)
+    assert [conversation.id for conversation in conversations.find_recent_conversations(2)] == ["conv_2", "conv_1"]
\ No newline at end of file
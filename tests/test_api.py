@@ -0,0 +1,175 @@
+import asyncio
+import json
+import pytest
+import re
+from typing import Any, AsyncIterator, Dict, Optional
+from fastapi.testclient import TestClient
+from api.app import create_app
+from domain.entities.message import Message
+from domain.services.abstract_message_processor import AbstractMessageProcessor
+from infrastructure.services.function_handler import FunctionHandler
+from infrastructure.database.in_memory_database import clear_database
+
+MESSAGE_ID_PATTERN = re.compile(r"msg_[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}")
+
+
+class FailingProcessor(AbstractMessageProcessor):
+    """Message processor failing after streaming the first chunk of its response."""
+    def process(self, message: Message) -> Optional[Message]:
+        raise RuntimeError("Model unavailable")
+    
+    async def process_stream(self, message: Message) -> AsyncIterator[Dict[str, Any]]:
+        yield {"type": "token", "content": "Hello "}
+        raise RuntimeError("Model unavailable")
+
+
+def read_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # The application is configured from the environment when it starts
+    for name in ["SQLITE_PATH", "JOURNAL_DIR", "MESSAGE_STORE", "AI_RESPONSE_CACHE_TTL", "OPENAI_BASE_URL"]:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("FUNCTION_BATCH_CONCURRENCY", "2")
+    clear_database()
+    with TestClient(create_app()) as client:
+        yield client
+    clear_database()
+
+
+def test_api_should_add_message_batches_with_generated_ids(client):
+    """
+    Test adding a batch of messages to several conversations through the API.
+    
+    This test verifies that the batch is stored with a distinct generated ID
+    per message, that each conversation counts its own messages, and that
+    imported messages keep their creation time.
+    """
+    first = client.post("/api/conversations/", json={"title": "Imported", "owner_id": "user_1"}).json()
+    second = client.post("/api/conversations/", json={"title": "Other", "owner_id": "user_1"}).json()
+    
+    response = client.post("/api/conversations/messages/batch", json={
+        "messages": [
+            {"conversation_id": first["id"], "content": "Hello", "owner_id": "user_1", "created_at": "2024-05-01T12:00:00"},
+            {"conversation_id": first["id"], "content": "Hi", "owner_id": "user_1", "sender": "assistant", "created_at": "2024-05-01T12:01:00"},
+            {"conversation_id": second["id"], "content": "Elsewhere", "owner_id": "user_1"}
+        ],
+        "process": False
+    })
+    
+    assert response.status_code == 200
+    assert response.json() == {"added": 3, "responses": []}
+    messages = client.get(f"/api/conversations/{first['id']}/messages").json()
+    assert [(m["content"], m["sender"], m["created_at"]) for m in messages] == [
+        ("Hello", "user", "2024-05-01T12:00:00"),
+        ("Hi", "assistant", "2024-05-01T12:01:00")
+    ]
+    other = client.get(f"/api/conversations/{second['id']}/messages").json()
+    ids = [m["id"] for m in messages + other]
+    assert len(set(ids)) == 3
+    assert all(MESSAGE_ID_PATTERN.fullmatch(id) for id in ids)
+    assert client.get(f"/api/conversations/{first['id']}").json()["message_count"] == 2
+    assert client.get(f"/api/conversations/{second['id']}").json()["message_count"] == 1
+
+
+
+def test_api_should_reject_message_batches_over_the_limits(client):
+    """
+    Test that oversized or invalid batches are rejected without storing any message.
+    
+    This test verifies the status codes and bodies for a batch longer than
+    the request limit, a batch with too many messages to respond to, and a
+    batch referring to an unknown conversation.
+    """
+    conversation = client.post("/api/conversations/", json={"title": "Imported", "owner_id": "user_1"}).json()
+    message = {"conversation_id": conversation["id"], "content": "Hello", "owner_id": "user_1"}
+    
+    too_long = client.post("/api/conversations/messages/batch", json={"messages": [message] * 10001, "process": False})
+    too_many_responses = client.post("/api/conversations/messages/batch", json={"messages": [message] * 21})
+    unknown = client.post("/api/conversations/messages/batch", json={
+        "messages": [message, {"conversation_id": "conv_missing", "content": "Hello"}],
+        "process": False
+    })
+    
+    assert too_long.status_code == 422
+    assert too_long.json()["detail"][0]["loc"] == ["body", "messages"]
+    assert too_many_responses.status_code == 400
+    assert too_many_responses.json()["detail"].startswith("At most 20 user messages can be responded to in one batch")
+    assert unknown.status_code == 404
+    assert unknown.json() == {"detail": "Conversation with ID conv_missing not found"}
+    assert client.get(f"/api/conversations/{conversation['id']}/messages").json() == []
+    assert client.get(f"/api/conversations/{conversation['id']}").json()["message_count"] == 0
+
+
+
+def test_api_should_cap_the_concurrency_of_function_batches(client):
+    """
+    Test that a function batch cannot run more calls at once than the server allows.
+    
+    This test verifies that asking for more concurrency than
+    FUNCTION_BATCH_CONCURRENCY still runs at most that many calls at once,
+    that a batch may ask for less, that results come back in order, and
+    that a non-positive limit is rejected.
+    """
+    running = 0
+    peak = 0
+    
+    async def slow_time(parameters):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return {"timezone": parameters["timezone"]}
+    
+    client.app.state.function_caller.handlers = {"get_time": FunctionHandler("get_time", slow_time)}
+    calls = [{"name": "get_time", "arguments": {"timezone": f"UTC+{i}"}} for i in range(6)]
+    
+    capped = client.post("/api/functions/call/batch", json={"calls": calls + [{"name": "unknown"}], "max_concurrency": 100})
+    
+    assert capped.status_code == 200
+    body = capped.json()
+    assert [(result["name"], result["status"]) for result in body] == [("get_time", "completed")] * 6 + [("unknown", "not_found")]
+    assert [result["call"]["result"] for result in body[:6]] == [{"timezone": f"UTC+{i}"} for i in range(6)]
+    assert body[6]["call"] is None
+    assert peak == 2
+    
+    peak = 0
+    lowered = client.post("/api/functions/call/batch", json={"calls": calls, "max_concurrency": 1})
+    
+    assert lowered.status_code == 200
+    assert peak == 1
+    assert client.post("/api/functions/call/batch", json={"calls": calls, "max_concurrency": 0}).status_code == 422
+
+
+
+def test_api_should_report_stream_failures_as_an_error_event(client):
+    """
+    Test that a response failing while it is streamed ends the stream with an error event.
+    
+    This test verifies that the stream starts with the stored user message,
+    then sends the chunks generated before the failure and a final error
+    event with the detail of the failure. It also verifies that a missing
+    conversation is reported with a 404 before streaming starts.
+    """
+    client.app.state.message_processor = FailingProcessor()
+    conversation = client.post("/api/conversations/", json={"title": "Support", "owner_id": "user_1"}).json()
+    
+    response = client.post(f"/api/conversations/{conversation['id']}/messages/stream", json={"content": "Hi", "owner_id": "user_1"})
+    missing = client.post("/api/conversations/conv_missing/messages/stream", json={"content": "Hi", "owner_id": "user_1"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = read_events(response.text)
+    assert [event for event, _ in events] == ["message", "token", "error"]
+    assert events[0][1]["message"]["content"] == "Hi"
+    assert events[2][1] == {"detail": "Internal server error: Model unavailable"}
+    assert client.get(f"/api/conversations/{conversation['id']}").json()["message_count"] == 1
+    assert missing.status_code == 404
+    assert missing.json() == {"detail": "Conversation with ID conv_missing not found"}
\ No newline at end of file
@@ -0,0 +1,59 @@
+import asyncio
+from typing import List
+from domain.services.abstract_ai_service import AbstractAIService
+from infrastructure.services.caching_ai_service import CachingAIService
+
+
+class CountingAIService(AbstractAIService):
+    """
+    AI service numbering its responses, so that cached responses can be told apart.
+    """
+    def __init__(self):
+        self.prompts: List[str] = []
+    
+    def generate_response(self, message_content: str, context=None) -> str:
+        self.prompts.append(message_content)
+        return f"response {len(self.prompts)}"
+    
+    def extract_function_calls(self, message_content, available_functions):
+        return []
+
+
+def test_caching_ai_service_should_answer_repeated_messages_from_the_cache():
+    """
+    Test that normalized repeats of a message reuse the cached response.
+    
+    This test verifies that case, spacing and trailing punctuation do not
+    defeat the cache, that messages rejected by should_cache always reach the
+    wrapped service, and that streamed responses are cached too.
+    """
+    service = CountingAIService()
+    cache = CachingAIService(service, should_cache=lambda content: "random" not in content)
+    
+    assert cache.generate_response("What time is it?") == "response 1"
+    assert cache.generate_response("  what TIME is it") == "response 1"
+    assert asyncio.run(cache.generate_response_async("What time is it?!")) == "response 1"
+    assert cache.generate_response("Tell me a random fact") == "response 2"
+    assert cache.generate_response("Tell me a random fact") == "response 3"
+    
+    async def stream(content):
+        return [chunk async for chunk in cache.stream_response(content)]
+    
+    assert asyncio.run(stream("Hello")) == ["response 4"]
+    assert asyncio.run(stream("hello.")) == ["response 4"]
+    assert cache.stats()["hits"] == 3
+
+
+def test_caching_ai_service_should_evict_entries_beyond_its_memory_bound():
+    """
+    Test that the least recently used responses are evicted when the cache is full.
+    """
+    service = CountingAIService()
+    cache = CachingAIService(service, max_bytes=400)
+    
+    for i in range(20):
+        cache.generate_response(f"message {i}")
+    
+    assert cache.stats()["bytes"] <= 400
+    assert cache.generate_response("message 19") == "response 20"
+    assert cache.generate_response("message 0") == "response 21"
\ No newline at end of file
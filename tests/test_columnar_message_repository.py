@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime, timedelta
+from domain.entities.message import Message
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories import columnar_message_repository
+from infrastructure.repositories.columnar_message_repository import ColumnarMessageRepository
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+
+def snapshot(messages):
+    return [(m.id, m.content, m.sender, m.conversation_id, m.owner_id, m.created_at) for m in messages]
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_columnar_message_repository_should_answer_like_the_in_memory_repository(monkeypatch, vectorized):
+    """
+    Test that the columnar store returns the same messages as the in-memory repository.
+    
+    This test verifies every message query after saves, updates that move
+    a message to another conversation, and deletes, including pages around
+    the moved message, both with numpy and with the pure Python filters.
+    """
+    if vectorized:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(columnar_message_repository, "NUMPY_AVAILABLE", vectorized)
+    clear_database()
+    columnar = ColumnarMessageRepository()
+    in_memory = InMemoryRepository[Message]("messages")
+    start = datetime(2024, 5, 1, 12, 0)
+    
+    for i in range(50):
+        message = Message(
+            id=f"msg_{i}",
+            content=f"Message {i} ✓",
+            sender=["user_1", "user_2", "assistant"][i % 3],
+            conversation_id=f"conv_{i % 4}",
+            owner_id="user_1" if i % 5 else None
+        )
+        # Creation times are not in insertion order
+        message.created_at = start + timedelta(minutes=(i * 7) % 50)
+        columnar.save(message)
+        in_memory.save(message)
+    for repository in [columnar, in_memory]:
+        moved = repository.find_by_id("msg_3")
+        moved.content = "Moved"
+        moved.conversation_id = "conv_0"
+        repository.save(moved)
+        for i in range(0, 50, 6):
+            repository.delete(f"msg_{i}")
+    
+    assert columnar.count() == len(in_memory.find_all()) == 41
+    assert snapshot(columnar.find_all()) == snapshot(in_memory.find_all())
+    assert columnar.find_by_id("msg_0") is None
+    for conversation_id in ["conv_0", "conv_1", "unknown"]:
+        assert snapshot(columnar.find_messages_by_conversation_id(conversation_id)) == \
+            snapshot(in_memory.find_messages_by_conversation_id(conversation_id))
+    for before, after, newest_first in [("msg_40", None, True), (None, "msg_3", False), ("msg_3", "msg_12", True), ("msg_1", None, False)]:
+        assert snapshot(columnar.find_messages_page("conv_0", 3, before, after, newest_first)) == \
+            snapshot(in_memory.find_messages_page("conv_0", 3, before, after, newest_first))
+    for sender in ["user_1", "assistant", "unknown"]:
+        assert snapshot(columnar.find_messages_by_sender(sender)) == snapshot(in_memory.find_messages_by_sender(sender))
+    for sender in [None, "user_2"]:
+        in_range = columnar.find_messages_in_time_range(start + timedelta(minutes=10), start + timedelta(minutes=30), sender)
+        assert snapshot(in_range) == \
+            snapshot(in_memory.find_messages_in_time_range(start + timedelta(minutes=10), start + timedelta(minutes=30), sender))
+        assert in_range and all(start + timedelta(minutes=10) <= m.created_at < start + timedelta(minutes=30) for m in in_range)
+    clear_database()
+
+
+def test_columnar_message_repository_should_compact_replaced_content():
+    """
+    Test that repeatedly updated messages do not grow the content buffer without bound.
+    
+    This test verifies that the contents of replaced messages are dropped
+    from the buffer and that the current contents are still read back.
+    """
+    repository = ColumnarMessageRepository()
+    message = Message(id="msg_1", content="", sender="user", conversation_id="conv_1")
+    other = Message(id="msg_2", content="unchanged", sender="user", conversation_id="conv_1")
+    repository.save(other)
+    
+    for i in range(1000):
+        message.content = f"Draft {i}"
+        repository.save(message)
+    
+    assert len(repository._content) < 100
+    assert [m.content for m in repository.find_messages_by_conversation_id("conv_1")] == ["unchanged", "Draft 999"]
\ No newline at end of file
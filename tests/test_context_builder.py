@@ -0,0 +1,184 @@
+import threading
+from domain.entities.message import Message
+from domain.services.abstract_ai_service import AbstractAIService
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+from infrastructure.services.context_builder import ContextBuilder, estimate_tokens
+from infrastructure.services.function_caller import FunctionCaller
+from infrastructure.services.message_processor import MessageProcessor
+
+
+class RecordingAIService(AbstractAIService):
+    """
+    AI service recording the context of each response.
+    """
+    def __init__(self):
+        self.contexts = []
+    
+    def generate_response(self, message_content, context=None):
+        self.contexts.append(context)
+        return f"Answer to {message_content}"
+    
+    def extract_function_calls(self, message_content, available_functions):
+        return []
+
+
+def add_turns(messages, builder, count):
+    for i in range(count):
+        message = Message(
+            id=f"msg_{i}",
+            content=f"Turn {i}: " + "word " * (i % 7),
+            sender="user" if i % 2 == 0 else "assistant",
+            conversation_id="conv_1"
+        )
+        messages.save(message)
+        builder.add(message)
+
+
+def test_context_builder_should_keep_the_latest_turns_within_the_token_budget():
+    """
+    Test that contexts hold the latest turns and a summary of the older ones within budget.
+    
+    This test verifies that the context fits in max_tokens, that it ends
+    with the turns preceding the message in order, that older turns are
+    summarized, that token counts are not computed again for turns already
+    in the window, and that a builder loading the conversation from the
+    repository builds the same context.
+    """
+    clear_database()
+    messages = InMemoryRepository[Message]("messages")
+    counted = []
+    
+    def count_tokens(text):
+        counted.append(text)
+        return estimate_tokens(text)
+    
+    builder = ContextBuilder(messages, max_tokens=200, summary_tokens=60, count_tokens=count_tokens)
+    add_turns(messages, builder, 300)
+    message = Message(id="msg_new", content="What did we decide?", sender="user", conversation_id="conv_1")
+    messages.save(message)
+    
+    counted.clear()
+    context = builder.build(message)
+    
+    assert context[0]["role"] == "system"
+    assert "Turn" in context[0]["content"]
+    assert sum(estimate_tokens(chat_message["content"]) for chat_message in context) <= 200
+    assert [chat_message["content"] for chat_message in context[-2:]] == [messages.find_by_id("msg_298").content, messages.find_by_id("msg_299").content]
+    assert context[-1]["role"] == "assistant"
+    # Only the new message and the updated summary were counted
+    assert message.content in counted and len(counted) <= 3
+    assert ContextBuilder(messages, max_tokens=200, summary_tokens=60).build(message) == context
+    clear_database()
+
+
+def test_message_processor_should_send_previous_turns_to_the_ai_service():
+    """
+    Test that responses are generated from the previous turns of the conversation.
+    
+    This test verifies that the first message is sent without previous
+    turns, and that the second one is sent with the first message and its
+    response.
+    """
+    clear_database()
+    messages = InMemoryRepository[Message]("messages")
+    ai_service = RecordingAIService()
+    processor = MessageProcessor(FunctionCaller(), ai_service, ContextBuilder(messages))
+    
+    for i, content in enumerate(["Hello there", "Tell me more"]):
+        message = Message(id=f"msg_{i}", content=content, sender="user", conversation_id="conv_1")
+        messages.save(message)
+        messages.save(processor.process(message))
+    
+    assert ai_service.contexts == [
+        [],
+        [{"role": "user", "content": "Hello there"}, {"role": "assistant", "content": "Answer to Hello there"}]
+    ]
+    clear_database()
+
+def test_context_builder_should_reload_conversations_changed_behind_its_back():
+    """
+    Test that messages stored without going through the builder are part of later contexts.
+    
+    This test verifies that messages saved in a batch after a context was
+    built are sent with the next message.
+    """
+    clear_database()
+    messages = InMemoryRepository[Message]("messages")
+    builder = ContextBuilder(messages)
+    first = Message(id="msg_1", content="First", sender="user", conversation_id="conv_1")
+    messages.save(first)
+    builder.build(first)
+    
+    messages.save_many([Message(id=f"imported_{i}", content=f"Imported {i}", sender="user", conversation_id="conv_1") for i in range(2)])
+    message = Message(id="msg_2", content="Second", sender="user", conversation_id="conv_1")
+    messages.save(message)
+    
+    assert [chat_message["content"] for chat_message in builder.build(message)] == ["First", "Imported 0", "Imported 1"]
+    clear_database()
+
+
+
+def test_context_builder_should_not_hold_up_other_conversations_while_loading_one():
+    """
+    Test that a conversation being loaded from the repository does not block the others.
+    """
+    clear_database()
+    messages = InMemoryRepository[Message]("messages")
+    loading = threading.Event()
+    release = threading.Event()
+    
+    class SlowRepository:
+        def find_messages_page(self, conversation_id, limit, **kwargs):
+            if conversation_id == "conv_slow":
+                loading.set()
+                release.wait(5)
+            return messages.find_messages_page(conversation_id, limit, **kwargs)
+    
+    builder = ContextBuilder(SlowRepository())
+    # Conversations sharing a lock are built one at a time
+    other_id = next(
+        f"conv_{i}" for i in range(1000)
+        if builder._conversation_lock(f"conv_{i}") is not builder._conversation_lock("conv_slow")
+    )
+    slow = Message(id="msg_slow", content="Slow", sender="user", conversation_id="conv_slow")
+    other = Message(id="msg_other", content="Other", sender="user", conversation_id=other_id)
+    messages.save(slow)
+    messages.save(other)
+    
+    loader = threading.Thread(target=builder.build, args=(slow,))
+    loader.start()
+    assert loading.wait(5)
+    try:
+        assert builder.build(other) == []
+    finally:
+        release.set()
+        loader.join()
+    clear_database()
+
+
+def test_context_builder_should_only_read_the_newest_turns_when_loading_a_conversation():
+    """
+    Test that loading a long conversation does not go through its whole history.
+    
+    This test verifies that a builder loading a conversation of thousands of
+    turns only counts the tokens of the turns near its end, and builds the
+    same context as a builder that saw every turn added.
+    """
+    clear_database()
+    messages = InMemoryRepository[Message]("messages")
+    builder = ContextBuilder(messages, max_tokens=200, summary_tokens=60)
+    add_turns(messages, builder, 5000)
+    message = Message(id="msg_new", content="Where were we?", sender="user", conversation_id="conv_1")
+    messages.save(message)
+    counted = []
+    
+    def count_tokens(text):
+        counted.append(text)
+        return estimate_tokens(text)
+    
+    loaded = ContextBuilder(messages, max_tokens=200, summary_tokens=60, count_tokens=count_tokens).build(message)
+    
+    assert loaded == builder.build(message)
+    assert len(counted) < 100
+    clear_database()
\ No newline at end of file
@@ -0,0 +1,158 @@
+import asyncio
+import pytest
+from domain.entities.function import Function
+from domain.value_objects.function_parameter import FunctionParameter
+from infrastructure.services.function_caller import FunctionCaller
+from infrastructure.services.function_handler import FunctionHandler
+from infrastructure.services.function_registry import FunctionRegistry
+from infrastructure.services.function_result_cache import FunctionResultCache
+
+
+def test_function_caller_should_dispatch_to_the_registered_handler():
+    """
+    Test that the caller executes the handler registered for the function name.
+    
+    This test verifies that a handler table passed to the caller is used for
+    dispatch, and that functions without a handler report an error.
+    """
+    echo = Function(
+        id="func_echo",
+        name="echo",
+        description="Echo the text",
+        parameters=[FunctionParameter(name="text", type="string", description="The text")]
+    )
+    missing = Function(id="func_missing", name="missing", description="No handler", parameters=[])
+    caller = FunctionCaller({"echo": FunctionHandler("echo", lambda parameters: {"text": parameters["text"]})})
+    
+    assert caller.call_function(echo, {"text": "hi"}).result == {"text": "hi"}
+    assert caller.call_function(missing, {}).result == {"error": "Function not implemented: missing"}
+
+
+def test_function_caller_should_run_builtin_calculate_operations():
+    """
+    Test the built-in calculate handler through the default handler table.
+    """
+    caller = FunctionCaller()
+    calculate = FunctionRegistry.get_function_by_name("calculate")
+    
+    assert caller.call_function(calculate, {"operation": "multiply", "a": 6, "b": 7}).result == {"result": 42}
+    assert caller.call_function(calculate, {"operation": "divide", "a": 1, "b": 0}).result == {"error": "Division by zero"}
+    assert caller.call_function(calculate, {"operation": "modulo", "a": 1, "b": 2}).result == {"error": "Unknown operation: modulo"}
+    assert caller.call_function(calculate, {"operation": "add", "a": 5}).result == {"error": "Two numbers are required"}
+
+
+
+def test_function_caller_should_fail_async_calls_that_exceed_their_timeout():
+    """
+    Test that the asynchronous path enforces the handler timeout.
+    
+    This test verifies that an async handler slower than its timeout produces
+    a failed call, while a fast one completes.
+    """
+    async def slow(parameters):
+        await asyncio.sleep(parameters["delay"])
+        return {"done": True}
+    
+    function = Function(
+        id="func_slow",
+        name="slow",
+        description="Sleep for a while",
+        parameters=[FunctionParameter(name="delay", type="number", description="Seconds to sleep")]
+    )
+    caller = FunctionCaller({"slow": FunctionHandler("slow", slow, timeout=0.05)})
+    
+    completed = asyncio.run(caller.call_function_async(function, {"delay": 0}))
+    timed_out = asyncio.run(caller.call_function_async(function, {"delay": 1}))
+    
+    assert completed.is_completed() and completed.result == {"done": True}
+    assert timed_out.is_failed() and timed_out.result == {"error": "Function 'slow' timed out"}
+
+
+
+def test_function_caller_should_reuse_cached_results_of_cacheable_functions():
+    """
+    Test that cacheable handlers run once per distinct parameters.
+    
+    This test verifies that parameters in a different order hit the cached
+    result, that the least recently used result is evicted when the cache is
+    full, and that the counters record hits and misses.
+    """
+    calls = []
+    
+    def lookup(parameters):
+        calls.append(parameters)
+        return {"value": parameters["a"] + parameters["b"]}
+    
+    function = Function(
+        id="func_lookup",
+        name="lookup",
+        description="Look up a value",
+        parameters=[
+            FunctionParameter(name="a", type="number", description="The first key"),
+            FunctionParameter(name="b", type="number", description="The second key")
+        ]
+    )
+    cache = FunctionResultCache(max_size=2)
+    caller = FunctionCaller({"lookup": FunctionHandler("lookup", lookup, cacheable=True)}, cache=cache)
+    
+    assert caller.call_function(function, {"a": 1, "b": 2}).result == {"value": 3}
+    assert caller.call_function(function, {"b": 2, "a": 1}).result == {"value": 3}
+    assert asyncio.run(caller.call_function_async(function, {"a": 1, "b": 2})).result == {"value": 3}
+    assert len(calls) == 1
+    
+    caller.call_function(function, {"a": 2, "b": 2})
+    caller.call_function(function, {"a": 3, "b": 2})
+    caller.call_function(function, {"a": 1, "b": 2})
+    
+    assert len(calls) == 4
+    assert cache.stats() == {"hits": 2, "misses": 4, "size": 2}
+
+
+def test_function_caller_should_run_batches_concurrently_within_the_limit():
+    """
+    Test that a batch of calls runs concurrently, in order, within its limit.
+    
+    This test verifies that results come back in the order of the calls,
+    that no more calls than allowed run at once, even when a batch asks for
+    more, and that invalid calls fail without running their handler.
+    """
+    running = 0
+    peak = 0
+    started = []
+    
+    async def echo(parameters):
+        nonlocal running, peak
+        started.append(parameters["value"])
+        running += 1
+        peak = max(peak, running)
+        # Later calls finish first, so completion order differs from call order
+        await asyncio.sleep(0.01 * (10 - parameters["value"]))
+        running -= 1
+        return {"value": parameters["value"]}
+    
+    function = Function(
+        id="func_echo",
+        name="echo",
+        description="Echo a value",
+        parameters=[FunctionParameter(name="value", type="number", description="The value to echo")]
+    )
+    caller = FunctionCaller({"echo": FunctionHandler("echo", echo)}, max_concurrency=3)
+    calls = [(function, {"value": value}) for value in range(8)] + [(function, {})]
+    
+    results = asyncio.run(caller.call_functions_async(calls))
+    
+    assert [result.result for result in results[:8]] == [{"value": value} for value in range(8)]
+    assert all(result.is_completed() for result in results[:8])
+    assert results[8].is_failed()
+    assert peak == 3
+    assert sorted(started) == list(range(8))
+    
+    peak = 0
+    asyncio.run(caller.call_functions_async(calls[:4], max_concurrency=1))
+    
+    assert peak == 1
+    
+    peak = 0
+    asyncio.run(caller.call_functions_async(calls[:8], max_concurrency=100))
+    
+    assert peak == 3
\ No newline at end of file
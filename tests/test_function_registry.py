@@ -0,0 +1,25 @@
+import pytest
+from infrastructure.services.function_registry import FunctionRegistry
+
+
+def test_registry_should_return_the_same_functions_on_every_call():
+    """
+    Test that registered functions are built once and keep stable IDs.
+    
+    This test verifies that listing functions and looking them up by name
+    return the same Function instances every time.
+    """
+    first = FunctionRegistry.get_available_functions()
+    second = FunctionRegistry.get_available_functions()
+    
+    assert [f.id for f in first] == [f.id for f in second]
+    assert FunctionRegistry.get_function_by_name("calculate") is first[2]
+    assert FunctionRegistry.get_function_by_name("unknown") is None
+
+
+def test_registry_should_reject_duplicate_function_names():
+    """
+    Test that a function name cannot be registered twice.
+    """
+    with pytest.raises(ValueError):
+        FunctionRegistry.register(name="get_weather", description="Duplicate")
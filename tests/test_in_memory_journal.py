@@ -0,0 +1,120 @@
+import pytest
+import threading
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from infrastructure.database.in_memory_database import clear_database, set_journal
+from infrastructure.database.in_memory_journal import InMemoryJournal, LOG_FILE
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    clear_database()
+    yield
+    set_journal(None)
+    clear_database()
+
+
+def test_journal_should_restore_the_database_from_snapshot_and_log(tmp_path):
+    """
+    Test that the database is rebuilt from a snapshot and the writes logged after it.
+    
+    This test verifies that writes made after the last snapshot are replayed,
+    including deletes, that conversations get their messages back, and that a
+    record torn by a crash is ignored.
+    """
+    directory = str(tmp_path)
+    journal = InMemoryJournal(directory, synchronous_commit=True, snapshot_interval=None)
+    journal.open()
+    conversations = InMemoryRepository[Conversation]("conversations")
+    messages = InMemoryRepository[Message]("messages")
+    
+    conversation = Conversation(id="conv_1", title="Before snapshot", owner_id="user_1")
+    conversations.save(conversation)
+    journal.snapshot()
+    
+    for id in ["msg_1", "msg_2", "msg_3"]:
+        message = Message(id=id, content=id, sender="user", conversation_id="conv_1", owner_id="user_1")
+        messages.save(message)
+        conversation.add_message(message)
+        conversations.save(conversation)
+    messages.delete("msg_2")
+    # Stop without a final snapshot, as if the process had died
+    journal.close(snapshot=False)
+    clear_database()
+    
+    with open(tmp_path / LOG_FILE, "ab") as log:
+        log.write(b"\x10\x00\x00\x00torn")
+    
+    reopened = InMemoryJournal(directory, snapshot_interval=None)
+    reopened.open()
+    restored = InMemoryRepository[Conversation]("conversations").find_by_id("conv_1")
+    reopened.close()
+    
+    assert [m.id for m in InMemoryRepository[Message]("messages").find_all()] == ["msg_1", "msg_3"]
+    assert restored.message_count == 3
+    assert restored.title == "Before snapshot"
+
+
+
+def test_journal_should_accept_writes_while_a_snapshot_is_written(tmp_path):
+    """
+    Test that writes are not blocked by a snapshot being written, and are not lost.
+    
+    This test verifies that a write made while the snapshot is written
+    returns without waiting for it and is restored after a restart, that
+    the snapshot holds the entities as they were when it was taken, and that
+    no write is lost when a snapshot fails or the process stops while one is
+    written.
+    """
+    directory = str(tmp_path)
+    journal = InMemoryJournal(directory, synchronous_commit=True, snapshot_interval=None)
+    journal.open()
+    messages = InMemoryRepository[Message]("messages")
+    messages.save(Message(id="msg_1", content="Before", sender="user", conversation_id="conv_1"))
+    
+    write_snapshot = journal._write_snapshot
+    
+    def write_snapshot_with_concurrent_write(data):
+        # Not saved, so not in the snapshot taken before
+        messages.find_by_id("msg_1").content = "Changed in place"
+        writer = threading.Thread(target=messages.save, args=(
+            Message(id="msg_2", content="During", sender="user", conversation_id="conv_1"),
+        ))
+        writer.start()
+        writer.join(timeout=5)
+        assert not writer.is_alive()
+        write_snapshot(data)
+    
+    journal._write_snapshot = write_snapshot_with_concurrent_write
+    journal.snapshot()
+    
+    def crash(data):
+        raise OSError("Disk full")
+    
+    messages.save(Message(id="msg_3", content="After", sender="user", conversation_id="conv_1"))
+    journal._write_snapshot = crash
+    with pytest.raises(OSError):
+        journal.snapshot()
+    messages.save(Message(id="msg_4", content="After the failure", sender="user", conversation_id="conv_1"))
+    
+    # Stop while a snapshot is written, as if the process had died
+    def stop(data):
+        messages.save(Message(id="msg_5", content="During the crash", sender="user", conversation_id="conv_1"))
+        raise SystemExit()
+    
+    journal._write_snapshot = stop
+    journal._merge_logs = lambda: None
+    with pytest.raises(SystemExit):
+        journal.snapshot()
+    journal.close(snapshot=False)
+    clear_database()
+    assert (tmp_path / "journal.log.1").exists()
+    
+    reopened = InMemoryJournal(directory, snapshot_interval=None)
+    reopened.open()
+    reopened.close(snapshot=False)
+    
+    assert [m.id for m in messages.find_messages_by_conversation_id("conv_1")] == ["msg_1", "msg_2", "msg_3", "msg_4", "msg_5"]
+    assert messages.find_by_id("msg_1").content == "Before"
+    assert not (tmp_path / "journal.log.1").exists()
\ No newline at end of file
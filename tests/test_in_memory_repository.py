@@ -0,0 +1,180 @@
+import pytest
+import sys
+import threading
+from datetime import datetime, timedelta
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    clear_database()
+    yield
+    clear_database()
+
+
+def make_message(id: str, content: str = "hello") -> Message:
+    return Message(id=id, content=content, sender="user", conversation_id="conv_1")
+
+
+def test_repository_should_update_in_place_and_preserve_insertion_order():
+    """
+    Test that saving an existing entity replaces it without moving it.
+    
+    This test verifies that find_all returns entities in the order they were
+    first saved, and that re-saving an entity updates the stored instance.
+    """
+    repository = InMemoryRepository[Message]("messages")
+    for id in ["msg_1", "msg_2", "msg_3"]:
+        repository.save(make_message(id))
+    
+    repository.save(make_message("msg_2", content="edited"))
+    
+    assert [message.id for message in repository.find_all()] == ["msg_1", "msg_2", "msg_3"]
+    assert repository.find_by_id("msg_2").content == "edited"
+
+
+def test_repository_should_delete_by_id():
+    """
+    Test that deleting an entity removes it and ignores unknown IDs.
+    """
+    repository = InMemoryRepository[Message]("messages")
+    repository.save(make_message("msg_1"))
+    
+    repository.delete("msg_1")
+    repository.delete("msg_unknown")
+    
+    assert repository.find_by_id("msg_1") is None
+    assert repository.find_all() == []
+
+
+def test_repository_should_keep_message_indexes_consistent_on_save_and_delete():
+    """
+    Test that conversation and sender queries follow updates and deletes.
+    
+    This test verifies that moving a message to another conversation and
+    deleting a message are reflected by the secondary indexes.
+    """
+    repository = InMemoryRepository[Message]("messages")
+    for id in ["msg_1", "msg_2", "msg_3"]:
+        repository.save(make_message(id))
+    
+    moved = repository.find_by_id("msg_2")
+    moved.conversation_id = "conv_2"
+    repository.save(moved)
+    repository.delete("msg_3")
+    
+    assert [m.id for m in repository.find_messages_by_conversation_id("conv_1")] == ["msg_1"]
+    assert [m.id for m in repository.find_messages_by_conversation_id("conv_2")] == ["msg_2"]
+    assert [m.id for m in repository.find_messages_by_sender("user")] == ["msg_1", "msg_2"]
+
+
+
+def test_repository_should_return_recent_conversations_by_last_activity():
+    """
+    Test that recent conversations are ordered by last activity and can be paged.
+    
+    This test verifies that saving a conversation after new activity moves it
+    to the front, and that the before position resumes after a page.
+    """
+    repository = InMemoryRepository[Conversation]("conversations")
+    start = datetime(2025, 1, 1)
+    for i in range(4):
+        conversation = Conversation(id=f"conv_{i}", title=f"Conversation {i}", owner_id="user_1")
+        conversation.updated_at = start + timedelta(minutes=i)
+        repository.save(conversation)
+    
+    oldest = repository.find_by_id("conv_0")
+    oldest.updated_at = start + timedelta(hours=1)
+    repository.save(oldest)
+    
+    first_page = repository.find_recent_conversations(limit=2)
+    last = first_page[-1]
+    second_page = repository.find_recent_conversations(limit=2, before=(last.updated_at, last.id))
+    
+    assert [c.id for c in first_page] == ["conv_0", "conv_3"]
+    assert [c.id for c in second_page] == ["conv_2", "conv_1"]
+
+
+def test_repository_should_rank_title_search_results():
+    """
+    Test that title search matches every query word, including as a prefix.
+    
+    This test verifies that exact word matches rank above prefix matches,
+    that entities missing a query word are excluded, and that results can
+    be paged with an offset.
+    """
+    repository = InMemoryRepository[Conversation]("conversations")
+    titles = ["Planning meeting", "Planner review", "Budget meeting", "Weekly plan"]
+    for i, title in enumerate(titles):
+        repository.save(Conversation(id=f"conv_{i}", title=title, owner_id="user_1"))
+    
+    assert [c.title for c in repository.search_conversations("plan")] == [
+        "Weekly plan", "Planner review", "Planning meeting"
+    ]
+    assert [c.title for c in repository.search_conversations("meeting plan")] == ["Planning meeting"]
+    assert [c.title for c in repository.search_conversations("plan", limit=1, offset=1)] == ["Planner review"]
+    assert repository.find_conversations_by_title("unknown") == []
+
+
+
+def test_repository_should_not_lose_updates_under_concurrent_writers_and_readers():
+    """
+    Test the repository under many threads writing and reading at once.
+    
+    This test verifies that every message saved by concurrent writers is
+    stored and indexed exactly once, that conversations updated concurrently
+    appear once in the recency index, and that readers never fail on a
+    collection changing under them.
+    """
+    messages = InMemoryRepository[Message]("messages")
+    conversations = InMemoryRepository[Conversation]("conversations")
+    writers, messages_per_writer = 8, 300
+    start = datetime(2025, 1, 1)
+    stop_reading = threading.Event()
+    errors = []
+    
+    for i in range(10):
+        conversations.save(Conversation(id=f"conv_{i}", title=f"Conversation {i}", owner_id="user_1"))
+    
+    def write(writer):
+        try:
+            for i in range(messages_per_writer):
+                conversation = conversations.find_by_id(f"conv_{i % 10}")
+                messages.save(Message(id=f"msg_{writer}_{i}", content="hi", sender="user", conversation_id=conversation.id))
+                conversation.updated_at = start + timedelta(microseconds=writer * messages_per_writer + i)
+                conversations.save(conversation)
+        except Exception as e:
+            errors.append(e)
+    
+    def read():
+        try:
+            while not stop_reading.is_set():
+                messages.find_all()
+                messages.find_messages_by_conversation_id("conv_0")
+                conversations.find_recent_conversations(limit=5)
+                conversations.search_conversations("conversation")
+        except Exception as e:
+            errors.append(e)
+    
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        threads = [threading.Thread(target=write, args=(writer,)) for writer in range(writers)]
+        for thread in readers + threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stop_reading.set()
+        for thread in readers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    
+    assert errors == []
+    assert len(messages.find_all()) == writers * messages_per_writer
+    assert sum(len(messages.find_messages_by_conversation_id(f"conv_{i}")) for i in range(10)) == writers * messages_per_writer
+    assert sorted(c.id for c in conversations.find_recent_conversations(limit=100)) == sorted(f"conv_{i}" for i in range(10))
@@ -0,0 +1,49 @@
+from domain.entities.message import Message
+from infrastructure.services.function_registry import FunctionRegistry
+from infrastructure.services.intent_classifier import get_intent_classifier
+from infrastructure.services.openai_service import OpenAIService
+
+
+def test_intent_classifier_should_classify_many_messages_in_order():
+    """
+    Test that bulk classification matches classifying each message on its own.
+    
+    This test verifies that classify_many returns the intent and the requested
+    functions of every message, in the order of the input, and that
+    Message.process_content agrees with it.
+    """
+    texts = [
+        "What's the weather in Paris and the time in Tokyo?",
+        "Tell me a story about dragons",
+        "Please run the report",
+        "What is 3 times 4?"
+    ]
+    
+    classifications = get_intent_classifier().classify_many(texts)
+    
+    assert classifications == [get_intent_classifier().classify(text) for text in texts]
+    assert [c["intent"] for c in classifications] == ["function_call", "question", "function_call", "function_call"]
+    assert classifications[0]["functions"] == ["get_weather", "get_time"]
+    assert classifications[2]["functions"] == []
+    assert classifications[3]["functions"] == ["calculate"]
+    assert Message("msg_1", texts[1], "user", "conv_1").process_content() == {"intent": "question"}
+
+
+
+def test_function_call_extraction_should_only_treat_operators_between_numbers_as_calculations():
+    """
+    Test that arithmetic symbols only ask for a calculation between two numbers.
+    
+    This test verifies that slashes and dashes in time zones and place names
+    do not add a calculate call, that expressions are calculated with their
+    own operands, and that operands missing from a message are not made up.
+    """
+    service = OpenAIService(api_key="mock-api-key")
+    
+    def extract(text):
+        return service.extract_function_calls(text, FunctionRegistry.get_available_functions())
+    
+    assert [call["name"] for call in extract("What time is it in America/New_York?")] == ["get_time"]
+    assert [call["name"] for call in extract("weather in Winston-Salem please")] == ["get_weather"]
+    assert extract("what is 12 / 4") == [{"name": "calculate", "arguments": {"operation": "divide", "a": 12, "b": 4}}]
+    assert extract("add 5") == [{"name": "calculate", "arguments": {"operation": "add", "a": 5}}]
\ No newline at end of file
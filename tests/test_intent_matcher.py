@@ -0,0 +1,20 @@
+from infrastructure.services.intent_matcher import IntentMatcher
+
+
+def test_intent_matcher_should_match_whole_words_and_phrases_in_order():
+    """
+    Test that triggers only match whole words or phrases.
+    
+    This test verifies that intents are returned in the order of their first
+    trigger in the text, and that a word merely containing a trigger does
+    not match.
+    """
+    matcher = IntentMatcher({
+        "time": ["time", "what time"],
+        "weather": ["weather", "forecast"],
+        "calculate": ["divided by", "+"]
+    })
+    
+    assert matcher.match("Forecast for Paris, and what TIME is it?") == ["weather", "time"]
+    assert matcher.match("Three times two, divided up") == []
+    assert matcher.match("4 divided by 2 or 1+1") == ["calculate"]
\ No newline at end of file
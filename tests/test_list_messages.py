@@ -0,0 +1,98 @@
+import pytest
+from domain.entities.conversation import Conversation
+from domain.entities.message import Message
+from application.exceptions import ValidationException
+from application.features.conversation.use_cases.get_conversation import GetConversationUseCase
+from application.features.conversation.use_cases.list_messages import ListMessagesUseCase
+from infrastructure.database.in_memory_database import clear_database
+from infrastructure.database.sqlite_database import SqliteDatabase
+from infrastructure.repositories.columnar_message_repository import ColumnarMessageRepository
+from infrastructure.repositories.in_memory_repository import InMemoryRepository
+from infrastructure.repositories.sqlite_repository import SqliteRepository
+
+
+@pytest.fixture(params=["in_memory", "sqlite", "columnar"])
+def repositories(request, tmp_path):
+    clear_database()
+    if request.param == "sqlite":
+        database = SqliteDatabase(str(tmp_path / "assistant.db"))
+        yield SqliteRepository[Conversation]("conversations", database), SqliteRepository[Message]("messages", database)
+        database.close()
+    else:
+        messages = ColumnarMessageRepository() if request.param == "columnar" else InMemoryRepository[Message]("messages")
+        yield InMemoryRepository[Conversation]("conversations"), messages
+    clear_database()
+
+
+def test_list_messages_should_return_windows_around_cursors(repositories):
+    """
+    Test that message windows are selected by the repository around message IDs.
+    
+    This test verifies forward and newest-first windows with before and
+    after cursors on every repository, that messages of other conversations
+    are never part of a window, and that cursors from another conversation
+    or a before cursor that does not come after the after cursor are
+    rejected.
+    """
+    conversations, messages = repositories
+    conversation = Conversation(id="conv_1", title="Support", owner_id="user_1")
+    conversations.save(conversation)
+    conversations.save(Conversation(id="conv_2", title="Other", owner_id="user_1"))
+    for i in range(10):
+        messages.save(Message(id=f"msg_{i}", content=f"Message {i}", sender="user_1", conversation_id="conv_1"))
+        messages.save(Message(id=f"other_{i}", content="Other", sender="user_1", conversation_id="conv_2"))
+    use_case = ListMessagesUseCase(conversations, messages)
+    
+    def ids(**kwargs):
+        return [message.id for message in use_case.execute("conv_1", **kwargs)]
+    
+    assert ids(limit=3) == ["msg_0", "msg_1", "msg_2"]
+    assert ids(limit=3, after="msg_2") == ["msg_3", "msg_4", "msg_5"]
+    assert ids(limit=3, newest_first=True) == ["msg_9", "msg_8", "msg_7"]
+    assert ids(limit=3, before="msg_7", newest_first=True) == ["msg_6", "msg_5", "msg_4"]
+    assert ids(limit=3, before="msg_2") == ["msg_0", "msg_1"]
+    assert ids(limit=10, after="msg_3", before="msg_6") == ["msg_4", "msg_5"]
+    assert ids(limit=10, after="msg_9") == []
+    assert ids(limit=10, after="msg_3", before="msg_4", newest_first=True) == []
+    with pytest.raises(ValidationException):
+        use_case.execute("conv_1", after="other_3")
+    for after, before in [("msg_6", "msg_3"), ("msg_4", "msg_4")]:
+        with pytest.raises(ValidationException):
+            use_case.execute("conv_1", after=after, before=before)
+
+
+
+def test_conversation_should_read_its_messages_from_the_repository_in_use(repositories):
+    """
+    Test that conversations read their messages from the repository they are given.
+    """
+    conversations, messages = repositories
+    conversation = Conversation(id="conv_1", title="Support", owner_id="user_1")
+    conversations.save(conversation)
+    for i in range(3):
+        messages.save(Message(id=f"msg_{i}", content=f"Message {i}", sender="user_1", conversation_id="conv_1"))
+    messages.save(Message(id="other_0", content="Other", sender="user_1", conversation_id="conv_2"))
+    
+    assert [message.id for message in conversation.get_messages(messages)] == ["msg_0", "msg_1", "msg_2"]
+
+
+def test_get_conversation_should_only_include_the_latest_messages_asked_for(repositories):
+    """
+    Test that conversations are returned without their messages by default.
+    
+    This test verifies that the message count is always returned and that
+    the latest messages, when asked for, are in the order they were added.
+    """
+    conversations, messages = repositories
+    conversation = Conversation(id="conv_1", title="Support", owner_id="user_1")
+    for i in range(5):
+        message = Message(id=f"msg_{i}", content=f"Message {i}", sender="user_1", conversation_id="conv_1")
+        conversation.message_count += 1
+        messages.save(message)
+    conversations.save(conversation)
+    use_case = GetConversationUseCase(conversations, messages)
+    
+    conversation_dto = use_case.execute("conv_1")
+    assert conversation_dto.messages == []
+    assert conversation_dto.message_count == 5
+    assert [message.id for message in use_case.execute("conv_1", message_limit=2).messages] == ["msg_3", "msg_4"]
\ No newline at end of file
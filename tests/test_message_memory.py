@@ -0,0 +1,48 @@
+import gc
+import json
+import random
+import tracemalloc
+from domain.entities.message import Message
+
+
+def build_corpus(size: int) -> list:
+    """
+    Build messages the way requests do, from freshly decoded JSON payloads.
+    """
+    rng = random.Random(42)
+    words = ["what", "is", "the", "weather", "in", "paris", "time", "tokyo", "please", "calculate", "thanks", "hello"]
+    messages = []
+    for i in range(size):
+        payload = json.loads(json.dumps({
+            "id": f"msg_{i:08d}-5f0c-4b7e-9d2c-6a1b3c4d5e6f",
+            "content": " ".join(rng.choices(words, k=10)),
+            "sender": "user" if i % 2 == 0 else "assistant",
+            "conversation_id": f"conv_{i % 100:08d}-5f0c-4b7e-9d2c-6a1b3c4d5e6f",
+            "owner_id": f"user_{i % 10}"
+        }))
+        messages.append(Message(**payload))
+    return messages
+
+
+def test_message_should_stay_compact_for_a_realistic_corpus():
+    """
+    Test the memory used per message for a corpus of realistic messages.
+    
+    This test verifies that messages carry no per-instance dictionary and
+    that sender, owner and conversation IDs repeated across messages are
+    shared, keeping each message, content included, under 350 bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        messages = build_corpus(10_000)
+        gc.collect()
+        bytes_per_message = (tracemalloc.get_traced_memory()[0] - before) / len(messages)
+    finally:
+        tracemalloc.stop()
+    
+    assert not hasattr(messages[0], "__dict__")
+    assert messages[0].conversation_id is messages[100].conversation_id
+    assert messages[1].owner_id is messages[11].owner_id
+    assert bytes_per_message < 350
\ No newline at end of file
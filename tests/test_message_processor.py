@@ -0,0 +1,68 @@
+import asyncio
+import time
+import pytest
+from domain.entities.message import Message
+from infrastructure.services.function_caller import FunctionCaller
+from infrastructure.services.function_handler import FunctionHandler
+from infrastructure.services.message_processor import MessageProcessor
+
+
+def test_message_processor_should_run_multiple_function_calls_concurrently():
+    """
+    Test that a message asking for several functions calls them all at once.
+    
+    This test verifies that both requested functions are called, that their
+    results are combined into one response, and that the total latency is
+    close to the slowest call rather than the sum of both.
+    """
+    async def slow_weather(parameters):
+        await asyncio.sleep(0.2)
+        return {"location": parameters["location"]}
+    
+    async def slow_time(parameters):
+        await asyncio.sleep(0.2)
+        return {"timezone": parameters["timezone"]}
+    
+    caller = FunctionCaller({
+        "get_weather": FunctionHandler("get_weather", slow_weather),
+        "get_time": FunctionHandler("get_time", slow_time)
+    })
+    processor = MessageProcessor(caller)
+    message = Message(
+        id="msg_1",
+        content="What's the weather in Paris and the time in Tokyo?",
+        sender="user",
+        conversation_id="conv_1"
+    )
+    
+    start = time.perf_counter()
+    response = asyncio.run(processor.process_async(message))
+    elapsed = time.perf_counter() - start
+    
+    assert response.content.splitlines() == [
+        "I called the function 'get_weather' and got this result: {'location': 'paris'}",
+        "I called the function 'get_time' and got this result: {'timezone': 'tokyo'}"
+    ]
+    assert elapsed < 0.35
+
+
+def test_message_processor_should_stream_tokens_before_the_response():
+    """
+    Test that a streamed response is reported chunk by chunk.
+    
+    This test verifies that the response is produced as several token
+    events, that together they form the content of the final response
+    message, and that the response event comes last.
+    """
+    processor = MessageProcessor(FunctionCaller())
+    message = Message(id="msg_1", content="Hello there", sender="user", conversation_id="conv_1")
+    
+    async def collect():
+        return [event async for event in processor.process_stream(message)]
+    
+    events = asyncio.run(collect())
+    tokens = [event["content"] for event in events if event["type"] == "token"]
+    
+    assert len(tokens) > 1
+    assert events[-1]["type"] == "response"
+    assert events[-1]["message"].content == "".join(tokens)
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from infrastructure.services.openai_service import OpenAIService
+
+
+class StubCompletionsHandler(BaseHTTPRequestHandler):
+    """
+    Minimal OpenAI-compatible chat completions endpoint recording the client connections it serves.
+    """
+    protocol_version = "HTTP/1.1"
+    
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.connections.add(self.client_address)
+        
+        body = json.dumps({
+            "choices": [{"message": {"role": "assistant", "content": f"echo: {request['messages'][-1]['content']}"}}]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubCompletionsHandler)
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_openai_service_should_reuse_connections_across_requests(stub_server):
+    """
+    Test that the service keeps its HTTP connection open between requests.
+    
+    This test verifies that several sequential responses generated against a
+    local stub API are all served over a single pooled connection.
+    """
+    host, port = stub_server.server_address
+    
+    async def generate_responses():
+        service = OpenAIService(api_key="test-key", base_url=f"http://{host}:{port}")
+        try:
+            return [await service.generate_response_async(f"message {i}") for i in range(5)]
+        finally:
+            await service.aclose()
+    
+    responses = asyncio.run(generate_responses())
+    
+    assert responses == [f"echo: message {i}" for i in range(5)]
+    assert len(stub_server.connections) == 1
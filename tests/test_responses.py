@@ -0,0 +1,30 @@
+import json
+from datetime import datetime
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from api.responses import PydanticJSONResponse
+from application.features.conversation.dtos import ConversationDTO, MessageDTO
+
+
+def test_pydantic_json_response_should_encode_like_the_response_model():
+    """
+    Test that the fast responses hold the same JSON as responses encoded from the response model.
+    
+    This test verifies message lists and conversations, including
+    non-ASCII content, quotes and timestamps.
+    """
+    message = MessageDTO(
+        id="msg_1",
+        content='Café "au lait" ☕',
+        sender="user",
+        conversation_id="conv_1",
+        created_at=datetime(2024, 5, 1, 12, 30, 15, 250)
+    )
+    conversation = ConversationDTO(id="conv_1", title="Orders", owner_id="user_1", messages=[message])
+    
+    body = PydanticJSONResponse([message], TypeAdapter(List[MessageDTO])).body
+    
+    assert json.loads(body) == jsonable_encoder([message])
+    assert json.loads(PydanticJSONResponse(conversation).body) == jsonable_encoder(conversation)
+    assert "Café".encode() in body
\ No newline at end of file
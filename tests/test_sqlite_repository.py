@@ -0,0 +1,151 @@
+import pytest
+import sqlite3
+from datetime import datetime, timedelta
+from domain.entities.conversation import Conversation, PublicConversation
+from domain.entities.message import Message
+from infrastructure.database.sqlite_database import SqliteDatabase
+from infrastructure.repositories.sqlite_repository import SqliteRepository
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SqliteDatabase(str(tmp_path / "assistant.db"))
+    yield database
+    database.close()
+
+
+def test_sqlite_repository_should_persist_entities_across_connections(tmp_path):
+    """
+    Test that saved entities survive reopening the database file.
+    
+    This test verifies that messages written in a transaction are read back
+    in the order they were first saved, that updates keep that order, and
+    that conversations keep their type and timestamps.
+    """
+    path = str(tmp_path / "assistant.db")
+    database = SqliteDatabase(path)
+    messages = SqliteRepository[Message]("messages", database)
+    conversations = SqliteRepository[Conversation]("conversations", database)
+    
+    conversation = PublicConversation(id="conv_1", title="Weekly planning", owner_id="user_1")
+    conversations.save(conversation)
+    with database.transaction():
+        for id in ["msg_1", "msg_2", "msg_3"]:
+            messages.save(Message(id=id, content="hello", sender="user", conversation_id="conv_1"))
+    messages.save(Message(id="msg_2", content="edited", sender="assistant", conversation_id="conv_1"))
+    messages.delete("msg_3")
+    database.close()
+    
+    reopened = SqliteDatabase(path)
+    messages = SqliteRepository[Message]("messages", reopened)
+    loaded = SqliteRepository[Conversation]("conversations", reopened).find_by_id("conv_1")
+    
+    assert [m.id for m in messages.find_messages_by_conversation_id("conv_1")] == ["msg_1", "msg_2"]
+    assert [m.id for m in messages.find_messages_by_sender("assistant")] == ["msg_2"]
+    assert messages.find_by_id("msg_2").content == "edited"
+    assert isinstance(loaded, PublicConversation)
+    assert loaded.updated_at == conversation.updated_at
+    reopened.close()
+
+
+def test_sqlite_repository_should_page_recent_conversations_and_rank_title_search(database):
+    """
+    Test recent conversation paging and title search against SQLite.
+    
+    This test verifies the same ordering as the in-memory repository: most
+    recent activity first with a resumable position, and exact title word
+    matches ranked above prefix matches.
+    """
+    repository = SqliteRepository[Conversation]("conversations", database)
+    start = datetime(2025, 1, 1)
+    titles = ["Planning meeting", "Planner review", "Budget meeting", "Weekly plan"]
+    for i, title in enumerate(titles):
+        conversation = Conversation(id=f"conv_{i}", title=title, owner_id="user_1")
+        conversation.updated_at = start + timedelta(minutes=i)
+        repository.save(conversation)
+    
+    oldest = repository.find_by_id("conv_0")
+    oldest.updated_at = start + timedelta(hours=1)
+    repository.save(oldest)
+    
+    first_page = repository.find_recent_conversations(limit=2)
+    last = first_page[-1]
+    second_page = repository.find_recent_conversations(limit=2, before=(last.updated_at, last.id))
+    
+    assert [c.id for c in first_page] == ["conv_0", "conv_3"]
+    assert [c.id for c in second_page] == ["conv_2", "conv_1"]
+    # Equally relevant prefix matches are ordered by last activity
+    assert [c.title for c in repository.search_conversations("plan")] == [
+        "Weekly plan", "Planning meeting", "Planner review"
+    ]
+    assert [c.title for c in repository.search_conversations("meeting plan")] == ["Planning meeting"]
+    assert repository.find_conversations_by_title("unknown") == []
+    assert len(repository.find_conversations_by_owner_id("user_1")) == 4
+
+
+
+def test_sqlite_database_should_migrate_databases_created_with_an_older_schema(tmp_path):
+    """
+    Test that opening a database without message counts adds and fills them.
+    
+    This test verifies that conversations of a database created before
+    conversations counted their messages get the count of their stored
+    messages, and can be saved again.
+    """
+    path = str(tmp_path / "assistant.db")
+    database = SqliteDatabase(path)
+    SqliteRepository[Conversation]("conversations", database).save(Conversation(id="conv_1", title="Old", owner_id="user_1"))
+    messages = SqliteRepository[Message]("messages", database)
+    messages.save(Message(id="msg_1", content="Hi", sender="user", conversation_id="conv_1"))
+    messages.save(Message(id="msg_2", content="Hello", sender="assistant", conversation_id="conv_1"))
+    database.close()
+    
+    # Bring the file back to the schema of databases created before versions were recorded
+    connection = sqlite3.connect(path)
+    connection.executescript("ALTER TABLE conversations DROP COLUMN message_count; PRAGMA user_version = 0;")
+    connection.close()
+    
+    database = SqliteDatabase(path)
+    conversations = SqliteRepository[Conversation]("conversations", database)
+    conversation = conversations.find_by_id("conv_1")
+    
+    assert conversation.message_count == 2
+    conversation.title = "Renamed"
+    conversations.save(conversation)
+    database.close()
+    
+    reopened = SqliteDatabase(path)
+    assert SqliteRepository[Conversation]("conversations", reopened).find_by_id("conv_1").title == "Renamed"
+    assert reopened.query_one("PRAGMA user_version") == (2,)
+    reopened.close()
+
+
+def test_sqlite_repository_should_count_messages_recorded_through_separate_connections(tmp_path):
+    """
+    Test that message counts are updated atomically in the database.
+    
+    This test verifies that messages recorded by two connections that both
+    loaded the conversation are all counted, and that the latest activity
+    does not move back for messages older than it.
+    """
+    path = str(tmp_path / "assistant.db")
+    first = SqliteDatabase(path)
+    second = SqliteDatabase(path)
+    start = datetime(2025, 1, 1)
+    first_repository = SqliteRepository[Conversation]("conversations", first)
+    second_repository = SqliteRepository[Conversation]("conversations", second)
+    conversation = Conversation(id="conv_1", title="Weekly planning", owner_id="user_1")
+    conversation.updated_at = start
+    first_repository.save(conversation)
+    
+    first_repository.find_by_id("conv_1")
+    second_repository.find_by_id("conv_1")
+    first_repository.record_messages("conv_1", 1, start + timedelta(minutes=5))
+    updated = second_repository.record_messages("conv_1", 2, start - timedelta(days=1))
+    
+    assert updated.message_count == 3
+    assert updated.updated_at == start + timedelta(minutes=5)
+    assert first_repository.find_by_id("conv_1").message_count == 3
+    assert second_repository.record_messages("conv_missing", 1, start) is None
+    first.close()
+    second.close()
\ No newline at end of file